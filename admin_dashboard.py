@@ -8,6 +8,7 @@ UPDATED: Now reads initial_capital and last_known_balance from follower_users
 """
 
 import os
+import re
 import html
 import psycopg2
 from datetime import datetime, timedelta
@@ -655,6 +656,38 @@ def get_error_stats() -> Dict:
         return {'total': 0, 'last_24h': 0, 'last_7d': 0, 'by_type': {}}
 
 
+# Error categories for the admin error list, checked in order (first match wins)
+# against "<error_type> <message>", lowercased. One compiled alternation per
+# category scans the text once instead of once per keyword.
+def _keyword_pattern(*keywords: str) -> "re.Pattern":
+    return re.compile("|".join(map(re.escape, keywords)))
+
+ERROR_CATEGORIES = [
+    # (pattern, border color, badge class, category)
+    (_keyword_pattern('auth', 'credential', 'decrypt', 'key_error', 'secret', 'permission', '401', 'unauthorized', 'api_key', 'invalid key'),
+     '#ef4444', 'error-badge-critical', 'auth'),  # Red - authentication
+    (_keyword_pattern('network', 'connection', 'timeout', 'socket', 'dns', 'ssl', 'certificate', 'refused', 'unreachable'),
+     '#f59e0b', 'error-badge-warning', 'network'),  # Orange - network
+    (_keyword_pattern('insufficient', 'balance', 'funds', 'margin', 'capital', 'deposit', 'zero_balance', 'minimum'),
+     '#8b5cf6', 'error-badge-funds', 'funds'),  # Purple - funds
+    (_keyword_pattern('trade', 'order', 'execution', 'position', 'fill', 'market', 'limit', 'portfolio', 'init'),
+     '#3b82f6', 'error-badge-info', 'trade'),  # Blue - trade
+    (_keyword_pattern('database', 'sql', 'table', 'column', 'relation', 'asyncpg', 'postgres', 'undefined', 'does not exist'),
+     '#ec4899', 'error-badge-database', 'database'),  # Pink - database
+    (_keyword_pattern('module', 'import', 'attribute', 'typeerror', 'valueerror', 'keyerror', 'index', 'syntax'),
+     '#06b6d4', 'error-badge-code', 'code'),  # Cyan - code/system
+    (_keyword_pattern('kraken', 'exchange', 'ccxt', 'api'),
+     '#f97316', 'error-badge-exchange', 'exchange'),  # Orange-red - exchange
+]
+
+def _classify_error(text: str) -> tuple:
+    """(border color, badge class, category) for a lowercased error type + message"""
+    for pattern, border_color, badge_class, category in ERROR_CATEGORIES:
+        if pattern.search(text):
+            return border_color, badge_class, category
+    return '#6b7280', 'error-badge-info', 'other'  # Gray - other
+
+
 def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, review_positions: List[Dict] = None, users_by_tier: Dict = None) -> str:
     """Generate admin dashboard HTML - Dark Theme with Error Tooltips"""
     
@@ -665,9 +698,10 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
         users_by_tier = {'team': [], 'vip': [], 'standard': []}
     
     # User rows
-    user_rows = ""
+    # Rows are collected in lists and joined once
+    user_rows = []
     if not users:
-        user_rows = "<tr><td colspan='9' style='text-align: center; padding: 40px; color: #9ca3af;'>No users yet</td></tr>"
+        user_rows.append("<tr><td colspan='9' style='text-align: center; padding: 40px; color: #9ca3af;'>No users yet</td></tr>")
     else:
         for user in users:
             status_class = f"status-{user['agent_status']}"
@@ -686,7 +720,7 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
             fingerprint = user.get('kraken_id_display', None)
             fingerprint_cell = f'<span class="api-key" title="Full: {user.get("kraken_account_id", "")}">{fingerprint}</span>' if fingerprint else '<span style="color: #6b7280;">—</span>'
             
-            user_rows += f"""
+            user_rows.append(f"""
             <tr>
                 <td><span class="status-badge {status_class}">{user['status_emoji']} {user['status_text']}</span></td>
                 <td style="color: #e5e7eb;">{user['email']}</td>
@@ -698,15 +732,16 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
                 <td class="{profit_class}">{roi_prefix}{user.get('roi', 0):.1f}%</td>
                 <td style="text-align: center;">{error_cell}</td>
             </tr>
-            """
+            """)
+    user_rows = "".join(user_rows)
     
     # Review positions section
     review_positions_section = ""
     if review_positions:
-        review_rows = ""
+        review_rows = []
         for pos in review_positions:
             side_color = "#10b981" if pos['side'].upper() in ('BUY', 'LONG') else "#ef4444"
-            review_rows += f"""
+            review_rows.append(f"""
                 <tr>
                     <td>{pos['email']}</td>
                     <td><span style="color: {side_color}; font-weight: 600;">{pos['side']}</span> {pos['symbol']}</td>
@@ -720,7 +755,8 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
                         <a href="#" onclick="deletePosition({pos['id']}); return false;" style="color: #ef4444; text-decoration: none;">🗑️ Delete</a>
                     </td>
                 </tr>
-            """
+            """)
+        review_rows = "".join(review_rows)
         
         review_positions_section = f"""
         <div class="users-section" style="border: 2px solid #f59e0b;">
@@ -748,9 +784,9 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
         """
     
     # Error items with detailed view
-    error_items = ""
+    error_items = []
     if not errors:
-        error_items = "<div style='text-align: center; padding: 40px; color: #9ca3af;'>No errors recorded 🎉</div>"
+        error_items.append("<div style='text-align: center; padding: 40px; color: #9ca3af;'>No errors recorded 🎉</div>")
     else:
         for error in errors:
             # Determine error severity color
@@ -761,38 +797,7 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
             error_msg = error.get('error_message', '').lower()
             combined = error_type + ' ' + error_msg  # Check both for keywords
             
-            if any(k in combined for k in ['auth', 'credential', 'decrypt', 'key_error', 'secret', 'permission', '401', 'unauthorized', 'api_key', 'invalid key']):
-                border_color = '#ef4444'  # Red - authentication
-                badge_class = 'error-badge-critical'
-                error_category = 'auth'
-            elif any(k in combined for k in ['network', 'connection', 'timeout', 'socket', 'dns', 'ssl', 'certificate', 'refused', 'unreachable']):
-                border_color = '#f59e0b'  # Orange - network
-                badge_class = 'error-badge-warning'
-                error_category = 'network'
-            elif any(k in combined for k in ['insufficient', 'balance', 'funds', 'margin', 'capital', 'deposit', 'zero_balance', 'minimum']):
-                border_color = '#8b5cf6'  # Purple - funds
-                badge_class = 'error-badge-funds'
-                error_category = 'funds'
-            elif any(k in combined for k in ['trade', 'order', 'execution', 'position', 'fill', 'market', 'limit', 'portfolio', 'init']):
-                border_color = '#3b82f6'  # Blue - trade
-                badge_class = 'error-badge-info'
-                error_category = 'trade'
-            elif any(k in combined for k in ['database', 'sql', 'table', 'column', 'relation', 'asyncpg', 'postgres', 'undefined', 'does not exist']):
-                border_color = '#ec4899'  # Pink - database
-                badge_class = 'error-badge-database'
-                error_category = 'database'
-            elif any(k in combined for k in ['module', 'import', 'attribute', 'typeerror', 'valueerror', 'keyerror', 'index', 'syntax']):
-                border_color = '#06b6d4'  # Cyan - code/system
-                badge_class = 'error-badge-code'
-                error_category = 'code'
-            elif any(k in combined for k in ['kraken', 'exchange', 'ccxt', 'api']):
-                border_color = '#f97316'  # Orange-red - exchange
-                badge_class = 'error-badge-exchange'
-                error_category = 'exchange'
-            else:
-                border_color = '#6b7280'  # Gray - other
-                badge_class = 'error-badge-info'
-                error_category = 'other'
+            border_color, badge_class, error_category = _classify_error(combined)
             
             # Format error message
             error_msg = error.get('error_message', '')
@@ -815,7 +820,7 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
             else:
                 timestamp_str = 'N/A'
             
-            error_items += f"""
+            error_items.append(f"""
             <div class="error-item" 
                  style="border-left-color: {border_color};" 
                  data-error-type="{error_category}"
@@ -833,7 +838,8 @@ def generate_admin_html(users: List[Dict], errors: List[Dict], stats: Dict, revi
                 <div class="error-message">{error_msg_escaped}</div>
                 <div class="error-context">API Key: {error.get('api_key', 'N/A')[:15]}...</div>
             </div>
-            """
+            """)
+    error_items = "".join(error_items)
     
     profit_color = "#10b981" if stats.get('total_profit', 0) >= 0 else "#ef4444"
     profit_prefix = "+" if stats.get('total_profit', 0) >= 0 else ""
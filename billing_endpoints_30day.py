@@ -19,7 +19,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from config import is_production, utc_now, BILLING_CYCLE_DAYS
 
@@ -101,7 +101,7 @@ async def coinbase_webhook(request: Request):
     logger.info(f"📥 Coinbase webhook: {event_type} for charge {charge_id}")
     
     if not charge_id:
-        return JSONResponse({"status": "ignored", "reason": "no charge_id"})
+        return ORJSONResponse({"status": "ignored", "reason": "no charge_id"})
     
     # Get billing service from app state
     from main import get_db_pool
@@ -124,7 +124,7 @@ async def coinbase_webhook(request: Request):
         await billing.process_webhook_payment(charge_id, event_type)
         logger.warning(f"⚠️ Payment failed/expired for charge {charge_id}")
     
-    return JSONResponse({"status": "ok"})
+    return ORJSONResponse({"status": "ok"})
 
 
 @router.get("/status")
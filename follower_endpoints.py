@@ -13,6 +13,7 @@ Endpoints:
 - GET /api/users/stats - Get user statistics
 - POST /api/setup-agent - Setup hosted trading agent (NEW!)
 - GET /api/agent-status - Get agent status (NEW!)
+- GET /api/agent-status/stream - Push agent status changes over SSE
 - POST /api/stop-agent - Stop trading agent (NEW!)
 - POST /api/start-agent - Start/resume trading agent (NEW!)
 - POST /api/payments/create - Create payment link
@@ -22,28 +23,33 @@ Author: Nike Rocket Team
 Updated: November 24, 2025
 """
 
-from fastapi import APIRouter, HTTPException, Header, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import APIRouter, HTTPException, Header, Depends, BackgroundTasks, Request
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict
 import os
+import asyncio
 import secrets
 import hashlib
 import hmac
 import json
 import logging
+import orjson
 import ccxt
 from pydantic import BaseModel, EmailStr
 
 from follower_models import (
     User, Signal, SignalDelivery, Trade, Payment, SystemStats,
-    get_db_session
+    get_engine, get_db_session
 )
 
 # Import email service
 from email_service import send_welcome_email, send_api_key_resend_email
 
+# Cached /api/portfolio/stats responses go stale when a trade is reported
+from portfolio_api import invalidate_portfolio_stats_cache
+
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -59,6 +65,22 @@ COINBASE_API_KEY = os.getenv("COINBASE_COMMERCE_API_KEY", "")
 # Signal expiration settings
 SIGNAL_EXPIRATION_MINUTES = 15  # Signals expire after 15 minutes
 
+# Agent status stream: re-read the DB at least this often (catches changes made
+# outside these endpoints, e.g. admin restores) and doubles as the keep-alive
+AGENT_STATUS_STREAM_RECHECK_SECONDS = 25
+
+# One Event per API key with open status streams; set (and replaced) on change.
+# Both are per worker process, and entries go when a key's last stream closes.
+_agent_status_events: Dict[str, asyncio.Event] = {}
+_agent_status_streams: Dict[str, int] = {}  # API key -> open streams
+
+
+def notify_agent_status_changed(api_key: str):
+    """Wake any /api/agent-status/stream listeners for this user"""
+    event = _agent_status_events.pop(api_key, None)
+    if event:
+        event.set()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # KRAKEN ACCOUNT ID VERIFICATION (Anti-Abuse)
@@ -321,8 +343,7 @@ class SetupAgentRequest(BaseModel):
 # ==================== DEPENDENCY INJECTION ====================
 
 def get_db():
-    """Database session dependency"""
-    from sqlalchemy import create_engine
+    """Database session dependency (sessions share one pooled engine)"""
     DATABASE_URL = os.getenv("DATABASE_URL")
     if not DATABASE_URL:
         raise Exception("DATABASE_URL not set")
@@ -331,8 +352,7 @@ def get_db():
     if DATABASE_URL.startswith("postgres://"):
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
     
-    engine = create_engine(DATABASE_URL)
-    session = get_db_session(engine)
+    session = get_db_session(get_engine(DATABASE_URL))
     try:
         yield session
     finally:
@@ -873,6 +893,7 @@ async def report_pnl(
         # 30-DAY BILLING: No per-trade fees - calculated at cycle end
         
         db.commit()
+        invalidate_portfolio_stats_cache(user.api_key)
         
         logger.info(f"💰 Trade reported by {user.email}:")
         logger.info(f"   Symbol: {trade.symbol}")
@@ -1146,6 +1167,7 @@ async def setup_agent(
             user.suspension_reason = None
         
         db.commit()
+        notify_agent_status_changed(x_api_key)
         
         logger.info(f"✅ Credentials set for user: {user.email}")
         logger.info(f"   Kraken Account ID: {kraken_account_uid[:20]}...")
@@ -1184,6 +1206,93 @@ async def get_agent_status(
     if not user:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
+    return _agent_status_payload(user)
+
+
+@router.get("/api/agent-status/stream")
+async def stream_agent_status(
+    request: Request,
+    key: str,
+):
+    """
+    Server-Sent Events feed of the customer's agent status
+    
+    Called by: Dashboard (EventSource can't send headers, so the key is a query param)
+    Auth: Requires user API key
+    
+    Sends the /api/agent-status payload on connect and again whenever
+    agent_configured/agent_active change; a comment line otherwise keeps
+    the connection open.
+    
+    No database session lives as long as the stream: every read opens one,
+    in a worker thread, and closes it again - an open dashboard holds no
+    pooled connection between checks and never blocks the event loop.
+    
+    Change notifications are per worker process: with several workers, a
+    change handled by another worker shows up at the next recheck
+    (AGENT_STATUS_STREAM_RECHECK_SECONDS) instead of immediately.
+    """
+    
+    status = await asyncio.to_thread(_load_agent_status, key)
+    if status is None:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    
+    async def events():
+        last_state = None
+        current = status
+        _agent_status_streams[key] = _agent_status_streams.get(key, 0) + 1
+        try:
+            while not await request.is_disconnected():
+                # Take the Event before reading so a change during the read isn't missed
+                changed = _agent_status_events.setdefault(key, asyncio.Event())
+                
+                if current is None:
+                    current = await asyncio.to_thread(_load_agent_status, key)
+                    if current is None:
+                        return
+                
+                state = (current["agent_configured"], current["agent_active"])
+                if state != last_state:
+                    last_state = state
+                    yield b"data: " + orjson.dumps(current) + b"\n\n"
+                else:
+                    yield b": keep-alive\n\n"
+                current = None
+                
+                try:
+                    await asyncio.wait_for(changed.wait(), AGENT_STATUS_STREAM_RECHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Last stream for this key gone - don't keep its Event (or the key) around
+            _agent_status_streams[key] -= 1
+            if not _agent_status_streams[key]:
+                del _agent_status_streams[key]
+                _agent_status_events.pop(key, None)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+def _load_agent_status(api_key: str) -> Optional[dict]:
+    """Agent status payload for an API key, or None if there's no such user (blocking)"""
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        user = db.query(User).filter(User.api_key == api_key).first()
+        return _agent_status_payload(user) if user else None
+    finally:
+        db_gen.close()
+
+
+def _agent_status_payload(user: User) -> dict:
+    """Agent status as returned by /api/agent-status and its stream"""
     # Check if credentials are set
     if not user.credentials_set:
         return {
@@ -1231,6 +1340,7 @@ async def stop_agent(
     # If user wants full reset, they can go through setup again
     
     db.commit()
+    notify_agent_status_changed(x_api_key)
     
     logger.info(f"⏸️ Agent paused for user: {user.email}")
     
@@ -1275,6 +1385,7 @@ async def start_agent(
     user.agent_started_at = datetime.utcnow()
     
     db.commit()
+    notify_agent_status_changed(x_api_key)
     
     logger.info(f"▶️ Agent started for user: {user.email}")
     
@@ -12,7 +12,7 @@ Author: Nike Rocket Team
 Updated: November 24, 2025
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime, timedelta
@@ -347,6 +347,97 @@ class SystemStats(Base):
     snapshot_at = Column(DateTime, default=datetime.utcnow, index=True)
 
 
+def _db_connection_budget(max_connections, workers):
+    """
+    Split max_connections over the workers' pools: (asyncpg max, SQLAlchemy pool_size, max_overflow)
+    
+    Each worker also holds one advisory-lock connection (background jobs
+    leader election), so that's set aside first. asyncpg gets about a quarter
+    of the rest, SQLAlchemy the remainder; none grows past the old fixed sizes.
+    """
+    per_worker = max(4, max_connections // max(1, workers) - 1)
+    asyncpg_max = min(10, max(1, per_worker // 4))
+    sqlalchemy = per_worker - asyncpg_max
+    pool_size = min(20, max(1, sqlalchemy * 2 // 3))
+    max_overflow = min(10, max(0, sqlalchemy - pool_size))
+    return asyncpg_max, pool_size, max_overflow
+
+
+# Every worker process (WEB_CONCURRENCY) opens its own pools, so they're sized
+# from one budget for the whole app: DB_MAX_CONNECTIONS, kept under the server's
+# max_connections (Postgres default 100) with room for admin/migration sessions.
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", 80))
+_ASYNCPG_POOL_MAX, _DB_POOL_SIZE, _DB_MAX_OVERFLOW = _db_connection_budget(DB_MAX_CONNECTIONS, WEB_CONCURRENCY)
+
+# asyncpg pool (main.py) for the background jobs and the billing endpoints
+ASYNCPG_POOL_MAX_SIZE = int(os.getenv("ASYNCPG_POOL_MAX_SIZE", _ASYNCPG_POOL_MAX))
+ASYNCPG_POOL_MIN_SIZE = min(2, ASYNCPG_POOL_MAX_SIZE)
+
+# SQLAlchemy connection pool - for bursts of dashboard/portfolio requests;
+# pre-ping + recycle drop connections the server (or a proxy) silently closed
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", _DB_POOL_SIZE))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", _DB_MAX_OVERFLOW))
+# Connections opened at startup; the pool grows on demand past these
+DB_POOL_WARM_CONNECTIONS = int(os.getenv("DB_POOL_WARM_CONNECTIONS", 3))
+# Compiled-SQL cache entries (SQLAlchemy's default is 500); the ORM models and
+# their common filters fit comfortably, so hot queries skip recompilation
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", 1200))
+# Server-side cap per statement (Postgres), so a runaway query can't hold a
+# pooled connection indefinitely; 0 disables it
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+_engines = {}
+
+
+def get_engine(database_url):
+    """Get the process-wide pooled engine for a database URL (created on first use)"""
+    engine = _engines.get(database_url)
+    if engine is None:
+        connect_args = {}
+        if database_url.startswith("postgres") and DB_STATEMENT_TIMEOUT_MS:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        engine = create_engine(
+            database_url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=30,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            query_cache_size=DB_QUERY_CACHE_SIZE,
+            connect_args=connect_args,
+        )
+        _engines[database_url] = engine
+    return engine
+
+
+def create_schema_engine(database_url):
+    """
+    Unpooled engine for startup schema work, without DB_STATEMENT_TIMEOUT_MS.
+    
+    Waiting on another worker's schema lock or running a slow migration may
+    legitimately take longer than the per-statement cap meant for requests.
+    Dispose of it when done.
+    """
+    from sqlalchemy.pool import NullPool
+    return create_engine(database_url, poolclass=NullPool)
+
+
+def warm_engine_pool(engine):
+    """Open a few connections up front so the first requests skip the connect handshake"""
+    from sqlalchemy import text
+    connections = []
+    try:
+        for _ in range(min(DB_POOL_WARM_CONNECTIONS, engine.pool.size())):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()  # Returns it to the pool, still open
+    return len(connections)
+
+
 def get_db_session(engine):
     """Get database session"""
     Session = sessionmaker(bind=engine)
@@ -378,5 +469,5 @@ def init_db(engine):
 # Export everything
 __all__ = [
     'Base', 'User', 'Signal', 'SignalDelivery', 'OpenPosition', 'Trade', 
-    'Payment', 'SystemStats', 'get_db_session', 'init_db'
+    'Payment', 'SystemStats', 'get_engine', 'warm_engine_pool', 'get_db_session', 'init_db'
 ]
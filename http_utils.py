@@ -0,0 +1,33 @@
+"""
+HTTP Utilities
+==============
+
+Small helpers shared by the page and API handlers.
+
+Usage:
+    from http_utils import etag_matches
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+"""
+
+from typing import Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Does If-None-Match match this ETag? Uses weak comparison, per RFC 9110.
+    
+    Browsers echo the ETag they got, but a CDN that re-compresses the response
+    hands out W/"..." instead, and caches may send a list or "*".
+    """
+    if not if_none_match:
+        return False
+    if if_none_match == etag:
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
@@ -12,19 +12,32 @@ Author: Nike Rocket Team
 Updated: November 29, 2025 - WITH ERROR LOGGING
 """
 from fastapi import FastAPI, Request, HTTPException, Header
-from fastapi.responses import JSONResponse
-from typing import Optional
+from typing import Optional, Dict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 import json
+import gzip
+import hashlib
+import logging
+import mimetypes
 import traceback
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
-from sqlalchemy import create_engine
+try:
+    import brotli  # Optional: pages are also served pre-compressed as br when installed
+except ImportError:
+    brotli = None
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, FileResponse, Response, ORJSONResponse
 import os
 import asyncio
 import asyncpg
 
 # Import follower system
-from follower_models import init_db
+from follower_models import (
+    init_db, get_engine, create_schema_engine, warm_engine_pool,
+    ASYNCPG_POOL_MIN_SIZE, ASYNCPG_POOL_MAX_SIZE,
+)
 from follower_endpoints import router as follower_router
 
 # Import portfolio system
@@ -76,21 +89,181 @@ from trade_reconciliation import reconcile_single_user, reconcile_all_users
 # Import notification functions for critical errors
 from order_utils import notify_critical_error, notify_security_alert
 
+# If-None-Match comparison, shared with the portfolio API
+from http_utils import etag_matches
+
+# Startup/shutdown messages - through logging (configured by the imported
+# modules) instead of bare print()s
+logger = logging.getLogger("MAIN")
+
+# Startup/shutdown go through the ASGI lifespan protocol; the steps themselves
+# are startup_event() / shutdown_event() at the bottom of this file
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+
 # Initialize FastAPI
 app = FastAPI(
     title="Nike Rocket Follower API",
     description="Trading signal distribution and profit tracking",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson: much faster on the float-heavy portfolio payloads
+    lifespan=lifespan,
 )
 
+HEALTH_RESPONSE_BYTES = b'{"status":"healthy"}'
+
 # CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+class AllowAllCORSMiddleware:
+    """
+    Allow-any-origin CORS as a plain ASGI middleware.
+    
+    Same responses as CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]), but the constant headers are
+    built once and a request costs one pass over its headers.
+    
+    Only /api/ is ever called cross-origin - pages, /static assets, admin and
+    health probes are same-origin navigations or server-to-server, so they
+    skip CORS entirely.
+    """
+    
+    CREDENTIALS_HEADER = (b"access-control-allow-credentials", b"true")
+    PREFLIGHT_HEADERS = (
+        (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+        (b"access-control-max-age", b"600"),
+        (b"content-type", b"text/plain; charset=utf-8"),
+        (b"content-length", b"2"),
+    )
+    # Cookie-less requests (the dashboard's fetches) all get the same headers
+    ANY_ORIGIN_HEADERS = (CREDENTIALS_HEADER, (b"access-control-allow-origin", b"*"))
+    
+    CORS_PATH_PREFIX = "/api/"
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.CORS_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        
+        origin = request_method = request_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+            elif name == b"cookie":
+                has_cookie = True
+        
+        if origin is None:
+            # Not a cross-origin request
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            # Preflight - answer it here, the route never sees it
+            headers = [
+                (b"access-control-allow-origin", origin),
+                (b"vary", b"Origin"),
+                self.CREDENTIALS_HEADER,
+                *self.PREFLIGHT_HEADERS,
+            ]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+        
+        # Credentialed (cookie) requests need the explicit origin; "*" is refused
+        if has_cookie:
+            cors_headers = (
+                self.CREDENTIALS_HEADER,
+                (b"access-control-allow-origin", origin),
+                (b"vary", b"Origin"),
+            )
+        else:
+            cors_headers = self.ANY_ORIGIN_HEADERS
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *cors_headers]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+
+
+app.add_middleware(AllowAllCORSMiddleware)
+
+class ApiGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for /api/ only.
+    
+    Pages and /static files are cached assets - text pre-compressed at startup,
+    images already compressed formats - so they skip it. So do Server-Sent
+    Events streams (EventSource asks for text/event-stream): gzip would hold
+    each event back until enough output piles up.
+    """
+    
+    GZIP_PATH_PREFIX = "/api/"
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.GZIP_PATH_PREFIX)
+            or any(name == b"accept" and b"text/event-stream" in value for name, value in scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress large JSON payloads (equity curve, transactions) per request:
+# level 6 is most of level 9's ratio for a fraction of the CPU.
+app.add_middleware(ApiGZipMiddleware, minimum_size=1024, compresslevel=6)
+
+
+class HealthCheckMiddleware:
+    """
+    Answer load balancer probes (GET/HEAD /health) before the rest of the stack.
+    
+    Probes are the most frequent request and the answer never changes, so
+    they skip gzip, routing and the endpoint call. Added last, so it runs
+    first; the /health route below still documents it and handles other methods.
+    """
+    
+    PATH = "/health"
+    # A tuple: the same object goes out with every probe, so nothing may append to it
+    HEADERS = (
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(HEALTH_RESPONSE_BYTES)).encode()),
+    )
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"] != self.PATH
+            or scope["method"] not in ("GET", "HEAD")
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        await send({"type": "http.response.start", "status": 200, "headers": self.HEADERS})
+        body = HEALTH_RESPONSE_BYTES if scope["method"] == "GET" else b""
+        await send({"type": "http.response.body", "body": body})
+
+
+app.add_middleware(HealthCheckMiddleware)
 
 
 # ==================== GLOBAL EXCEPTION HANDLER ====================
@@ -192,7 +365,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         pass  # Don't fail if notification fails
     
     # Return error response
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error_type": error_type}
     )
@@ -206,35 +379,113 @@ if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
 if DATABASE_URL:
-    engine = create_engine(DATABASE_URL)
-    init_db(engine)
-    init_portfolio_db(engine)
+    # Same pooled engine the request-scoped sessions (follower_endpoints.get_db) use.
+    # Creating it doesn't connect; tables/migrations run in init_database() at startup.
+    engine = get_engine(DATABASE_URL)
+else:
+    logger.warning("⚠️ DATABASE_URL not set - database features disabled")
+
+# Postgres advisory lock ids - several uvicorn workers (WEB_CONCURRENCY) start
+# at once, and some startup work must happen in one process at a time
+SCHEMA_LOCK_ID = 0x4E4B5201  # Table creation / migrations
+BACKGROUND_JOBS_LOCK_ID = 0x4E4B5202  # Trading loop, monitors and schedulers
+
+def init_database():
+    """Create tables and run schema migrations (blocking - called off the event loop at startup)"""
+    from sqlalchemy import text
+    # Not the request engine: its statement_timeout would abort a worker that
+    # waits long on the lock below, or a slow migration
+    schema_engine = create_schema_engine(DATABASE_URL)
+    try:
+        # Concurrent CREATE TABLEs from several workers can collide - take turns
+        with schema_engine.connect() as lock_conn:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+            try:
+                _init_database_schema(schema_engine)
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SCHEMA_LOCK_ID})
+    finally:
+        schema_engine.dispose()
+    
+    logger.info("✅ Database initialized")
+
+def _init_database_schema(schema_engine):
+    from sqlalchemy import text
+    init_db(schema_engine)
+    init_portfolio_db(schema_engine)
     
     # Run schema migrations BEFORE any ORM queries
     try:
-        import psycopg2
-        conn = psycopg2.connect(DATABASE_URL)
-        cur = conn.cursor()
-        cur.execute("""
-            ALTER TABLE follower_users 
-            ADD COLUMN IF NOT EXISTS fee_tier VARCHAR(20) DEFAULT 'standard'
-        """)
-        conn.commit()
-        cur.close()
-        conn.close()
-        print("✅ Database schema up to date")
+        with schema_engine.begin() as conn:
+            conn.execute(text("""
+                ALTER TABLE follower_users 
+                ADD COLUMN IF NOT EXISTS fee_tier VARCHAR(20) DEFAULT 'standard'
+            """))
+        logger.info("✅ Database schema up to date")
     except Exception as e:
-        print(f"Note: Schema migration - {e}")
-    
-    print("✅ Database initialized")
-else:
-    print("⚠️ DATABASE_URL not set - database features disabled")
+        logger.info(f"Note: Schema migration - {e}")
+
+# Health check - both responses are static, so serialize them once.
+# Registered ahead of the routers so probes match the first routes checked.
+ROOT_PAYLOAD = {
+    "status": "online",
+    "service": "$NIKEPIG's Massive Rocket API",
+    "version": "1.1.0",
+    "endpoints": {
+        "signup": "/signup",
+        "login": "/login",
+        "setup": "/setup",
+        "dashboard": "/dashboard",
+        "admin": "/admin?password=xxx",
+        "reset_database": "/admin/reset-database?password=xxx",
+        "broadcast": "/api/broadcast-signal",
+        "latest_signal": "/api/latest-signal",
+        "report_pnl": "/api/report-pnl",
+        "register": "/api/users/register",
+        "verify": "/api/users/verify",
+        "stats": "/api/users/stats",
+        "agent_status": "/api/agent-status",
+        "setup_agent": "/api/setup-agent",
+        "stop_agent": "/api/stop-agent",
+        "portfolio_stats": "/api/portfolio/stats",
+        "portfolio_trades": "/api/portfolio/trades",
+        "portfolio_deposit": "/api/portfolio/deposit",
+        "portfolio_withdraw": "/api/portfolio/withdraw",
+        "pay": "/api/pay/{api_key}",
+        "webhook": "/api/payments/webhook",
+        "billing_summary": "/api/admin/billing/summary",
+        "process_billing": "/api/admin/billing/process-monthly",
+        "verify_billing": "/api/admin/billing/verify-accuracy",
+        "reconcile_trades": "/api/admin/reconcile-trades/{user_id}",
+        "reconcile_all": "/api/admin/reconcile-all-trades"
+    },
+    "user_links": {
+        "new_users": "Visit /signup to create an account",
+        "returning_users": "Visit /login to access your dashboard"
+    }
+}
+ROOT_RESPONSE_BYTES = json.dumps(ROOT_PAYLOAD, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+@app.api_route("/", methods=["GET", "HEAD"])
+async def root(request: Request):
+    # Over GZipMiddleware's threshold, so it's served pre-compressed (ROOT_PAGE, below)
+    return _cached_asset_response(request, ROOT_PAGE)
+
+@app.api_route("/health", methods=["GET", "HEAD"])
+async def health():
+    return Response(content=HEALTH_RESPONSE_BYTES, media_type="application/json")
 
 # Include routers
 app.include_router(follower_router, tags=["follower"])
 app.include_router(portfolio_router, tags=["portfolio"])
 app.include_router(billing_router)  # 30-day rolling billing endpoints
 
+# Performance card background images (ETag/Last-Modified/304 handled by StaticFiles)
+# Only when the directory is deployed - StaticFiles on a missing directory
+# raises on every request (a 500) instead of answering 404
+if os.path.isdir("backgrounds"):
+    app.mount("/static/backgrounds", StaticFiles(directory="backgrounds"), name="backgrounds")
+
 # Global db_pool reference for billing endpoints
 _db_pool = None
 
@@ -243,51 +494,6 @@ async def get_db_pool():
     global _db_pool
     return _db_pool
 
-# Health check
-@app.get("/")
-async def root():
-    return {
-        "status": "online",
-        "service": "$NIKEPIG's Massive Rocket API",
-        "version": "1.1.0",
-        "endpoints": {
-            "signup": "/signup",
-            "login": "/login",
-            "setup": "/setup",
-            "dashboard": "/dashboard",
-            "admin": "/admin?password=xxx",
-            "reset_database": "/admin/reset-database?password=xxx",
-            "broadcast": "/api/broadcast-signal",
-            "latest_signal": "/api/latest-signal",
-            "report_pnl": "/api/report-pnl",
-            "register": "/api/users/register",
-            "verify": "/api/users/verify",
-            "stats": "/api/users/stats",
-            "agent_status": "/api/agent-status",
-            "setup_agent": "/api/setup-agent",
-            "stop_agent": "/api/stop-agent",
-            "portfolio_stats": "/api/portfolio/stats",
-            "portfolio_trades": "/api/portfolio/trades",
-            "portfolio_deposit": "/api/portfolio/deposit",
-            "portfolio_withdraw": "/api/portfolio/withdraw",
-            "pay": "/api/pay/{api_key}",
-            "webhook": "/api/payments/webhook",
-            "billing_summary": "/api/admin/billing/summary",
-            "process_billing": "/api/admin/billing/process-monthly",
-            "verify_billing": "/api/admin/billing/verify-accuracy",
-            "reconcile_trades": "/api/admin/reconcile-trades/{user_id}",
-            "reconcile_all": "/api/admin/reconcile-all-trades"
-        },
-        "user_links": {
-            "new_users": "Visit /signup to create an account",
-            "returning_users": "Visit /login to access your dashboard"
-        }
-    }
-
-@app.api_route("/health", methods=["GET", "HEAD"])
-async def health():
-    return {"status": "healthy"}
-
 # Test email notification endpoint
 @app.get("/test-email")
 async def test_email():
@@ -304,6 +510,107 @@ async def test_email():
     )
     return {"status": "sent" if result else "failed", "to": "calebws87@gmail.com"}
 
+# Admin login form - formatted once at import (hence the doubled CSS braces)
+_ADMIN_LOGIN_TEMPLATE = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>$NIKEPIG Admin Access</title>
+            <style>
+                body {{
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                    display: flex;
+                    justify-content: center;
+                    align-items: center;
+                    height: 100vh;
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    margin: 0;
+                }}
+                .login-box {{
+                    background: white;
+                    padding: 40px;
+                    border-radius: 12px;
+                    box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+                    text-align: center;
+                    min-width: 300px;
+                }}
+                h1 {{
+                    color: #667eea;
+                    margin-bottom: 10px;
+                    font-size: 24px;
+                }}
+                .subtitle {{
+                    color: #666;
+                    font-size: 14px;
+                    margin-bottom: 25px;
+                }}
+                input {{
+                    padding: 12px;
+                    border: 2px solid #e5e7eb;
+                    border-radius: 8px;
+                    width: 100%;
+                    font-size: 14px;
+                    box-sizing: border-box;
+                }}
+                input:focus {{
+                    outline: none;
+                    border-color: #667eea;
+                }}
+                button {{
+                    padding: 12px 24px;
+                    background: #667eea;
+                    color: white;
+                    border: none;
+                    border-radius: 8px;
+                    font-weight: 600;
+                    cursor: pointer;
+                    margin-top: 15px;
+                    width: 100%;
+                    font-size: 14px;
+                    transition: all 0.1s ease;
+                    transform: translateY(0);
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                }}
+                button:hover {{
+                    background: #5568d3;
+                    transform: translateY(-1px);
+                    box-shadow: 0 6px 8px rgba(0, 0, 0, 0.15);
+                }}
+                button:active {{
+                    transform: translateY(2px);
+                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+                }}
+                .error {{
+                    color: #ef4444;
+                    margin-top: 15px;
+                    font-size: 14px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="login-box">
+                <h1>🔒 $NIKEPIG Admin</h1>
+                <p class="subtitle">Hosted Follower Agents Dashboard</p>
+                <form method="GET">
+                    <input 
+                        type="password" 
+                        name="password" 
+                        placeholder="Enter admin password" 
+                        required 
+                        autofocus
+                    >
+                    <button type="submit">Access Dashboard</button>
+                </form>
+                {error}
+            </div>
+        </body>
+        </html>
+    """
+# Kept as UTF-8 bytes - HTMLResponse sends bytes as-is, with no per-request encode
+ADMIN_LOGIN_HTML = _ADMIN_LOGIN_TEMPLATE.format(error="").encode()
+ADMIN_LOGIN_ERROR_HTML = _ADMIN_LOGIN_TEMPLATE.format(error='<p class="error">❌ Invalid password</p>').encode()
+
 # Admin Dashboard (NEW!)
 @app.get("/admin", response_class=HTMLResponse)
 async def admin_dashboard(password: str = ""):
@@ -321,102 +628,7 @@ async def admin_dashboard(password: str = ""):
     """
     # Check password
     if password != ADMIN_PASSWORD:
-        return HTMLResponse("""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>$NIKEPIG Admin Access</title>
-                <style>
-                    body {{
-                        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                        display: flex;
-                        justify-content: center;
-                        align-items: center;
-                        height: 100vh;
-                        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                        margin: 0;
-                    }}
-                    .login-box {{
-                        background: white;
-                        padding: 40px;
-                        border-radius: 12px;
-                        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
-                        text-align: center;
-                        min-width: 300px;
-                    }}
-                    h1 {{
-                        color: #667eea;
-                        margin-bottom: 10px;
-                        font-size: 24px;
-                    }}
-                    .subtitle {{
-                        color: #666;
-                        font-size: 14px;
-                        margin-bottom: 25px;
-                    }}
-                    input {{
-                        padding: 12px;
-                        border: 2px solid #e5e7eb;
-                        border-radius: 8px;
-                        width: 100%;
-                        font-size: 14px;
-                        box-sizing: border-box;
-                    }}
-                    input:focus {{
-                        outline: none;
-                        border-color: #667eea;
-                    }}
-                    button {{
-                        padding: 12px 24px;
-                        background: #667eea;
-                        color: white;
-                        border: none;
-                        border-radius: 8px;
-                        font-weight: 600;
-                        cursor: pointer;
-                        margin-top: 15px;
-                        width: 100%;
-                        font-size: 14px;
-                        transition: all 0.1s ease;
-                        transform: translateY(0);
-                        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                    }}
-                    button:hover {{
-                        background: #5568d3;
-                        transform: translateY(-1px);
-                        box-shadow: 0 6px 8px rgba(0, 0, 0, 0.15);
-                    }}
-                    button:active {{
-                        transform: translateY(2px);
-                        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                    }}
-                    .error {{
-                        color: #ef4444;
-                        margin-top: 15px;
-                        font-size: 14px;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="login-box">
-                    <h1>🔒 $NIKEPIG Admin</h1>
-                    <p class="subtitle">Hosted Follower Agents Dashboard</p>
-                    <form method="GET">
-                        <input 
-                            type="password" 
-                            name="password" 
-                            placeholder="Enter admin password" 
-                            required 
-                            autofocus
-                        >
-                        <button type="submit">Access Dashboard</button>
-                    </form>
-                    """ + (f"""<p class="error">❌ Invalid password</p>""" if password else "") + """
-                </div>
-            </body>
-            </html>
-        """)
+        return HTMLResponse(ADMIN_LOGIN_ERROR_HTML if password else ADMIN_LOGIN_HTML)
     
     # Ensure error_logs table exists
     try:
@@ -1463,13 +1675,16 @@ async def admin_reconcile_all_trades(password: str = ""):
 # Returns current open positions for a user with TP/SL levels
 
 @app.get("/api/portfolio/open-positions")
-async def get_open_positions(request: Request):
+async def get_open_positions(
+    key: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
+):
     """
     Get all open positions for a user with TP/SL levels.
     Query params:
         - key: API key (required)
     """
-    api_key = request.query_params.get('key') or request.headers.get('X-API-Key')
+    api_key = key or x_api_key
     
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
@@ -1625,61 +1840,208 @@ async def get_live_prices(symbols: str = ""):
         return {"prices": {}, "error": str(e)}
 
 
-# Serve static background images (NEW!)
-@app.get("/static/backgrounds/{filename}")
-async def get_background(filename: str):
-    """Serve background images for performance cards"""
-    filepath = f"backgrounds/{filename}"
-    if os.path.exists(filepath):
-        return FileResponse(filepath)
-    else:
-        raise HTTPException(status_code=404, detail="Background image not found")
-
 # Serve all static files (images, etc.)
+# Listed once at startup: a lookup needs no syscall, and junk/traversal
+# names ("..", probes for files that were never shipped) 404 straight away
+try:
+    STATIC_FILES = frozenset(
+        name for name in os.listdir("static") if os.path.isfile(f"static/{name}")
+    )
+except OSError:
+    STATIC_FILES = frozenset()
+
+STATIC_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Unversioned (or stale ?v=) URLs can change under the same name - always revalidate
+STATIC_REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
 @app.get("/static/{filename}")
-async def get_static_file(filename: str):
+async def get_static_file(request: Request, filename: str, v: Optional[str] = None):
     """Serve static files (og-preview.png, logos, etc.)"""
     filepath = f"static/{filename}"
-    if os.path.exists(filepath):
-        return FileResponse(filepath)
+    if filename in STATIC_FILES:
+        asset = STATIC_ASSETS.get(filename)
+        if asset is not None:
+            # Versioned URL (?v=<content hash>) - cache it for good, but only when v
+            # is this content's hash: an old page's link or a made-up v must not
+            # pin the current bytes for a year
+            if v == _asset_version(asset):
+                cache_control = STATIC_IMMUTABLE_CACHE_CONTROL
+            else:
+                cache_control = STATIC_REVALIDATE_CACHE_CONTROL
+            # Held in memory (JS/CSS pre-compressed) - no file I/O, so no
+            # threadpool hop and nothing blocking the event loop
+            return _cached_asset_response(request, asset, cache_control=cache_control)
+        # Only files too big to keep in memory reach here - no hash to check v against
+        return FileResponse(filepath, headers={"Cache-Control": STATIC_REVALIDATE_CACHE_CONTROL})
     else:
         raise HTTPException(status_code=404, detail="Static file not found")
 
+# Pages, the root JSON and /static files - read once at startup, they never change at runtime
+@dataclass(frozen=True)
+class CachedAsset:
+    """A fixed response body (HTML, JSON, JS/CSS, image) held in memory, plus its pre-compressed variants"""
+    content: bytes
+    etag: str
+    compressed: Dict[str, bytes]  # Content-Encoding -> bytes, most preferred first (empty for images)
+    compressed_etags: Dict[str, str]  # Content-Encoding -> ETag of those bytes
+    media_type: str = "text/html"
+
+def _load_cached_asset(
+    filename: str, substitutions: Optional[dict] = None, media_type: str = "text/html",
+    compress: bool = True,
+) -> Optional[CachedAsset]:
+    """Read (and, unless told not to, compress) a file once, or None if it's missing"""
+    try:
+        with open(filename, "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+    for placeholder, value in (substitutions or {}).items():
+        content = content.replace(placeholder, value)
+    return _cached_asset(content, media_type, compress=compress)
+
+def _cached_asset(content: bytes, media_type: str = "text/html", compress: bool = True) -> CachedAsset:
+    """Pre-compress a fixed response body once"""
+    compressed = {}
+    if compress:
+        if brotli is not None:
+            compressed["br"] = brotli.compress(content, quality=11)
+        compressed["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+    digest = hashlib.md5(content).hexdigest()
+    return CachedAsset(
+        content=content,
+        etag='"%s"' % digest,
+        compressed=compressed,
+        # Each encoding is different bytes, so it gets its own strong ETag
+        compressed_etags={encoding: '"%s-%s"' % (digest, encoding) for encoding in compressed},
+        media_type=media_type,
+    )
+
+# Text assets under /static are pre-compressed like the pages
+STATIC_TEXT_MEDIA_TYPES = {
+    ".js": "text/javascript",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+}
+STATIC_TEXT_ASSETS = {
+    name: _load_cached_asset(f"static/{name}", media_type=STATIC_TEXT_MEDIA_TYPES[os.path.splitext(name)[1]])
+    for name in STATIC_FILES
+    if os.path.splitext(name)[1] in STATIC_TEXT_MEDIA_TYPES
+}
+# Images are already compressed - kept in memory as-is (anything larger
+# than this is streamed from disk by FileResponse instead)
+STATIC_ASSET_MAX_BYTES = 1024 * 1024
+STATIC_BINARY_ASSETS = {
+    name: _load_cached_asset(
+        f"static/{name}",
+        media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        compress=False,
+    )
+    for name in STATIC_FILES
+    if name not in STATIC_TEXT_ASSETS and os.path.getsize(f"static/{name}") <= STATIC_ASSET_MAX_BYTES
+}
+STATIC_ASSETS = {**STATIC_BINARY_ASSETS, **STATIC_TEXT_ASSETS}
+
+def _asset_version(asset: CachedAsset) -> str:
+    """Cache-busting ?v= value for a /static asset: the start of its content hash (plain ETag)"""
+    return asset.etag[1:13]
+
+def _static_file_version(filename: str) -> str:
+    """?v= value to link static/<filename> with ("dev" if it isn't served from memory)"""
+    asset = STATIC_ASSETS.get(filename)
+    return _asset_version(asset) if asset is not None else "dev"
+
+def _page_asset_substitutions(page: str) -> dict:
+    """Version placeholders for a page's own static/<page>.css and static/<page>.js"""
+    return {
+        f"__{page.upper()}_CSS_VERSION__".encode(): _static_file_version(f"{page}.css").encode(),
+        f"__{page.upper()}_JS_VERSION__".encode(): _static_file_version(f"{page}.js").encode(),
+    }
+
+# Their CSS/JS live in static/, long-cached, so a repeat visit only re-fetches the HTML
+SIGNUP_PAGE = _load_cached_asset("signup.html", substitutions=_page_asset_substitutions("signup"))
+SETUP_PAGE = _load_cached_asset("setup.html", substitutions=_page_asset_substitutions("setup"))
+LOGIN_PAGE = _load_cached_asset("login.html", substitutions=_page_asset_substitutions("login"))
+ROOT_PAGE = _cached_asset(ROOT_RESPONSE_BYTES, media_type="application/json")
+# They're the same for everyone, so browsers/CDNs may keep them briefly (ETag revalidates after)
+STATIC_PAGE_CACHE_CONTROL = "public, max-age=300"
+
+@lru_cache(maxsize=128)
+def _negotiate_encoding(accept_encoding: str, available: tuple) -> Optional[str]:
+    """First of `available` the Accept-Encoding header allows, or None for plain
+    
+    Honours q=0 (refused) and "*". Browsers send only a handful of distinct
+    headers, so each one is parsed once.
+    """
+    allowed, refused = set(), set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        q = params.replace(" ", "")
+        try:
+            refused_coding = q.startswith("q=") and float(q[2:]) == 0
+        except ValueError:
+            refused_coding = True
+        (refused if refused_coding else allowed).add(coding)
+    for encoding in available:
+        if encoding not in refused and (encoding in allowed or "*" in allowed):
+            return encoding
+    return None
+
+def _cached_asset_response(request: Request, asset: CachedAsset, cache_control: Optional[str] = None) -> Response:
+    """Serve a cached asset (br > gzip > plain), or 304 when the browser already has it"""
+    encoding = _negotiate_encoding(request.headers.get("accept-encoding", ""), tuple(asset.compressed))
+    if encoding:
+        content, etag = asset.compressed[encoding], asset.compressed_etags[encoding]
+    else:
+        content, etag = asset.content, asset.etag
+    
+    headers = {"ETag": etag}
+    if asset.compressed:
+        # Only assets with compressed variants depend on Accept-Encoding
+        headers["Vary"] = "Accept-Encoding"
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=asset.media_type, headers=headers)
+
+# The page handlers below only return pages already held in memory - no
+# blocking I/O, so they're safe as async def and skip the threadpool
+
 # Signup page
 @app.get("/signup", response_class=HTMLResponse)
-async def signup_page():
+async def signup_page(request: Request):
     """Serve the signup HTML page"""
-    try:
-        with open("signup.html", "r") as f:
-            return f.read()
-    except FileNotFoundError:
+    if SIGNUP_PAGE is None:
         return HTMLResponse(
             content="<h1>Signup page not found</h1><p>Please contact support.</p>",
             status_code=404
         )
+    return _cached_asset_response(request, SIGNUP_PAGE, cache_control=STATIC_PAGE_CACHE_CONTROL)
 
 # Setup page (NEW!)
 @app.get("/setup", response_class=HTMLResponse)
-async def setup_page():
+async def setup_page(request: Request):
     """Setup page for configuring trading agent"""
-    try:
-        with open("setup.html", "r") as f:
-            return f.read()
-    except FileNotFoundError:
+    if SETUP_PAGE is None:
         return HTMLResponse(
             content="<h1>Setup page not found</h1><p>Please contact support.</p>",
             status_code=404
         )
+    return _cached_asset_response(request, SETUP_PAGE, cache_control=STATIC_PAGE_CACHE_CONTROL)
 
 # Login page for returning users (NEW!)
 @app.get("/login", response_class=HTMLResponse)
 @app.get("/access", response_class=HTMLResponse)
-async def login_page():
+async def login_page(request: Request):
     """Login page for returning users to access their dashboard"""
-    try:
-        with open("login.html", "r") as f:
-            return f.read()
-    except FileNotFoundError:
+    if LOGIN_PAGE is not None:
+        return _cached_asset_response(request, LOGIN_PAGE, cache_control=STATIC_PAGE_CACHE_CONTROL)
+    else:
         return HTMLResponse("""
             <!DOCTYPE html>
             <html>
@@ -1858,3573 +2220,247 @@ async def login_page():
             </html>
         """, status_code=200)
 
-# Portfolio Dashboard (USER-FRIENDLY VERSION) - COMPLETE HTML!
+# Dashboard CSS and JS live in static, long-cached files
+DASHBOARD_CSS_VERSION = _static_file_version("dashboard.css")
+DASHBOARD_JS_VERSION = _static_file_version("dashboard.js")
+SHARE_CARD_JS_VERSION = _static_file_version("share-card.js")  # Loaded on demand by dashboard.js
+# Share card images - same-origin, so the immutable /static caching applies to them
+CARD_ASSET_VERSIONS = {
+    name: _static_file_version(name)
+    for name in ("bg-charles.jpg", "bg-casino.jpg", "bg-gaming.jpg", "bg-money.jpg", "nikepig-logo.png")
+}
+
+# The dashboard is a static shell (the JS reads ?key= itself), so it's
+# cached in memory like the other pages and browsers/CDNs may keep it briefly.
+# Its assets are versioned, so for an hour past that a cached copy is shown
+# straight away while the ETag revalidation runs in the background
+DASHBOARD_PAGE = _load_cached_asset(
+    "dashboard.html",
+    substitutions={
+        b"__DASHBOARD_CSS_VERSION__": DASHBOARD_CSS_VERSION.encode(),
+        b"__DASHBOARD_JS_VERSION__": DASHBOARD_JS_VERSION.encode(),
+        b"__SHARE_CARD_JS_VERSION__": SHARE_CARD_JS_VERSION.encode(),
+        b"__CARD_ASSET_VERSIONS_JSON__": json.dumps(CARD_ASSET_VERSIONS).encode(),
+        **{
+            f"__{os.path.splitext(name)[0].upper().replace('-', '_')}_VERSION__".encode(): version.encode()
+            for name, version in CARD_ASSET_VERSIONS.items()
+        },
+    },
+)
+DASHBOARD_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=3600"
+
+# Portfolio Dashboard (USER-FRIENDLY VERSION)
 @app.get("/dashboard", response_class=HTMLResponse)
 async def portfolio_dashboard(request: Request):
     """Portfolio tracking dashboard with API key input"""
+    if DASHBOARD_PAGE is None:
+        return HTMLResponse(
+            content="<h1>Dashboard not found</h1><p>Please contact support.</p>",
+            status_code=404
+        )
+    return _cached_asset_response(request, DASHBOARD_PAGE, cache_control=DASHBOARD_CACHE_CONTROL)
+
+# Logged as one record, so log shippers get a single block
+STARTUP_BANNER = "\n".join([
+    "=" * 60,
+    "🚀 NIKE ROCKET FOLLOWER API STARTED",
+    "=" * 60,
+    "✅ Database connected",
+    "✅ Follower routes loaded",
+    "✅ Portfolio routes loaded",
+    "✅ Billing routes loaded (30-day rolling)",
+    "✅ Signup page available at /signup",
+    "✅ Setup page available at /setup",
+    "✅ Dashboard available at /dashboard",
+    "✅ Ready to receive signals",
+])
+
+# Background loops started at startup - kept referenced (the event loop only
+# holds weak references to tasks) and cancelled at shutdown
+_background_tasks = []
+BACKGROUND_JOBS_RETRY_SECONDS = 30
+# The leader checks its lock connection this often (each check may take up to
+# the timeout). A new leader's jobs only start 30s+ after it takes the lock
+# (see _start_background_jobs), so a lost lock is noticed - and the old jobs
+# stopped - well before any second copy could run.
+BACKGROUND_JOBS_LOCK_CHECK_SECONDS = 5
+BACKGROUND_JOBS_LOCK_CHECK_TIMEOUT = 5
+
+async def _run_background_jobs_when_leader(db_pool):
+    """
+    Run the background loops in exactly one process.
     
-    # Get API key from query parameter (optional)
-    api_key = request.query_params.get('key', '')
+    They trade, monitor positions and bill - a second copy would place every
+    order twice. Whichever worker holds the advisory lock runs them; the
+    others keep retrying, so a replacement worker (or the new instance
+    during a deploy) takes over once the holder's connection is gone.
     
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>$NIKEPIG's Massive Rocket - Portfolio Dashboard</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Bebas+Neue&display=swap" rel="stylesheet">
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        
-        /* API Key Login Screen */
-        .login-screen {{
-            max-width: 500px;
-            margin: 100px auto;
-            background: white;
-            padding: 40px;
-            border-radius: 16px;
-            box-shadow: 0 8px 24px rgba(0,0,0,0.2);
-        }}
-        
-        .login-screen h1 {{
-            color: #667eea;
-            text-align: center;
-            margin-bottom: 10px;
-            font-size: 32px;
-        }}
-        
-        .login-screen p {{
-            text-align: center;
-            color: #6b7280;
-            margin-bottom: 30px;
-        }}
-        
-        .input-group {{
-            margin-bottom: 20px;
-        }}
-        
-        .input-group label {{
-            display: block;
-            margin-bottom: 8px;
-            color: #374151;
-            font-weight: 600;
-        }}
-        
-        .input-group input {{
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #e5e7eb;
-            border-radius: 8px;
-            font-size: 16px;
-        }}
-        
-        .input-group input:focus {{
-            outline: none;
-            border-color: #667eea;
-        }}
-        
-        .btn {{
-            width: 100%;
-            padding: 14px;
-            background: #667eea;
-            color: white;
-            border: none;
-            border-radius: 8px;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.1s ease;
-            transform: translateY(0);
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .btn:hover {{
-            background: #5568d3;
-            transform: translateY(-1px);
-            box-shadow: 0 6px 8px rgba(0, 0, 0, 0.15);
-        }}
-        
-        .btn:active {{
-            transform: translateY(2px);
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .btn:disabled {{
-            background: #9ca3af;
-            cursor: not-allowed;
-            transform: none;
-            box-shadow: none;
-        }}
-        
-        /* Setup Wizard */
-        .setup-wizard {{
-            max-width: 600px;
-            margin: 50px auto;
-            background: white;
-            padding: 40px;
-            border-radius: 16px;
-            box-shadow: 0 8px 24px rgba(0,0,0,0.2);
-        }}
-        
-        .setup-wizard h2 {{
-            color: #667eea;
-            margin-bottom: 10px;
-        }}
-        
-        .setup-wizard p {{
-            color: #6b7280;
-            margin-bottom: 20px;
-        }}
-        
-        /* Dashboard */
-        .hero {{
-            text-align: center;
-            color: white;
-            padding: 40px 20px;
-            margin-bottom: 40px;
-        }}
-        
-        .hero h1 {{
-            font-size: 48px;
-            font-weight: 700;
-            margin-bottom: 20px;
-        }}
-        
-        .period-selector {{
-            margin: 20px 0;
-        }}
-        
-        .period-selector select {{
-            padding: 12px 24px;
-            font-size: 16px;
-            border-radius: 25px;
-            border: 2px solid rgba(255,255,255,0.3);
-            background: rgba(255,255,255,0.1);
-            color: white;
-            cursor: pointer;
-            font-weight: 600;
-        }}
-        
-        .period-selector option {{
-            background: #764ba2;
-            color: white;
-        }}
-        
-        .hero-profit {{
-            font-size: 72px;
-            font-weight: 800;
-            margin: 20px 0;
-            text-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }}
-        
-        .hero-label {{
-            font-size: 24px;
-            opacity: 0.9;
-        }}
-        
-        .hero-subtext {{
-            font-size: 16px;
-            opacity: 0.7;
-            margin-top: 10px;
-        }}
-        
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }}
-        
-        .stat-card {{
-            background: white;
-            border-radius: 16px;
-            padding: 24px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            position: relative;
-            cursor: help;
-            transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        
-        .stat-card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 8px 20px rgba(0,0,0,0.15);
-        }}
-        
-        .stat-card .tooltip {{
-            visibility: hidden;
-            opacity: 0;
-            position: absolute;
-            bottom: 100%;
-            left: 50%;
-            transform: translateX(-50%);
-            background: #1f2937;
-            color: white;
-            padding: 12px 16px;
-            border-radius: 8px;
-            font-size: 13px;
-            font-weight: 400;
-            white-space: normal;
-            width: 250px;
-            text-align: left;
-            z-index: 1000;
-            margin-bottom: 10px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-            transition: opacity 0.2s, visibility 0.2s;
-            line-height: 1.5;
-        }}
-        
-        .stat-card .tooltip::after {{
-            content: '';
-            position: absolute;
-            top: 100%;
-            left: 50%;
-            transform: translateX(-50%);
-            border: 8px solid transparent;
-            border-top-color: #1f2937;
-        }}
-        
-        .stat-card:hover .tooltip {{
-            visibility: visible;
-            opacity: 1;
-        }}
-        
-        .tooltip-formula {{
-            background: rgba(255,255,255,0.1);
-            padding: 6px 10px;
-            border-radius: 4px;
-            margin-top: 8px;
-            font-family: monospace;
-            font-size: 12px;
-        }}
-        
-        .stat-label {{
-            font-size: 14px;
-            color: #6b7280;
-            margin-bottom: 8px;
-        }}
-        
-        .stat-value {{
-            font-size: 32px;
-            font-weight: 700;
-            color: #1f2937;
-        }}
-        
-        .stat-detail {{
-            font-size: 12px;
-            color: #9ca3af;
-            margin-top: 4px;
-        }}
-        
-        .error {{
-            background: #fee2e2;
-            color: #991b1b;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-        }}
-        
-        .success {{
-            background: #d1fae5;
-            color: #065f46;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-        }}
-        
-        .logout-btn {{
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            padding: 10px 20px;
-            background: rgba(255,255,255,0.2);
-            color: white;
-            border: 2px solid white;
-            border-radius: 8px;
-            cursor: pointer;
-            font-weight: 600;
-            transition: all 0.1s ease;
-            transform: translateY(0);
-        }}
-        
-        .logout-btn:hover {{
-            background: rgba(255,255,255,0.3);
-            transform: translateY(-1px);
-        }}
-        
-        .logout-btn:active {{
-            transform: translateY(2px);
-        }}
-        .agent-status-container {{
-            margin: 20px 0;
-            padding: 0;
-        }}
-        
-        .agent-status {{
-            padding: 16px 24px;
-            border-radius: 12px;
-            font-size: 16px;
-            font-weight: 500;
-            text-align: center;
-            transition: all 0.3s ease;
-            border: 2px solid transparent;
-        }}
-        
-        .status-active {{
-            background: linear-gradient(135deg, #d1fae5 0%, #a7f3d0 100%);
-            color: #065f46;
-            border-color: #10b981;
-            box-shadow: 0 4px 12px rgba(16, 185, 129, 0.2);
-        }}
-        
-        .status-configuring {{
-            background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%);
-            color: #1e40af;
-            border-color: #3b82f6;
-            box-shadow: 0 4px 12px rgba(59, 130, 246, 0.2);
-        }}
-        
-        .status-ready {{
-            background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%);
-            color: #92400e;
-            border-color: #f59e0b;
-            box-shadow: 0 4px 12px rgba(245, 158, 11, 0.2);
-        }}
-        
-        .status-error {{
-            background: linear-gradient(135deg, #fee2e2 0%, #fecaca 100%);
-            color: #991b1b;
-            border-color: #ef4444;
-            box-shadow: 0 4px 12px rgba(239, 68, 68, 0.2);
-        }}
-        
-        .status-unknown {{
-            background: linear-gradient(135deg, #f3f4f6 0%, #e5e7eb 100%);
-            color: #4b5563;
-            border-color: #9ca3af;
-            box-shadow: 0 4px 12px rgba(156, 163, 175, 0.2);
-        }}
-        
-        .agent-status a {{
-            color: inherit;
-            text-decoration: underline;
-            font-weight: 600;
-        }}
-        
-        .agent-status a:hover {{
-            opacity: 0.8;
-        }}
-        
-        /* ═══════════════════════════════════════════════════════════════ */
-        /* Agent Status Monitoring Styles */
-        /* ═══════════════════════════════════════════════════════════════ */
-        
-        /* Global Tactile Button Effect - applies to ALL buttons */
-        button, .tactile-btn {{
-            transition: all 0.1s ease !important;
-            transform: translateY(0);
-        }}
-        
-        button:hover, .tactile-btn:hover {{
-            transform: translateY(-1px);
-        }}
-        
-        button:active, .tactile-btn:active {{
-            transform: translateY(3px) !important;
-            box-shadow: 0 1px 2px rgba(0, 0, 0, 0.1) !important;
-        }}
-        
-        button:disabled {{
-            transform: none !important;
-        }}
-        
-        /* ═══════════════════════════════════════════════════════════════ */
-        /* Mobile Responsive Styles */
-        /* ═══════════════════════════════════════════════════════════════ */
-        
-        .section-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            gap: 15px;
-            margin-bottom: 20px;
-        }}
-        
-        .section-header-actions {{
-            display: flex;
-            gap: 10px;
-            align-items: center;
-            flex-shrink: 0;
-        }}
-        
-        .export-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-        }}
-        
-        @media (max-width: 768px) {{
-            body {{
-                padding: 10px;
-            }}
-            
-            .section-header {{
-                flex-direction: column;
-                align-items: stretch;
-            }}
-            
-            .section-header-actions {{
-                width: 100%;
-                justify-content: flex-start;
-                flex-wrap: wrap;
-            }}
-            
-            .export-grid {{
-                grid-template-columns: 1fr;
-            }}
-            
-            .logout-btn {{
-                position: static !important;
-                display: block;
-                width: 100%;
-                margin-bottom: 15px;
-                text-align: center;
-            }}
-            
-            .portfolio-overview,
-            .transaction-history,
-            .trade-export {{
-                padding: 20px !important;
-            }}
-            
-            .portfolio-overview h2,
-            .transaction-history h2,
-            .trade-export h2 {{
-                font-size: 20px !important;
-            }}
-        }}
-        
-        /* Safety Section Styles */
-        .safety-section {{
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            border-radius: 16px;
-            padding: 30px;
-            margin-top: 30px;
-            border: 1px solid rgba(102, 126, 234, 0.3);
-        }}
-
-        .safety-header {{
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            margin-bottom: 20px;
-            cursor: pointer;
-        }}
-
-        .safety-header h2 {{
-            color: #fff;
-            font-size: 24px;
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin: 0;
-        }}
-
-        .safety-header .toggle-icon {{
-            color: #667eea;
-            font-size: 20px;
-            transition: transform 0.3s;
-        }}
-
-        .safety-header.collapsed .toggle-icon {{
-            transform: rotate(-90deg);
-        }}
-
-        .safety-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 20px;
-            transition: all 0.3s ease;
-        }}
-
-        .safety-grid.hidden {{
-            display: none;
-        }}
-
-        .safety-card {{
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 12px;
-            padding: 24px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            transition: transform 0.2s, border-color 0.2s;
-        }}
-
-        .safety-card:hover {{
-            transform: translateY(-2px);
-            border-color: rgba(102, 126, 234, 0.5);
-        }}
-
-        .safety-card .icon {{
-            width: 48px;
-            height: 48px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 24px;
-            margin-bottom: 16px;
-        }}
-
-        .safety-card h3 {{
-            color: #fff;
-            font-size: 18px;
-            margin-bottom: 12px;
-        }}
-
-        .safety-card p {{
-            color: #9ca3af;
-            font-size: 14px;
-            line-height: 1.6;
-            margin-bottom: 12px;
-        }}
-
-        .safety-card ul {{
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }}
-
-        .safety-card li {{
-            color: #9ca3af;
-            font-size: 13px;
-            padding: 6px 0;
-            display: flex;
-            align-items: flex-start;
-            gap: 8px;
-        }}
-
-        .safety-card li::before {{
-            content: "✓";
-            color: #10b981;
-            font-weight: bold;
-            flex-shrink: 0;
-        }}
-
-        .github-link {{
-            display: inline-flex;
-            align-items: center;
-            gap: 8px;
-            background: #24292e;
-            color: #fff;
-            padding: 10px 20px;
-            border-radius: 8px;
-            text-decoration: none;
-            font-size: 14px;
-            font-weight: 600;
-            margin-top: 12px;
-            transition: background 0.2s;
-        }}
-
-        .github-link:hover {{
-            background: #3a3f47;
-        }}
-
-        .github-link svg {{
-            width: 20px;
-            height: 20px;
-        }}
-
-        .fee-tiers {{
-            display: flex;
-            gap: 12px;
-            margin-top: 12px;
-        }}
-
-        .fee-tier {{
-            flex: 1;
-            text-align: center;
-            padding: 12px;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 8px;
-        }}
-
-        .fee-tier .tier-name {{
-            color: #667eea;
-            font-weight: 600;
-            font-size: 12px;
-            text-transform: uppercase;
-            margin-bottom: 4px;
-        }}
-
-        .fee-tier .tier-rate {{
-            color: #fff;
-            font-size: 20px;
-            font-weight: bold;
-        }}
-
-        .tech-badges {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            margin-top: 12px;
-        }}
-
-        .tech-badge {{
-            background: rgba(102, 126, 234, 0.2);
-            color: #a5b4fc;
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: 500;
-        }}
-
-        /* Backtest Results Section */
-        .backtest-section {{
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            border-radius: 16px;
-            padding: 24px;
-            margin-top: 30px;
-            margin-bottom: 30px;
-            border: 1px solid rgba(16, 185, 129, 0.3);
-        }}
-
-        .backtest-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0 0 16px 0;
-            margin-bottom: 20px;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-            cursor: pointer;
-        }}
-
-        .backtest-header h2 {{
-            color: #fff;
-            font-size: 20px;
-            margin: 0;
-        }}
-
-        .backtest-grid {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 16px;
-        }}
-
-        @media (max-width: 700px) {{
-            .backtest-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-
-        .backtest-card {{
-            background: rgba(255, 255, 255, 0.06);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            transition: transform 0.2s, border-color 0.2s;
-        }}
-
-        .backtest-card:hover {{
-            transform: translateY(-2px);
-            border-color: rgba(16, 185, 129, 0.4);
-        }}
-
-        .backtest-card .market-badge {{
-            display: inline-block;
-            padding: 5px 12px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: 600;
-            margin-bottom: 12px;
-            letter-spacing: 0.5px;
-        }}
-
-        .backtest-card .market-badge.bull {{
-            background: rgba(16, 185, 129, 0.25);
-            color: #34d399;
-        }}
-
-        .backtest-card .market-badge.bear {{
-            background: rgba(239, 68, 68, 0.25);
-            color: #f87171;
-        }}
-
-        .backtest-card .market-badge.sideways {{
-            background: rgba(251, 191, 36, 0.25);
-            color: #fcd34d;
-        }}
-
-        .backtest-card .market-badge.full {{
-            background: rgba(139, 92, 246, 0.25);
-            color: #c4b5fd;
-        }}
-
-        .backtest-card .period {{
-            color: #9ca3af;
-            font-size: 13px;
-            margin-bottom: 8px;
-        }}
-
-        .backtest-card .result {{
-            font-size: 32px;
-            font-weight: bold;
-            margin-bottom: 4px;
-            color: #10b981;
-        }}
-
-        .backtest-card .result.profit {{
-            color: #10b981;
-        }}
-
-        .backtest-card .final-value {{
-            color: #e5e7eb;
-            font-size: 16px;
-            margin-bottom: 14px;
-            font-weight: 500;
-        }}
-
-        .backtest-card .stats {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 12px;
-            padding-top: 14px;
-            border-top: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-
-        .backtest-card .stat {{
-            text-align: center;
-            padding: 8px;
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 8px;
-        }}
-
-        .backtest-card .stat-label {{
-            color: #9ca3af;
-            font-size: 10px;
-            text-transform: uppercase;
-            margin-bottom: 4px;
-            letter-spacing: 0.5px;
-        }}
-
-        .backtest-card .stat-value {{
-            color: #fff;
-            font-size: 15px;
-            font-weight: 700;
-        }}
-
-        .backtest-card .stat-value.negative {{
-            color: #f87171;
-        }}
-
-        .backtest-card .stat-value.positive {{
-            color: #34d399;
-        }}
-
-        .backtest-disclaimer {{
-            margin-top: 20px;
-            padding: 14px 18px;
-            background: rgba(251, 191, 36, 0.15);
-            border: 1px solid rgba(251, 191, 36, 0.3);
-            border-radius: 10px;
-            font-size: 13px;
-            color: #fcd34d;
-            line-height: 1.5;
-        }}
-
-        .max-pain-section {{
-            margin-top: 24px;
-            padding: 24px;
-            background: rgba(239, 68, 68, 0.08);
-            border: 1px solid rgba(239, 68, 68, 0.25);
-            border-radius: 12px;
-        }}
-
-        .max-pain-section h3 {{
-            color: #f87171;
-            font-size: 18px;
-            margin: 0 0 20px 0;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-
-        .max-pain-grid {{
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            gap: 16px;
-            margin-bottom: 20px;
-        }}
-
-        @media (max-width: 900px) {{
-            .max-pain-grid {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
-
-        @media (max-width: 500px) {{
-            .max-pain-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-
-        .pain-stat {{
-            text-align: center;
-            padding: 20px 16px;
-            background: rgba(0, 0, 0, 0.25);
-            border-radius: 10px;
-            border: 1px solid rgba(239, 68, 68, 0.15);
-        }}
-
-        .pain-stat .pain-value {{
-            font-size: 36px;
-            font-weight: bold;
-            color: #f87171;
-            margin-bottom: 6px;
-        }}
-
-        .pain-stat .pain-label {{
-            color: #e5e7eb;
-            font-size: 13px;
-            font-weight: 600;
-            text-transform: uppercase;
-            margin-bottom: 10px;
-            letter-spacing: 0.5px;
-        }}
-
-        .pain-stat .pain-explanation {{
-            color: #9ca3af;
-            font-size: 12px;
-            line-height: 1.6;
-        }}
-
-        .max-pain-summary {{
-            padding: 18px 20px;
-            background: rgba(0, 0, 0, 0.25);
-            border-radius: 10px;
-            color: #d1d5db;
-            font-size: 14px;
-            line-height: 1.7;
-            border: 1px solid rgba(255, 255, 255, 0.08);
-        }}
-
-        .max-pain-summary strong {{
-            color: #fff;
-        }}
-    </style>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns"></script>
-</head>
-<body>
-    <div class="container">
-        <!-- Login Screen -->
-        <div id="login-screen" class="login-screen">
-            <h1>🚀 $NIKEPIG's Massive Rocket</h1>
-            <p>Portfolio Performance Tracker</p>
-            
-            <div class="input-group">
-                <label for="api-key-input">Enter Your API Key:</label>
-                <input 
-                    type="text" 
-                    id="api-key-input" 
-                    placeholder="nk_..." 
-                    value="{api_key}"
-                >
-            </div>
-            
-            <button class="btn" onclick="login()">View Dashboard</button>
-            
-            <div id="login-error" style="display: none;"></div>
-        </div>
-        
-        <!-- Setup Wizard -->
-        <div id="setup-wizard" class="setup-wizard" style="display: none;">
-            <h2>🎯 Welcome to $NIKEPIG's Massive Rocket!</h2>
-            <p>We'll automatically detect your Kraken balance and start tracking your performance!</p>
-            
-            <div style="background: #f0f9ff; border-left: 4px solid #3b82f6; padding: 15px; margin: 20px 0; border-radius: 4px;">
-                <div style="color: #1e40af; font-weight: 600; margin-bottom: 5px;">📊 Auto-Detection</div>
-                <div style="color: #1e40af; font-size: 14px;">
-                    We'll query your current Kraken balance and use it as your starting capital. 
-                    Make sure your trading agent is set up first!
-                </div>
-            </div>
-            
-            <button class="btn" onclick="initializePortfolio()">Start Tracking</button>
-            
-            <div id="setup-message" style="display: none;"></div>
-        </div>
-        
-        <!-- Dashboard -->
-        <div id="dashboard" style="display: none;">
-            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
-                <button class="refresh-btn" onclick="refreshDashboard()" style="
-                    padding: 12px 24px;
-                    background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    font-weight: 600;
-                    cursor: pointer;
-                    font-size: 14px;
-                    display: flex;
-                    align-items: center;
-                    gap: 8px;
-                    transition: all 0.1s ease;
-                    box-shadow: 0 4px 6px rgba(16, 185, 129, 0.3);
-                ">
-                    🔄 Refresh Dashboard
-                </button>
-                <button class="logout-btn" onclick="logout()">Change API Key</button>
-            </div>
-            
-            <!-- Agent Status Display -->
-            <div class="agent-status-container">
-                <div id="agent-status-display" class="agent-status status-unknown">
-                    ⏳ Checking agent status...
-                </div>
-            </div>
-            
-            <!-- Portfolio Overview Section (NEW!) -->
-            <div class="portfolio-overview" style="
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-bottom: 30px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            ">
-                <h2 style="margin: 0 0 20px 0; color: #667eea; font-size: 24px;">
-                    💰 Portfolio Overview
-                </h2>
-                
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 25px;">
-                    <div class="overview-card">
-                        <div style="color: #6b7280; font-size: 14px; margin-bottom: 5px;" title="Total portfolio value including unrealized P&amp;L from all open positions">Current Value <span style="font-size: 11px; opacity: 0.7;">ℹ️</span></div>
-                        <div id="current-value" style="font-size: 32px; font-weight: bold; color: #10b981;">$0</div>
-                        <div style="font-size: 10px; color: #9ca3af; margin-top: 3px;">Includes unrealized P&amp;L • Updates every 60 mins</div>
-                    </div>
-                    
-                    <div class="overview-card">
-                        <div style="color: #6b7280; font-size: 14px; margin-bottom: 5px;">Initial Capital</div>
-                        <div id="initial-capital-display" style="font-size: 28px; font-weight: 600; color: #374151;">$0</div>
-                    </div>
-                    
-                    <div class="overview-card">
-                        <div style="color: #6b7280; font-size: 14px; margin-bottom: 5px;">Net Deposits</div>
-                        <div id="net-deposits" style="font-size: 28px; font-weight: 600; color: #3b82f6;">$0</div>
-                    </div>
-                    
-                    <div class="overview-card">
-                        <div style="color: #6b7280; font-size: 14px; margin-bottom: 5px;" title="Realized P&amp;L from closed signal trades only. Excludes unrealized P&amp;L and manual trades.">Total Profit <span style="font-size: 11px; opacity: 0.7;">ℹ️</span></div>
-                        <div id="total-profit-overview" style="font-size: 28px; font-weight: 600; color: #10b981;">$0</div>
-                        <div style="font-size: 10px; color: #9ca3af; margin-top: 3px;">Realized from closed signal trades</div>
-                    </div>
-                </div>
-                
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; padding: 15px; background: #f9fafb; border-radius: 8px;">
-                    <div>
-                        <div style="font-size: 13px; color: #6b7280;">Funding/Deposits</div>
-                        <div id="total-deposits" style="font-size: 18px; font-weight: 600; color: #10b981;">+$0</div>
-                    </div>
-                    <div>
-                        <div style="font-size: 13px; color: #6b7280;">Fees/Funding/Withdrawals</div>
-                        <div id="total-withdrawals" style="font-size: 18px; font-weight: 600; color: #ef4444;">-$0</div>
-                    </div>
-                    <div>
-                        <div style="font-size: 13px; color: #6b7280;">Total Capital</div>
-                        <div id="total-capital" style="font-size: 18px; font-weight: 600; color: #374151;">$0</div>
-                    </div>
-                    <div>
-                        <div style="font-size: 13px; color: #6b7280;">Last Balance Check</div>
-                        <div id="last-check" style="font-size: 14px; color: #6b7280;">—</div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Agent Control Section (NEW!) -->
-            <div class="agent-control" style="
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-bottom: 30px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            ">
-                <div style="display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 20px;">
-                    <div>
-                        <h2 style="margin: 0 0 10px 0; color: #667eea; font-size: 24px;">
-                            🤖 Trading Agent Control
-                        </h2>
-                        <div style="display: flex; align-items: center; gap: 10px;">
-                            <div style="font-size: 14px; color: #6b7280;">Status:</div>
-                            <div id="agent-status-badge" style="
-                                padding: 4px 12px;
-                                border-radius: 12px;
-                                font-size: 13px;
-                                font-weight: 600;
-                                background: #fee2e2;
-                                color: #991b1b;
-                            ">
-                                Checking...
-                            </div>
-                        </div>
-                        <div id="agent-details" style="font-size: 13px; color: #6b7280; margin-top: 5px;">
-                            <!-- Agent details will load here -->
-                        </div>
-                    </div>
-                    
-                    <div style="display: flex; gap: 10px;">
-                        <button id="start-agent-btn" onclick="startAgent()" style="
-                            padding: 12px 24px;
-                            background: #10b981;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            transition: all 0.1s ease;
-                            display: none;
-                            box-shadow: 0 4px 6px rgba(16, 185, 129, 0.3);
-                        ">
-                            ▶️ Start Agent
-                        </button>
-                        
-                        <button id="stop-agent-btn" onclick="stopAgent()" style="
-                            padding: 12px 24px;
-                            background: #ef4444;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            transition: all 0.1s ease;
-                            display: none;
-                            box-shadow: 0 4px 6px rgba(239, 68, 68, 0.3);
-                        ">
-                            ⏸️ Stop Agent
-                        </button>
-                    </div>
-                </div>
-                
-                <div id="agent-message" style="
-                    margin-top: 15px;
-                    padding: 12px;
-                    border-radius: 6px;
-                    display: none;
-                "></div>
-            </div>
-            
-            <div class="hero">
-                <h1>🚀 $NIKEPIG'S MASSIVE ROCKET PERFORMANCE</h1>
-                
-                <div class="period-selector">
-                    <select id="period-selector" onchange="changePeriod()">
-                        <option value="7d">Last 7 Days</option>
-                        <option value="30d" selected>Last 30 Days</option>
-                        <option value="90d">Last 90 Days</option>
-                        <option value="1y">Last 1 Year</option>
-                        <option value="all">All-Time</option>
-                    </select>
-                </div>
-                
-                <div class="hero-profit" id="total-profit">$0</div>
-                <div class="hero-label" id="profit-label">Total Profit</div>
-                <div style="font-size: 12px; color: rgba(255,255,255,0.6); margin-top: 5px;">Realized P&amp;L from closed signal trades only</div>
-                <div class="hero-subtext" id="time-tracking">Trading since...</div>
-                
-                <!-- Social Sharing Buttons (NEW!) -->
-                <div style="margin: 30px 0;">
-                    <div style="display: flex; gap: 15px; justify-content: center; flex-wrap: wrap; margin-bottom: 20px;">
-                        <button onclick="showBackgroundSelectorForTwitter()" style="
-                            padding: 12px 24px;
-                            background: #1DA1F2;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            font-size: 14px;
-                            display: flex;
-                            align-items: center;
-                            gap: 8px;
-                            box-shadow: 0 4px 12px rgba(29, 161, 242, 0.3);
-                            transition: all 0.1s ease;
-                        ">
-                            <span>𝕏</span> Share to X (+ Download Image)
-                        </button>
-                        
-                        <button onclick="showBackgroundSelectorForDownload()" style="
-                            padding: 12px 24px;
-                            background: #8b5cf6;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            font-size: 14px;
-                            display: flex;
-                            align-items: center;
-                            gap: 8px;
-                            box-shadow: 0 4px 12px rgba(139, 92, 246, 0.3);
-                            transition: all 0.1s ease;
-                        ">
-                            <span>📸</span> Download Image
-                        </button>
-                    </div>
-                    
-                    <!-- Background Selector (Hidden by default) -->
-                    <div id="background-selector" style="
-                        display: none;
-                        background: rgba(255,255,255,0.95);
-                        padding: 20px;
-                        border-radius: 12px;
-                        max-width: 600px;
-                        margin: 0 auto;
-                        box-shadow: 0 8px 24px rgba(0,0,0,0.2);
-                    ">
-                        <h3 style="color: #667eea; margin: 0 0 15px 0; font-size: 18px;">Choose Your Background</h3>
-                        <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin-bottom: 15px;">
-                            <div onclick="selectBackground('charles')" class="bg-option" data-bg="charles" style="
-                                height: 150px;
-                                border-radius: 8px;
-                                cursor: pointer;
-                                background-image: url('https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-charles.png');
-                                background-size: cover;
-                                background-position: center;
-                                border: 3px solid #667eea;
-                                transition: all 0.2s;
-                                position: relative;
-                                overflow: hidden;
-                            ">
-                                <div style="position: absolute; bottom: 0; left: 0; right: 0; background: rgba(0,0,0,0.7); padding: 8px; text-align: center; color: white; font-weight: 600;">
-                                    📚 Charles & Nike
-                                </div>
-                            </div>
-                            
-                            <div onclick="selectBackground('casino')" class="bg-option" data-bg="casino" style="
-                                height: 150px;
-                                border-radius: 8px;
-                                cursor: pointer;
-                                background-image: url('https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-casino.png');
-                                background-size: cover;
-                                background-position: center;
-                                border: 3px solid transparent;
-                                transition: all 0.2s;
-                                position: relative;
-                                overflow: hidden;
-                            ">
-                                <div style="position: absolute; bottom: 0; left: 0; right: 0; background: rgba(0,0,0,0.7); padding: 8px; text-align: center; color: white; font-weight: 600;">
-                                    🎰 Casino Wins
-                                </div>
-                            </div>
-                            
-                            <div onclick="selectBackground('gaming')" class="bg-option" data-bg="gaming" style="
-                                height: 150px;
-                                border-radius: 8px;
-                                cursor: pointer;
-                                background-image: url('https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-gaming.png');
-                                background-size: cover;
-                                background-position: center;
-                                border: 3px solid transparent;
-                                transition: all 0.2s;
-                                position: relative;
-                                overflow: hidden;
-                            ">
-                                <div style="position: absolute; bottom: 0; left: 0; right: 0; background: rgba(0,0,0,0.7); padding: 8px; text-align: center; color: white; font-weight: 600;">
-                                    🎮 Couch Trading
-                                </div>
-                            </div>
-                            
-                            <div onclick="selectBackground('money')" class="bg-option" data-bg="money" style="
-                                height: 150px;
-                                border-radius: 8px;
-                                cursor: pointer;
-                                background-image: url('https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-money.png');
-                                background-size: cover;
-                                background-position: center;
-                                border: 3px solid transparent;
-                                transition: all 0.2s;
-                                position: relative;
-                                overflow: hidden;
-                            ">
-                                <div style="position: absolute; bottom: 0; left: 0; right: 0; background: rgba(0,0,0,0.7); padding: 8px; text-align: center; color: white; font-weight: 600;">
-                                    💰 Money Rain
-                                </div>
-                            </div>
-                        </div>
-                        <button id="selector-action-btn" onclick="handleSelectorAction()" style="
-                            width: 100%;
-                            padding: 12px;
-                            background: #10b981;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            font-size: 14px;
-                            box-shadow: 0 4px 6px rgba(16, 185, 129, 0.3);
-                            transition: all 0.1s ease;
-                        ">
-                            ✅ Download Image
-                        </button>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="tooltip">
-                        How much profit you made compared to your starting balance.
-                        <div class="tooltip-formula">Profit ÷ Initial Capital × 100</div>
-                    </div>
-                    <div class="stat-label" id="label-roi-initial">ROI on Initial Capital</div>
-                    <div class="stat-value" id="roi-initial">0%</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        How much profit you made compared to your total invested (including deposits minus withdrawals).
-                        <div class="tooltip-formula">Profit ÷ (Initial + Deposits - Withdrawals) × 100</div>
-                    </div>
-                    <div class="stat-label" id="label-roi-total">ROI on Total Capital</div>
-                    <div class="stat-value" id="roi-total">0%</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        How much you win vs how much you lose. Above 1.0 means you're profitable. ∞ means no losses yet!
-                        <div class="tooltip-formula">Total $ Won ÷ Total $ Lost</div>
-                    </div>
-                    <div class="stat-label">Profit Factor <span style="opacity: 0.6; font-size: 11px;">(All Time)</span></div>
-                    <div class="stat-value" id="profit-factor">0x</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        Your single most profitable trade in this period.
-                        <div class="tooltip-formula">MAX(trade profits)</div>
-                    </div>
-                    <div class="stat-label" id="label-best-trade">Best Trade</div>
-                    <div class="stat-value" id="best-trade">$0</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        Average profit/loss per trade in this period.
-                        <div class="tooltip-formula">Total Profit ÷ Number of Trades</div>
-                    </div>
-                    <div class="stat-label" id="label-avg-trade">Avg Trade</div>
-                    <div class="stat-value" id="avg-trade">$0</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        Number of completed trades in this period.
-                        <div class="tooltip-formula">COUNT(closed trades)</div>
-                    </div>
-                    <div class="stat-label" id="label-total-trades">Total Trades</div>
-                    <div class="stat-value" id="total-trades">0</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        Largest peak-to-valley drop in your portfolio. Lower is better!
-                        <div class="tooltip-formula">(Peak Value - Lowest Point) ÷ Peak × 100</div>
-                    </div>
-                    <div class="stat-label" id="label-max-dd">Max Drawdown</div>
-                    <div class="stat-value" id="max-dd">0%</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        Risk-adjusted return. Above 1.0 is good, above 2.0 is great! N/A if less than 2 trades.
-                        <div class="tooltip-formula">Avg Return ÷ Volatility × √252</div>
-                    </div>
-                    <div class="stat-label">Sharpe Ratio <span style="opacity: 0.6; font-size: 11px;">(All Time)</span></div>
-                    <div class="stat-value" id="sharpe">0.0</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="tooltip">
-                        Days since your very first trade with Nike Rocket.
-                        <div class="tooltip-formula">Today - First Trade Date</div>
-                    </div>
-                    <div class="stat-label">Days Active <span style="opacity: 0.6; font-size: 11px;">(All Time)</span></div>
-                    <div class="stat-value" id="days-active">0</div>
-                </div>
-            </div>
-            
-            <!-- Equity Curve Chart Section (NEW!) -->
-            <div class="equity-curve-section" style="
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-top: 30px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            ">
-                <div class="section-header">
-                    <div>
-                        <h2 style="margin: 0; color: #667eea; font-size: 24px;">
-                            📈 Trading Equity Curve
-                        </h2>
-                        <p style="margin: 5px 0 0 0; font-size: 13px; color: #6b7280;">
-                            Realized P&amp;L from closed signal trades (excludes unrealized P&amp;L, manual trades, deposits/withdrawals)
-                        </p>
-                    </div>
-                    <div class="section-header-actions">
-                        <span id="equity-stats" style="font-size: 13px; color: #6b7280;"></span>
-                    </div>
-                </div>
-                
-                <div id="equity-chart-container" style="position: relative; height: 350px; width: 100%;">
-                    <canvas id="equity-chart"></canvas>
-                </div>
-                
-                <div id="equity-summary" style="
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
-                    gap: 15px;
-                    margin-top: 20px;
-                    padding-top: 20px;
-                    border-top: 1px solid #e5e7eb;
-                ">
-                    <div style="text-align: center;">
-                        <div style="font-size: 12px; color: #6b7280;">Starting</div>
-                        <div id="eq-initial" style="font-size: 18px; font-weight: 600; color: #374151;">$0</div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="font-size: 12px; color: #6b7280;">Current</div>
-                        <div id="eq-current" style="font-size: 18px; font-weight: 600; color: #10b981;">$0</div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="font-size: 12px; color: #6b7280;">Peak</div>
-                        <div id="eq-peak" style="font-size: 18px; font-weight: 600; color: #667eea;">$0</div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="font-size: 12px; color: #6b7280;">Trough</div>
-                        <div id="eq-trough" style="font-size: 18px; font-weight: 600; color: #ef4444;">$0</div>
-                    </div>
-                    <div style="text-align: center;">
-                        <div style="font-size: 12px; color: #6b7280;">Max Drawdown</div>
-                        <div id="eq-maxdd" style="font-size: 18px; font-weight: 600; color: #f59e0b;">0%</div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Open Positions Section (LIVE TRADES) -->
-            <div class="open-positions" style="
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-top: 30px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            ">
-                <div class="section-header" style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
-                    <h2 style="margin: 0; color: #667eea; font-size: 24px;">
-                        🔥 Open Positions
-                    </h2>
-                    <div style="text-align: right;">
-                        <span id="open-positions-count" style="font-size: 14px; color: #6b7280; display: block;"></span>
-                        <span style="font-size: 11px; color: #9ca3af;">🕐 Times in your local timezone</span>
-                    </div>
-                </div>
-                
-                <div id="open-positions-list" style="overflow-x: auto;">
-                    <!-- Positions will be loaded here -->
-                    <div style="text-align: center; padding: 40px; color: #9ca3af;">
-                        Loading open positions...
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Transaction History Section (NEW!) -->
-            <div class="transaction-history" style="
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-top: 30px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            ">
-                <div class="section-header">
-                    <h2 style="margin: 0; color: #667eea; font-size: 24px;">
-                        📜 Transaction History
-                    </h2>
-                </div>
-                
-                <!-- Date Filter Controls -->
-                <div style="
-                    display: flex;
-                    gap: 15px;
-                    align-items: center;
-                    padding: 15px;
-                    background: #f9fafb;
-                    border-radius: 8px;
-                    margin-bottom: 15px;
-                    flex-wrap: wrap;
-                ">
-                    <div style="display: flex; align-items: center; gap: 8px;">
-                        <label style="font-size: 14px; color: #374151; font-weight: 500;">From:</label>
-                        <input type="date" id="tx-start-date" style="
-                            padding: 8px 12px;
-                            border: 1px solid #e5e7eb;
-                            border-radius: 6px;
-                            font-size: 14px;
-                            color: #374151;
-                        ">
-                    </div>
-                    <div style="display: flex; align-items: center; gap: 8px;">
-                        <label style="font-size: 14px; color: #374151; font-weight: 500;">To:</label>
-                        <input type="date" id="tx-end-date" style="
-                            padding: 8px 12px;
-                            border: 1px solid #e5e7eb;
-                            border-radius: 6px;
-                            font-size: 14px;
-                            color: #374151;
-                        ">
-                    </div>
-                    <button onclick="applyDateFilter()" style="
-                        background: #667eea;
-                        color: white;
-                        border: none;
-                        padding: 8px 16px;
-                        border-radius: 6px;
-                        cursor: pointer;
-                        font-size: 14px;
-                    ">
-                        🔍 Search
-                    </button>
-                    <button onclick="clearDateFilter()" style="
-                        background: #f3f4f6;
-                        color: #374151;
-                        border: 1px solid #e5e7eb;
-                        padding: 8px 16px;
-                        border-radius: 6px;
-                        cursor: pointer;
-                        font-size: 14px;
-                    ">
-                        ✕ Clear
-                    </button>
-                    <div id="date-filter-status" style="font-size: 12px; color: #6b7280; margin-left: auto;">
-                    </div>
-                </div>
-                
-                <div id="transaction-list" style="max-height: 500px; overflow-y: auto;">
-                    <!-- Transactions will be loaded here -->
-                    <div style="text-align: center; padding: 40px; color: #9ca3af;">
-                        Loading transactions...
-                    </div>
-                </div>
-                
-                <div id="transaction-load-more" style="display: none; text-align: center; padding: 15px;">
-                    <button onclick="loadMoreTransactions()" style="
-                        background: #f3f4f6;
-                        color: #374151;
-                        border: 1px solid #e5e7eb;
-                        padding: 10px 24px;
-                        border-radius: 6px;
-                        cursor: pointer;
-                        font-size: 14px;
-                        transition: all 0.1s ease;
-                    ">
-                        📜 Load More
-                    </button>
-                    <div id="transaction-count" style="font-size: 12px; color: #9ca3af; margin-top: 8px;">
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Trade Export Section (NEW!) -->
-            <div class="trade-export" style="
-                background: white;
-                border-radius: 12px;
-                padding: 30px;
-                margin-top: 30px;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            ">
-                <h2 style="margin: 0 0 20px 0; color: #667eea; font-size: 24px;">
-                    📊 Export Trade History
-                </h2>
-                
-                <div class="export-grid">
-                    <!-- Monthly Export -->
-                    <div style="background: #f9fafb; padding: 20px; border-radius: 8px;">
-                        <h3 style="margin: 0 0 15px 0; color: #374151; font-size: 18px;">📅 Monthly Report</h3>
-                        <div style="display: flex; gap: 10px; margin-bottom: 15px;">
-                            <select id="export-month" style="flex: 1; padding: 10px; border: 2px solid #e5e7eb; border-radius: 6px; font-size: 14px;">
-                                <option value="01">January</option>
-                                <option value="02">February</option>
-                                <option value="03">March</option>
-                                <option value="04">April</option>
-                                <option value="05">May</option>
-                                <option value="06">June</option>
-                                <option value="07">July</option>
-                                <option value="08">August</option>
-                                <option value="09">September</option>
-                                <option value="10">October</option>
-                                <option value="11">November</option>
-                                <option value="12">December</option>
-                            </select>
-                            <select id="export-month-year" style="width: 100px; padding: 10px; border: 2px solid #e5e7eb; border-radius: 6px; font-size: 14px;">
-                            </select>
-                        </div>
-                        <button onclick="downloadMonthlyTrades()" style="
-                            width: 100%;
-                            padding: 12px;
-                            background: #10b981;
-                            color: white;
-                            border: none;
-                            border-radius: 6px;
-                            font-size: 14px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            transition: all 0.1s ease;
-                        ">
-                            ⬇️ Download Monthly CSV
-                        </button>
-                    </div>
-                    
-                    <!-- Yearly Export -->
-                    <div style="background: #f9fafb; padding: 20px; border-radius: 8px;">
-                        <h3 style="margin: 0 0 15px 0; color: #374151; font-size: 18px;">📆 Yearly Report</h3>
-                        <div style="margin-bottom: 15px;">
-                            <select id="export-year" style="width: 100%; padding: 10px; border: 2px solid #e5e7eb; border-radius: 6px; font-size: 14px;">
-                            </select>
-                        </div>
-                        <button onclick="downloadYearlyTrades()" style="
-                            width: 100%;
-                            padding: 12px;
-                            background: #3b82f6;
-                            color: white;
-                            border: none;
-                            border-radius: 6px;
-                            font-size: 14px;
-                            font-weight: 600;
-                            cursor: pointer;
-                            transition: all 0.1s ease;
-                        ">
-                            ⬇️ Download Yearly CSV
-                        </button>
-                    </div>
-                </div>
-                
-                <div style="margin-top: 15px; padding: 12px; background: #eff6ff; border-radius: 6px; font-size: 13px; color: #1e40af;">
-                    💡 CSV exports include: Date, Symbol, Side, Entry Price, Exit Price, Position Size, P&L, and Net P&L summary
-                </div>
-            </div>
-            
-            <!-- Backtest Results Section -->
-            <div class="backtest-section">
-                <div class="backtest-header" onclick="toggleBacktestSection()">
-                    <h2>📊 Backtested Performance (ADA/USDT)</h2>
-                    <span class="toggle-icon" id="backtestToggle">▼</span>
-                </div>
-                
-                <div class="backtest-grid" id="backtestGrid">
-                    <!-- Bull Market -->
-                    <div class="backtest-card">
-                        <span class="market-badge bull">🚀 BULL MARKET</span>
-                        <div class="period">Jan 2020 → Aug 2021 (1.6 years)</div>
-                        <div class="result profit">+10,132%</div>
-                        <div class="final-value">$300 → $30,695</div>
-                        <div class="stats">
-                            <div class="stat">
-                                <div class="stat-label">Buy & Hold</div>
-                                <div class="stat-value positive">+4,377%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Outperformance</div>
-                                <div class="stat-value">2.3x</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Win Rate</div>
-                                <div class="stat-value">42.2%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Max Drawdown</div>
-                                <div class="stat-value">37.6%</div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Bear Market -->
-                    <div class="backtest-card">
-                        <span class="market-badge bear">🐻 BEAR MARKET</span>
-                        <div class="period">Sep 2021 → Jun 2023 (1.75 years)</div>
-                        <div class="result profit">+5,402%</div>
-                        <div class="final-value">$300 → $16,505</div>
-                        <div class="stats">
-                            <div class="stat">
-                                <div class="stat-label">Buy & Hold</div>
-                                <div class="stat-value negative">-84.4%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Outperformance</div>
-                                <div class="stat-value">∞</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Win Rate</div>
-                                <div class="stat-value">42.0%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Max Drawdown</div>
-                                <div class="stat-value">38.9%</div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Sideways/Chop Market -->
-                    <div class="backtest-card">
-                        <span class="market-badge sideways">🦀 SIDEWAYS CHOP</span>
-                        <div class="period">Jun 2023 → Nov 2025 (2.5 years)</div>
-                        <div class="result profit">+9,850%</div>
-                        <div class="final-value">$300 → $29,849</div>
-                        <div class="stats">
-                            <div class="stat">
-                                <div class="stat-label">Buy & Hold</div>
-                                <div class="stat-value positive">+60.9%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Outperformance</div>
-                                <div class="stat-value">162x</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Win Rate</div>
-                                <div class="stat-value">41.1%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Max Drawdown</div>
-                                <div class="stat-value">40.2%</div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Full Cycle -->
-                    <div class="backtest-card">
-                        <span class="market-badge full">📈 FULL CYCLE</span>
-                        <div class="period">Jan 2020 → Nov 2025 (5.8 years)</div>
-                        <div class="result profit">+83.8M%</div>
-                        <div class="final-value">$300 → $251.4M</div>
-                        <div class="stats">
-                            <div class="stat">
-                                <div class="stat-label">Buy & Hold</div>
-                                <div class="stat-value positive">+582%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Outperformance</div>
-                                <div class="stat-value">144,008x</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Win Rate</div>
-                                <div class="stat-value">41.8%</div>
-                            </div>
-                            <div class="stat">
-                                <div class="stat-label">Max Drawdown</div>
-                                <div class="stat-value">40.2%</div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-
-                <!-- Max Pain / What to Expect Section -->
-                <div class="max-pain-section">
-                    <h3>🔥 What to Expect: The Hard Truth</h3>
-                    
-                    <div class="max-pain-grid">
-                        <div class="pain-stat">
-                            <div class="pain-value">~40%</div>
-                            <div class="pain-label">Max Drawdown</div>
-                            <div class="pain-explanation">Your account could drop 40% from its peak before recovering. This is normal and expected.</div>
-                        </div>
-                        
-                        <div class="pain-stat">
-                            <div class="pain-value">7-9</div>
-                            <div class="pain-label">Max Losses in a Row</div>
-                            <div class="pain-explanation">You may experience 7-9 consecutive losing trades. Stay disciplined - winners follow.</div>
-                        </div>
-                        
-                        <div class="pain-stat">
-                            <div class="pain-value">~42%</div>
-                            <div class="pain-label">Win Rate</div>
-                            <div class="pain-explanation">You'll lose more trades than you win. But winners are ~1.7x larger than losers on average.</div>
-                        </div>
-                        
-                        <div class="pain-stat">
-                            <div class="pain-value">2-3%</div>
-                            <div class="pain-label">Risk Per Trade</div>
-                            <div class="pain-explanation">Each trade risks only 2-3% of your account. This is how we survive losing streaks.</div>
-                        </div>
-                    </div>
-                    
-                    <div class="max-pain-summary">
-                        <strong>💡 The Psychology:</strong> Most traders quit during drawdowns or losing streaks - right before the system recovers. 
-                        The algo made money in <strong>bull markets</strong>, <strong>bear markets</strong>, and <strong>sideways chop</strong> because it stayed consistent. 
-                        Your job is simple: <strong>don't interfere</strong>. Let the math play out over hundreds of trades.
-                    </div>
-                </div>
-
-                <div class="backtest-disclaimer">
-                    ⚠️ <strong>Past performance does not guarantee future results.</strong> Backtests use historical Binance data with 20x max leverage, 2-3% risk per trade. Real trading involves slippage, fees, and market conditions that may differ. Trade responsibly.
-                </div>
-            </div>
-            
-            <!-- Safety & Trust Section -->
-            <div class="safety-section">
-                <div class="safety-header" onclick="toggleSafetySection()">
-                    <h2>🛡️ Safety & Trust</h2>
-                    <span class="toggle-icon">▼</span>
-                </div>
-                
-                <div class="safety-grid" id="safetyGrid">
-                    <!-- Non-Custodial -->
-                    <div class="safety-card">
-                        <div class="icon">🔐</div>
-                        <h3>100% Non-Custodial</h3>
-                        <p>Your funds never leave your Kraken account. We can't touch them.</p>
-                        <ul>
-                            <li>Trade-only API permissions</li>
-                            <li>Withdrawals NEVER enabled</li>
-                            <li>Funds stay in YOUR wallet</li>
-                            <li>Revoke access anytime</li>
-                        </ul>
-                    </div>
-
-                    <!-- Open Source -->
-                    <div class="safety-card">
-                        <div class="icon">📖</div>
-                        <h3>Fully Open Source</h3>
-                        <p>Don't trust, verify. Our entire codebase is public.</p>
-                        <ul>
-                            <li>Audit every line of code</li>
-                            <li>See how trades execute</li>
-                            <li>Verify billing logic</li>
-                            <li>Community reviewed</li>
-                        </ul>
-                        <a href="https://github.com/DrCalebL/nike-rocket-api" target="_blank" class="github-link">
-                            <svg viewBox="0 0 16 16" fill="currentColor">
-                                <path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59.4.07.55-.17.55-.38 0-.19-.01-.82-.01-1.49-2.01.37-2.53-.49-2.69-.94-.09-.23-.48-.94-.82-1.13-.28-.15-.68-.52-.01-.53.63-.01 1.08.58 1.23.82.72 1.21 1.87.87 2.33.66.07-.52.28-.87.51-1.07-1.78-.2-3.64-.89-3.64-3.95 0-.87.31-1.59.82-2.15-.08-.2-.36-1.02.08-2.12 0 0 .67-.21 2.2.82.64-.18 1.32-.27 2-.27.68 0 1.36.09 2 .27 1.53-1.04 2.2-.82 2.2-.82.44 1.1.16 1.92.08 2.12.51.56.82 1.27.82 2.15 0 3.07-1.87 3.75-3.65 3.95.29.25.54.73.54 1.48 0 1.07-.01 1.93-.01 2.2 0 .21.15.46.55.38A8.013 8.013 0 0016 8c0-4.42-3.58-8-8-8z"/>
-                            </svg>
-                            nike-rocket-api
-                        </a>
-                        <a href="https://github.com/DrCalebL/kraken-follower-agent" target="_blank" class="github-link" style="margin-top: 8px;">
-                            <svg viewBox="0 0 16 16" fill="currentColor">
-                                <path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59.4.07.55-.17.55-.38 0-.19-.01-.82-.01-1.49-2.01.37-2.53-.49-2.69-.94-.09-.23-.48-.94-.82-1.13-.28-.15-.68-.52-.01-.53.63-.01 1.08.58 1.23.82.72 1.21 1.87.87 2.33.66.07-.52.28-.87.51-1.07-1.78-.2-3.64-.89-3.64-3.95 0-.87.31-1.59.82-2.15-.08-.2-.36-1.02.08-2.12 0 0 .67-.21 2.2.82.64-.18 1.32-.27 2-.27.68 0 1.36.09 2 .27 1.53-1.04 2.2-.82 2.2-.82.44 1.1.16 1.92.08 2.12.51.56.82 1.27.82 2.15 0 3.07-1.87 3.75-3.65 3.95.29.25.54.73.54 1.48 0 1.07-.01 1.93-.01 2.2 0 .21.15.46.55.38A8.013 8.013 0 0016 8c0-4.42-3.58-8-8-8z"/>
-                            </svg>
-                            kraken-follower-agent
-                        </a>
-                    </div>
-
-                    <!-- Risk Management -->
-                    <div class="safety-card">
-                        <div class="icon">📊</div>
-                        <h3>Professional Risk Management</h3>
-                        <p>Strict protocols used by professional traders.</p>
-                        <ul>
-                            <li>2-3% max risk per trade</li>
-                            <li>ATR-based dynamic stops</li>
-                            <li>TP & SL on every trade</li>
-                            <li>Risk-based position sizing</li>
-                        </ul>
-                    </div>
-
-                    <!-- Order Retry Logic -->
-                    <div class="safety-card">
-                        <div class="icon">🔄</div>
-                        <h3>Bulletproof Order Execution</h3>
-                        <p>Automatic retry logic protects every trade.</p>
-                        <ul>
-                            <li>3 retry attempts per order</li>
-                            <li>Exponential backoff timing</li>
-                            <li>Entry/TP/SL fails = trade aborted safely</li>
-                            <li>Admin alerted on any failure</li>
-                        </ul>
-                    </div>
-
-                    <!-- Fair Billing -->
-                    <div class="safety-card">
-                        <div class="icon">💰</div>
-                        <h3>Fair Profit-Share Billing</h3>
-                        <p>We only profit when YOU profit.</p>
-                        <ul>
-                            <li>10% of net profits only</li>
-                            <li>Losses offset wins</li>
-                            <li>30-day billing cycles</li>
-                            <li>No profit = no fee</li>
-                        </ul>
-                    </div>
-
-                    <!-- Signal Matching -->
-                    <div class="safety-card">
-                        <div class="icon">🎯</div>
-                        <h3>Smart Signal Matching</h3>
-                        <p>We know the difference between our trades and yours.</p>
-                        <ul>
-                            <li>Only billed for our signals</li>
-                            <li>Your manual trades are free</li>
-                            <li>No surprise fees</li>
-                            <li>Full audit trail</li>
-                        </ul>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        let currentApiKey = '{api_key}';
-        let currentPeriod = '30d';
-        
-        // Safety section toggle
-        function toggleSafetySection() {{
-            const header = document.querySelector('.safety-header');
-            const grid = document.getElementById('safetyGrid');
-            header.classList.toggle('collapsed');
-            grid.classList.toggle('hidden');
-        }}
-
-        function toggleBacktestSection() {{
-            const grid = document.getElementById('backtestGrid');
-            const toggle = document.getElementById('backtestToggle');
-            const disclaimer = grid.nextElementSibling;
-            if (grid.style.display === 'none') {{
-                grid.style.display = 'grid';
-                disclaimer.style.display = 'block';
-                toggle.textContent = '▼';
-            }} else {{
-                grid.style.display = 'none';
-                disclaimer.style.display = 'none';
-                toggle.textContent = '▶';
-            }}
-        }}
-        
-        // On page load
-        if (currentApiKey) {{
-            document.getElementById('api-key-input').value = currentApiKey;
-            login();
-        }}
-        
-        // ═══════════════════════════════════════════════════════════════
-        // Agent Status Monitoring Functions
-        // ═══════════════════════════════════════════════════════════════
-        
-        async function checkAgentStatusAPI() {{
-            try {{
-                const response = await fetch('/api/agent-status', {{
-                    headers: {{'X-API-Key': currentApiKey}}
-                }});
-                
-                const data = await response.json();
-                return data;
-                
-            }} catch (error) {{
-                console.error('Error checking agent status:', error);
-                return {{ agent_active: false, agent_configured: false, message: error.message }};
-            }}
-        }}
-        
-        async function displayAgentStatus() {{
-            try {{
-                const statusData = await checkAgentStatusAPI();
-                
-                const statusElement = document.getElementById('agent-status-display');
-                if (!statusElement) return;
-                
-                let statusHTML = '';
-                let statusClass = '';
-                
-                // API returns: agent_active, agent_configured, message
-                if (statusData.agent_active) {{
-                    statusHTML = '🟢 <strong>Agent Active</strong> - Following signals';
-                    statusClass = 'status-active';
-                }} else if (statusData.agent_configured) {{
-                    statusHTML = '🟡 <strong>Ready</strong> - Agent configured but stopped';
-                    statusClass = 'status-ready';
-                }} else {{
-                    statusHTML = '🔴 <strong>Not Configured</strong> - <a href="/setup?key=' + currentApiKey + '" style="color: #dc2626;">Complete setup</a>';
-                    statusClass = 'status-error';
-                }}
-                
-                statusElement.innerHTML = statusHTML;
-                statusElement.className = 'agent-status ' + statusClass;
-                
-            }} catch (error) {{
-                console.error('Error displaying agent status:', error);
-            }}
-        }}
-        
-        let agentStatusInterval = null;
-        
-        function startAgentStatusMonitoring() {{
-            if (agentStatusInterval) {{
-                clearInterval(agentStatusInterval);
-            }}
-            
-            // Display immediately
-            displayAgentStatus();
-            
-            // Then update every 30 seconds
-            agentStatusInterval = setInterval(() => {{
-                displayAgentStatus();
-            }}, 30000);
-        }}
-        
-        function stopAgentStatusMonitoring() {{
-            if (agentStatusInterval) {{
-                clearInterval(agentStatusInterval);
-                agentStatusInterval = null;
-            }}
-        }}
-        
-        // ═══════════════════════════════════════════════════════════════
-        
-        function login() {{
-            const apiKey = document.getElementById('api-key-input').value.trim();
-            
-            if (!apiKey) {{
-                showError('login-error', 'Please enter your API key');
-                return;
-            }}
-            
-            if (!apiKey.startsWith('nk_')) {{
-                showError('login-error', 'Invalid API key format. Keys should start with "nk_"');
-                return;
-            }}
-            
-            currentApiKey = apiKey;
-            localStorage.setItem('apiKey', apiKey);
-            
-            // Try to load stats
-            checkPortfolioStatus();
-        }}
-        
-        function logout() {{
-            stopAgentStatusMonitoring();
-            localStorage.removeItem('apiKey');
-            currentApiKey = '';
-            document.getElementById('login-screen').style.display = 'block';
-            document.getElementById('setup-wizard').style.display = 'none';
-            document.getElementById('dashboard').style.display = 'none';
-        }}
-        
-        async function checkPortfolioStatus() {{
-            try {{
-                const response = await fetch(`/api/portfolio/balance-summary?key=${{currentApiKey}}`, {{
-                    headers: {{'X-API-Key': currentApiKey}}
-                }});
-                
-                if (response.status === 401) {{
-                    showError('login-error', 'Invalid API key. Please check and try again.');
-                    return;
-                }}
-                
-                if (!response.ok) {{
-                    // Handle other errors (500, 404, etc.)
-                    console.error('Portfolio stats error:', response.status);
-                    // Still try to show setup wizard for new users
-                    showSetupWizard();
-                    return;
-                }}
-                
-                const data = await response.json();
-                
-                if (data.status === 'success' || data.total_profit !== undefined) {{
-                    // Portfolio initialized - show dashboard with data
-                    showDashboard(data);
-                    // Initialize export controls
-                    initExportControls();
-                    // Load balance summary and transactions
-                    await loadBalanceSummary();
-                    await loadPositions();
-                    await loadTransactionHistory();
-                    // Load equity curve chart
-                    await loadEquityCurve();
-                    // Load performance stats for default 30d period (fixes hero section showing $0)
-                    await changePeriod();
-                    // Check agent status
-                    await checkAgentStatus();
-                }} else if (data.status === 'not_initialized') {{
-                    // Portfolio not yet initialized - show setup wizard
-                    showSetupWizard();
-                }} else {{
-                    // Unknown status - show setup wizard
-                    showSetupWizard();
-                }}
-                
-            }} catch (error) {{
-                console.error('Error:', error);
-                // If error, assume needs setup
-                showSetupWizard();
-            }}
-        }}
-        
-        function showSetupWizard() {{
-            document.getElementById('login-screen').style.display = 'none';
-            document.getElementById('setup-wizard').style.display = 'block';
-            document.getElementById('dashboard').style.display = 'none';
-        }}
-        
-        async function initializePortfolio() {{
-            // No need to get initial capital - it will be auto-detected!
-            
-            try {{
-                // Show loading message
-                showSuccess('setup-message', '🔍 Detecting your Kraken balance...');
-                
-                const response = await fetch('/api/portfolio/initialize', {{
-                    method: 'POST',
-                    headers: {{
-                        'X-API-Key': currentApiKey,
-                        'Content-Type': 'application/json'
-                    }},
-                    body: JSON.stringify({{}})  // Empty - auto-detect!
-                }});
-                
-                const data = await response.json();
-                
-                if (data.status === 'success') {{
-                    showSuccess('setup-message', 
-                        `✅ Portfolio initialized with $${{data.initial_capital.toLocaleString()}} detected from your Kraken account!`);
-                    setTimeout(() => checkPortfolioStatus(), 2000);
-                }} else if (data.status === 'already_initialized') {{
-                    showSuccess('setup-message', 'Portfolio already initialized! Loading dashboard...');
-                    setTimeout(() => checkPortfolioStatus(), 1000);
-                }} else if (data.status === 'error') {{
-                    // Show error with setup link if needed
-                    if (data.message.includes('set up your trading agent')) {{
-                        showError('setup-message', 
-                            data.message + '<br><br>' +
-                            '<a href="/setup?key=' + currentApiKey + '" ' +
-                            'style="color: #ffffff; text-decoration: underline; font-weight: bold;">' +
-                            '→ Go to Agent Setup</a>');
-                    }} else {{
-                        showError('setup-message', data.message);
-                    }}
-                }} else {{
-                    showError('setup-message', data.message || 'Failed to initialize portfolio');
-                }}
-                
-            }} catch (error) {{
-                showError('setup-message', 'Error initializing portfolio: ' + error.message);
-            }}
-        }}
-        
-        function showDashboard(stats) {{
-            document.getElementById('login-screen').style.display = 'none';
-            document.getElementById('setup-wizard').style.display = 'none';
-            document.getElementById('dashboard').style.display = 'block';
-            
-            // Start agent status monitoring
-            startAgentStatusMonitoring();
-            
-            // Don't call updateDashboard - portfolio data loaded separately
-            // The loadBalanceSummary() function handles all portfolio updates
-        }}
-        
-        function updateDashboard(stats) {{
-            // Update profit label with readable period
-            const periodDisplayLabels = {{
-                '7d': '7d',
-                '30d': '30d',
-                '90d': '90d',
-                '1y': '1y',
-                'all': 'All-Time'
-            }};
-            document.getElementById('profit-label').textContent = `${{periodDisplayLabels[stats.period] || stats.period}} Profit`;
-            
-            // Handle negative total profit
-            const totalProfit = stats.total_profit || 0;
-            document.getElementById('total-profit').textContent = 
-                totalProfit >= 0 
-                    ? `+$${{totalProfit.toLocaleString()}}` 
-                    : `-$${{Math.abs(totalProfit).toLocaleString()}}`;
-            document.getElementById('total-profit').style.color = totalProfit >= 0 ? '#10b981' : '#ef4444';
-            
-            // ═══════════════════════════════════════════════════════════════
-            // PERIOD-SPECIFIC LABELS
-            // ═══════════════════════════════════════════════════════════════
-            const periodLabels = {{
-                '7d': '7D',
-                '30d': '30D',
-                '90d': '90D',
-                '1y': '1Y',
-                'all': 'All Time'
-            }};
-            const periodTag = `<span style="opacity: 0.6; font-size: 11px;">(${{periodLabels[currentPeriod] || '30D'}})</span>`;
-            
-            // Update period-specific labels
-            document.getElementById('label-roi-initial').innerHTML = `ROI on Initial Capital ${{periodTag}}`;
-            document.getElementById('label-roi-total').innerHTML = `ROI on Total Capital ${{periodTag}}`;
-            document.getElementById('label-best-trade').innerHTML = `Best Trade ${{periodTag}}`;
-            document.getElementById('label-avg-trade').innerHTML = `Avg Trade ${{periodTag}}`;
-            document.getElementById('label-total-trades').innerHTML = `Total Trades ${{periodTag}}`;
-            document.getElementById('label-max-dd').innerHTML = `Max Drawdown ${{periodTag}}`;
-            
-            // ═══════════════════════════════════════════════════════════════
-            // PERIOD-SPECIFIC VALUES
-            // ═══════════════════════════════════════════════════════════════
-            // Handle negative ROI values (period-specific)
-            const roiInitial = stats.roi_on_initial || 0;
-            const roiTotal = stats.roi_on_total || roiInitial;
-            document.getElementById('roi-initial').textContent = 
-                roiInitial >= 0 ? `+${{roiInitial.toFixed(1)}}%` : `${{roiInitial.toFixed(1)}}%`;
-            document.getElementById('roi-initial').style.color = roiInitial >= 0 ? '#10b981' : '#ef4444';
-            document.getElementById('roi-total').textContent = 
-                roiTotal >= 0 ? `+${{roiTotal.toFixed(1)}}%` : `${{roiTotal.toFixed(1)}}%`;
-            document.getElementById('roi-total').style.color = roiTotal >= 0 ? '#10b981' : '#ef4444';
-            
-            // Handle negative best trade (period-specific)
-            const bestTrade = stats.best_trade || 0;
-            document.getElementById('best-trade').textContent = 
-                bestTrade >= 0 ? `+$${{bestTrade.toLocaleString()}}` : `-$${{Math.abs(bestTrade).toLocaleString()}}`;
-            document.getElementById('best-trade').style.color = bestTrade >= 0 ? '#10b981' : '#ef4444';
-            
-            // Handle negative avg trade (period-specific)
-            const avgTrade = stats.avg_trade || 0;
-            document.getElementById('avg-trade').textContent = 
-                avgTrade >= 0 ? `+$${{avgTrade.toLocaleString()}}` : `-$${{Math.abs(avgTrade).toLocaleString()}}`;
-            document.getElementById('avg-trade').style.color = avgTrade >= 0 ? '#10b981' : '#ef4444';
-            
-            // Total trades (period-specific)
-            document.getElementById('total-trades').textContent = stats.total_trades;
-            
-            // Max drawdown (period-specific, no minus for 0%)
-            const maxDD = stats.max_drawdown || 0;
-            document.getElementById('max-dd').textContent = maxDD > 0 ? `-${{maxDD}}%` : `0%`;
-            
-            // ═══════════════════════════════════════════════════════════════
-            // ALL-TIME VALUES (Profit Factor, Sharpe Ratio, Days Active)
-            // ═══════════════════════════════════════════════════════════════
-            // Profit Factor (all-time)
-            if (stats.all_time_profit_factor === null) {{
-                document.getElementById('profit-factor').textContent = '∞';
-                document.getElementById('profit-factor').style.color = '#10b981';
-            }} else {{
-                const pf = stats.all_time_profit_factor || 0;
-                document.getElementById('profit-factor').textContent = `${{pf}}x`;
-                document.getElementById('profit-factor').style.color = pf >= 1 ? '#10b981' : '#ef4444';
-            }}
-            
-            // Sharpe ratio (all-time)
-            if (stats.all_time_sharpe === null) {{
-                document.getElementById('sharpe').textContent = 'N/A';
-                document.getElementById('sharpe').style.color = '#9ca3af';
-            }} else {{
-                const sharpe = stats.all_time_sharpe || 0;
-                document.getElementById('sharpe').textContent = sharpe.toFixed(1);
-                document.getElementById('sharpe').style.color = sharpe >= 1 ? '#10b981' : (sharpe >= 0 ? '#fbbf24' : '#ef4444');
-            }}
-            
-            // Days active (all-time)
-            document.getElementById('days-active').textContent = stats.all_time_days_active || '< 1';
-            
-            if (stats.started_tracking) {{
-                const startDate = new Date(stats.started_tracking);
-                document.getElementById('time-tracking').textContent = 
-                    `Trading since ${{startDate.toLocaleDateString()}} • ${{stats.period}}`;
-            }}
-        }}
-        
-        // NEW: Load balance summary
-        async function loadBalanceSummary() {{
-            try {{
-                const response = await fetch(`/api/portfolio/balance-summary?key=${{currentApiKey}}`);
-                
-                if (response.status === 401) {{
-                    // Invalid API key - redirect to login
-                    alert('Invalid API key. Please log in again.');
-                    logout();
-                    return;
-                }}
-                
-                const data = await response.json();
-                
-                if (data.status === 'success') {{
-                    // Update portfolio overview
-                    document.getElementById('current-value').textContent = 
-                        `$${{data.current_value.toLocaleString()}}`;
-                    document.getElementById('initial-capital-display').textContent = 
-                        `$${{data.initial_capital.toLocaleString()}}`;
-                    document.getElementById('net-deposits').textContent = 
-                        data.net_deposits >= 0 
-                            ? `+$${{data.net_deposits.toLocaleString()}}`
-                            : `-$${{Math.abs(data.net_deposits).toLocaleString()}}`;
-                    
-                    // Handle negative total profit with color
-                    const totalProfit = data.total_profit || 0;
-                    const profitEl = document.getElementById('total-profit-overview');
-                    profitEl.textContent = totalProfit >= 0 
-                        ? `+$${{totalProfit.toLocaleString()}}` 
-                        : `-$${{Math.abs(totalProfit).toLocaleString()}}`;
-                    profitEl.style.color = totalProfit >= 0 ? '#10b981' : '#ef4444';
-                    
-                    document.getElementById('total-deposits').textContent = 
-                        `+$${{data.total_deposits.toLocaleString()}}`;
-                    document.getElementById('total-withdrawals').textContent = 
-                        data.total_withdrawals > 0 
-                            ? `-$${{data.total_withdrawals.toLocaleString()}}`
-                            : `$0`;
-                    document.getElementById('total-capital').textContent = 
-                        `$${{data.total_capital.toLocaleString()}}`;
-                    
-                    // Handle negative ROI with colors
-                    const roiInitial = data.roi_on_initial || 0;
-                    const roiTotal = data.roi_on_total || 0;
-                    
-                    const roiInitialEl = document.getElementById('roi-initial');
-                    roiInitialEl.textContent = roiInitial >= 0 
-                        ? `+${{roiInitial.toFixed(1)}}%` 
-                        : `${{roiInitial.toFixed(1)}}%`;
-                    roiInitialEl.style.color = roiInitial >= 0 ? '#10b981' : '#ef4444';
-                    
-                    const roiTotalEl = document.getElementById('roi-total');
-                    roiTotalEl.textContent = roiTotal >= 0 
-                        ? `+${{roiTotal.toFixed(1)}}%` 
-                        : `${{roiTotal.toFixed(1)}}%`;
-                    roiTotalEl.style.color = roiTotal >= 0 ? '#10b981' : '#ef4444';
-                    
-                    // Update last check time
-                    if (data.last_balance_check) {{
-                        const checkTime = new Date(data.last_balance_check);
-                        document.getElementById('last-check').textContent = 
-                            checkTime.toLocaleString();
-                    }}
-                }}
-            }} catch (error) {{
-                console.error('Error loading balance summary:', error);
-            }}
-        }}
-        
-        // NEW: Transaction pagination state
-        let loadedTransactions = [];
-        let transactionOffset = 0;
-        const TRANSACTIONS_PER_PAGE = 20;
-        let hasMoreTransactions = true;
-        let txStartDate = null;
-        let txEndDate = null;
-        
-        // Apply date filter
-        function applyDateFilter() {{
-            txStartDate = document.getElementById('tx-start-date').value || null;
-            txEndDate = document.getElementById('tx-end-date').value || null;
-            
-            // Update status display
-            const statusEl = document.getElementById('date-filter-status');
-            if (txStartDate || txEndDate) {{
-                let filterText = 'Filtering: ';
-                if (txStartDate && txEndDate) {{
-                    filterText += `${{txStartDate}} to ${{txEndDate}}`;
-                }} else if (txStartDate) {{
-                    filterText += `from ${{txStartDate}}`;
-                }} else {{
-                    filterText += `until ${{txEndDate}}`;
-                }}
-                statusEl.textContent = filterText;
-                statusEl.style.color = '#667eea';
-            }} else {{
-                statusEl.textContent = '';
-            }}
-            
-            // Reload with filter
-            loadTransactionHistory(true);
-        }}
-        
-        // Clear date filter
-        function clearDateFilter() {{
-            document.getElementById('tx-start-date').value = '';
-            document.getElementById('tx-end-date').value = '';
-            txStartDate = null;
-            txEndDate = null;
-            document.getElementById('date-filter-status').textContent = '';
-            loadTransactionHistory(true);
-        }}
-        
-        // Render transactions to the list
-        function renderTransactions() {{
-            const listElement = document.getElementById('transaction-list');
-            
-            if (loadedTransactions.length > 0) {{
-                let html = '';
-                for (const tx of loadedTransactions) {{
-                    const date = new Date(tx.created_at).toLocaleDateString();
-                    const time = new Date(tx.created_at).toLocaleTimeString();
-                    
-                    // Determine icon, color, sign, and label based on transaction type
-                    let icon, color, sign, label, subtitle;
-                    
-                    if (tx.transaction_type === 'deposit') {{
-                        icon = '💰';
-                        color = '#10b981';
-                        sign = '+';
-                        label = 'Funding/Deposit';
-                        subtitle = `${{date}} at ${{time}}`;
-                    }} else if (tx.transaction_type === 'fees_funding_withdrawal') {{
-                        icon = '💸';
-                        color = '#ef4444';
-                        sign = '-';
-                        label = 'Fees / Funding / Withdrawal';
-                        subtitle = `${{date}} (daily total)`;
-                    }} else if (tx.transaction_type === 'withdrawal') {{
-                        // Legacy withdrawal entries
-                        icon = '💸';
-                        color = '#ef4444';
-                        sign = '-';
-                        label = 'Withdrawal';
-                        subtitle = `${{date}} at ${{time}}`;
-                    }} else {{
-                        icon = '🎯';
-                        color = '#667eea';
-                        sign = '';
-                        label = tx.transaction_type;
-                        subtitle = `${{date}} at ${{time}}`;
-                    }}
-                    
-                    html += `
-                        <div style="
-                            padding: 15px;
-                            border-bottom: 1px solid #e5e7eb;
-                            display: flex;
-                            justify-content: space-between;
-                            align-items: center;
-                        ">
-                            <div style="display: flex; align-items: center; gap: 15px;">
-                                <div style="font-size: 24px;">${{icon}}</div>
-                                <div>
-                                    <div style="font-weight: 600; color: #374151;">
-                                        ${{label}}
-                                    </div>
-                                    <div style="font-size: 12px; color: #9ca3af;">
-                                        ${{subtitle}}
-                                    </div>
-                                </div>
-                            </div>
-                            <div style="text-align: right;">
-                                <div style="font-size: 20px; font-weight: 600; color: ${{color}};">
-                                    ${{sign}}$${{tx.amount.toLocaleString(undefined, {{minimumFractionDigits: 2, maximumFractionDigits: 2}})}}
-                                </div>
-                                <div style="font-size: 11px; color: #9ca3af;">
-                                    ${{tx.detection_method}}
-                                </div>
-                            </div>
-                        </div>
-                    `;
-                }}
-                
-                // Add info note at the bottom
-                html += `
-                    <div style="padding: 15px; background: #f9fafb; border-top: 1px solid #e5e7eb;">
-                        <div style="font-size: 12px; color: #6b7280; text-align: center;">
-                            ℹ️ <strong>Note:</strong> Kraken API cannot distinguish between trading fees, 
-                            funding payments, and spot↔futures transfers. These are grouped as 
-                            "Fees / Funding / Withdrawal" (aggregated daily).
-                        </div>
-                    </div>
-                `;
-                
-                listElement.innerHTML = html;
-                
-                // Show/hide Load More button
-                const loadMoreDiv = document.getElementById('transaction-load-more');
-                const countDiv = document.getElementById('transaction-count');
-                if (hasMoreTransactions) {{
-                    loadMoreDiv.style.display = 'block';
-                    countDiv.textContent = `Showing ${{loadedTransactions.length}} transactions`;
-                }} else {{
-                    loadMoreDiv.style.display = 'block';
-                    countDiv.textContent = `All ${{loadedTransactions.length}} transactions loaded`;
-                    loadMoreDiv.querySelector('button').style.display = 'none';
-                }}
-            }} else {{
-                listElement.innerHTML = `
-                    <div style="text-align: center; padding: 40px; color: #9ca3af;">
-                        No transactions yet. System will automatically detect deposits and withdrawals.
-                    </div>
-                `;
-                document.getElementById('transaction-load-more').style.display = 'none';
-            }}
-        }}
-        
-        // Load transaction history (reset = true to start fresh)
-        async function loadTransactionHistory(reset = false) {{
-            try {{
-                if (reset) {{
-                    loadedTransactions = [];
-                    transactionOffset = 0;
-                    hasMoreTransactions = true;
-                }}
-                
-                // Build URL with optional date filters
-                let url = `/api/portfolio/transactions?key=${{currentApiKey}}&limit=${{TRANSACTIONS_PER_PAGE}}&offset=${{transactionOffset}}`;
-                if (txStartDate) {{
-                    url += `&start_date=${{txStartDate}}`;
-                }}
-                if (txEndDate) {{
-                    url += `&end_date=${{txEndDate}}`;
-                }}
-                
-                const response = await fetch(url);
-                const data = await response.json();
-                
-                if (data.status === 'success') {{
-                    if (data.transactions.length > 0) {{
-                        loadedTransactions = loadedTransactions.concat(data.transactions);
-                        transactionOffset += data.transactions.length;
-                        
-                        // Check if there are more to load
-                        if (data.transactions.length < TRANSACTIONS_PER_PAGE) {{
-                            hasMoreTransactions = false;
-                        }}
-                    }} else {{
-                        hasMoreTransactions = false;
-                    }}
-                    
-                    renderTransactions();
-                }}
-            }} catch (error) {{
-                console.error('Error loading transactions:', error);
-                document.getElementById('transaction-list').innerHTML = `
-                    <div style="text-align: center; padding: 40px; color: #ef4444;">
-                        Error loading transactions
-                    </div>
-                `;
-            }}
-        }}
-        
-        // Load more transactions (append to existing)
-        async function loadMoreTransactions() {{
-            await loadTransactionHistory(false);
-        }}
-        
-        // ==================== EQUITY CURVE CHART ====================
-        let equityChart = null;
-        
-        async function loadEquityCurve() {{
-            try {{
-                const response = await fetch(`/api/portfolio/equity-curve?key=${{currentApiKey}}`);
-                const data = await response.json();
-                
-                // Update summary stats (these should always be available)
-                const initialCap = data.initial_capital || 0;
-                const currentEq = data.current_equity || initialCap;
-                const maxEq = data.max_equity || initialCap;
-                const minEq = data.min_equity || initialCap;
-                const maxDD = data.max_drawdown || 0;
-                const totalTrades = data.total_trades || 0;
-                const totalPnl = data.total_pnl || 0;
-                
-                document.getElementById('eq-initial').textContent = `$${{initialCap.toLocaleString()}}`;
-                document.getElementById('eq-current').textContent = `$${{currentEq.toLocaleString()}}`;
-                document.getElementById('eq-peak').textContent = `$${{maxEq.toLocaleString()}}`;
-                document.getElementById('eq-trough').textContent = `$${{minEq.toLocaleString()}}`;
-                document.getElementById('eq-maxdd').textContent = `${{maxDD.toFixed(1)}}%`;
-                
-                // Color current equity based on profit/loss
-                const currentEl = document.getElementById('eq-current');
-                currentEl.style.color = currentEq >= initialCap ? '#10b981' : '#ef4444';
-                
-                // Update stats text
-                document.getElementById('equity-stats').textContent = 
-                    `${{totalTrades}} trades | Total PnL: $${{totalPnl >= 0 ? '+' : ''}}${{totalPnl.toLocaleString()}}`;
-                
-                // Check if we have actual trading data to chart
-                if (data.status === 'success' && data.equity_curve && data.equity_curve.length > 1) {{
-                    // We have trades - render chart with time-proportional X axis
-                    // Busy periods show as clustered dots
-                    const equityData = data.equity_curve.map(point => ({{
-                        x: new Date(point.date),
-                        y: point.equity
-                    }}));
-                    
-                    const startingCapitalData = data.equity_curve.map(point => ({{
-                        x: new Date(point.date),
-                        y: data.initial_capital
-                    }}));
-                    
-                    // Destroy existing chart if any
-                    if (equityChart) {{
-                        equityChart.destroy();
-                    }}
-                    
-                    // Create gradient
-                    const ctx = document.getElementById('equity-chart').getContext('2d');
-                    const gradient = ctx.createLinearGradient(0, 0, 0, 350);
-                    
-                    // Color based on profit/loss
-                    if (data.current_equity >= data.initial_capital) {{
-                        gradient.addColorStop(0, 'rgba(16, 185, 129, 0.3)');
-                        gradient.addColorStop(1, 'rgba(16, 185, 129, 0.0)');
-                    }} else {{
-                        gradient.addColorStop(0, 'rgba(239, 68, 68, 0.3)');
-                        gradient.addColorStop(1, 'rgba(239, 68, 68, 0.0)');
-                    }}
-                    
-                    // Create chart with time scale (clustered dots = busy periods)
-                    equityChart = new Chart(ctx, {{
-                        type: 'line',
-                        data: {{
-                            datasets: [{{
-                                label: 'Trading Equity',
-                                data: equityData,
-                                borderColor: data.current_equity >= data.initial_capital ? '#10b981' : '#ef4444',
-                                backgroundColor: gradient,
-                                borderWidth: 2,
-                                fill: true,
-                                tension: 0.3,
-                                pointRadius: equityData.length > 100 ? 2 : 3,
-                                pointHoverRadius: 6,
-                                pointBackgroundColor: data.current_equity >= data.initial_capital ? '#10b981' : '#ef4444',
-                                pointBorderColor: '#fff',
-                                pointBorderWidth: 2
-                            }},
-                            {{
-                                label: 'Starting Capital',
-                                data: startingCapitalData,
-                                borderColor: '#9ca3af',
-                                borderWidth: 1,
-                                borderDash: [5, 5],
-                                fill: false,
-                                pointRadius: 0,
-                                tension: 0
-                            }}]
-                        }},
-                        options: {{
-                            responsive: true,
-                            maintainAspectRatio: false,
-                            interaction: {{
-                                intersect: false,
-                                mode: 'index'
-                            }},
-                            plugins: {{
-                                legend: {{
-                                    display: true,
-                                    position: 'top',
-                                    labels: {{
-                                        usePointStyle: true,
-                                        padding: 20
-                                    }}
-                                }},
-                                tooltip: {{
-                                    backgroundColor: 'rgba(0, 0, 0, 0.8)',
-                                    titleColor: '#fff',
-                                    bodyColor: '#fff',
-                                    padding: 12,
-                                    displayColors: false,
-                                    callbacks: {{
-                                        title: function(context) {{
-                                            const idx = context[0].dataIndex;
-                                            const point = data.equity_curve[idx];
-                                            return point.trade || 'Balance';
-                                        }},
-                                        label: function(context) {{
-                                            const idx = context.dataIndex;
-                                            const point = data.equity_curve[idx];
-                                            const lines = [`Equity: $${{point.equity.toLocaleString()}}`];
-                                            if (point.pnl !== 0) {{
-                                                const pnlStr = point.pnl >= 0 ? `+$${{point.pnl}}` : `-$${{Math.abs(point.pnl)}}`;
-                                                lines.push(`Trade PnL: ${{pnlStr}}`);
-                                            }}
-                                            lines.push(`Cumulative: $${{point.cumulative_pnl >= 0 ? '+' : ''}}${{point.cumulative_pnl}}`);
-                                            return lines;
-                                        }}
-                                    }}
-                                }}
-                            }},
-                            scales: {{
-                                x: {{
-                                    type: 'time',
-                                    time: {{
-                                        unit: 'day',
-                                        displayFormats: {{
-                                            day: 'MMM d'
-                                        }},
-                                        tooltipFormat: 'MMM d, yyyy h:mm a'
-                                    }},
-                                    grid: {{
-                                        display: false
-                                    }},
-                                    ticks: {{
-                                        maxTicksLimit: 8,
-                                        color: '#6b7280'
-                                    }}
-                                }},
-                                y: {{
-                                    grid: {{
-                                        color: 'rgba(0, 0, 0, 0.05)'
-                                    }},
-                                    ticks: {{
-                                        callback: function(value) {{
-                                            return '$ ' + value.toLocaleString();
-                                        }},
-                                        color: '#6b7280'
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }});
-                }} else if (data.status === 'no_trades' || data.equity_curve?.length <= 1) {{
-                    // No trades yet - show friendly message with flat line hint
-                    document.getElementById('equity-chart-container').innerHTML = `
-                        <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%; color: #6b7280; text-align: center; padding: 20px;">
-                            <div style="font-size: 48px; margin-bottom: 15px;">📊</div>
-                            <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px;">No Trades Yet</div>
-                            <div style="font-size: 14px; color: #9ca3af;">Your equity curve will appear here once trades are executed</div>
-                        </div>
-                    `;
-                }} else {{
-                    // Unknown status - show waiting message
-                    document.getElementById('equity-chart-container').innerHTML = `
-                        <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%; color: #6b7280; text-align: center; padding: 20px;">
-                            <div style="font-size: 48px; margin-bottom: 15px;">⏳</div>
-                            <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px;">Waiting for Data</div>
-                            <div style="font-size: 14px; color: #9ca3af;">Chart will load once trading begins</div>
-                        </div>
-                    `;
-                }}
-            }} catch (error) {{
-                console.error('Error loading equity curve:', error);
-                // Show friendly message instead of scary red error
-                document.getElementById('equity-chart-container').innerHTML = `
-                    <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%; color: #6b7280; text-align: center; padding: 20px;">
-                        <div style="font-size: 48px; margin-bottom: 15px;">📊</div>
-                        <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px;">No Trading Data</div>
-                        <div style="font-size: 14px; color: #9ca3af;">Start trading to see your equity curve</div>
-                    </div>
-                `;
-            }}
-        }}
-        
-        // ==================== OPEN POSITIONS FUNCTIONS ====================
-        async function loadPositions() {{
-            try {{
-                const response = await fetch(`/api/portfolio/open-positions?key=${{currentApiKey}}`);
-                const data = await response.json();
-                
-                const listDiv = document.getElementById('open-positions-list');
-                const countSpan = document.getElementById('open-positions-count');
-                
-                if (data.status === 'success' && data.positions && data.positions.length > 0) {{
-                    // Store positions globally for price updates
-                    window.openPositions = data.positions;
-                    
-                    countSpan.textContent = `${{data.count}} open position${{data.count > 1 ? 's' : ''}}`;
-                    
-                    let html = `
-                        <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
-                            <thead>
-                                <tr style="background: #f9fafb; border-bottom: 2px solid #e5e7eb;">
-                                    <th style="padding: 12px 10px; text-align: left; color: #374151; font-weight: 600;">Symbol</th>
-                                    <th style="padding: 12px 10px; text-align: left; color: #374151; font-weight: 600;">Side</th>
-                                    <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Size</th>
-                                    <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Entry Price</th>
-                                    <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Current Price</th>
-                                    <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Live P&L</th>
-                                    <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Take Profit</th>
-                                    <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Stop Loss</th>
-                                    <th style="padding: 12px 10px; text-align: left; color: #374151; font-weight: 600;">Opened</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                    `;
-                    
-                    for (const pos of data.positions) {{
-                        const sideLower = (pos.side || '').toLowerCase();
-                        const isLong = sideLower === 'long' || sideLower === 'buy';
-                        const sideColor = isLong ? '#10b981' : '#ef4444';
-                        const sideIcon = isLong ? '📈' : '📉';
-                        const sideLabel = isLong ? 'LONG' : 'SHORT';
-                        
-                        const openedDate = pos.opened_at ? new Date(pos.opened_at).toLocaleString() : '-';
-                        const entryPrice = pos.avg_entry_price || pos.entry_fill_price || 0;
-                        const posId = pos.id || pos.symbol.replace('/', '-');
-                        
-                        html += `
-                            <tr style="border-bottom: 1px solid #e5e7eb;" data-position-id="${{posId}}" data-kraken-symbol="${{pos.kraken_symbol}}" data-entry="${{entryPrice}}" data-size="${{pos.filled_quantity || pos.quantity || 0}}" data-side="${{sideLower}}">
-                                <td style="padding: 12px 10px; font-weight: 600; color: #374151;">
-                                    ${{pos.symbol || pos.kraken_symbol || '-'}}
-                                </td>
-                                <td style="padding: 12px 10px;">
-                                    <span style="
-                                        display: inline-flex;
-                                        align-items: center;
-                                        gap: 4px;
-                                        padding: 4px 10px;
-                                        border-radius: 12px;
-                                        font-size: 12px;
-                                        font-weight: 600;
-                                        background: ${{sideColor}}20;
-                                        color: ${{sideColor}};
-                                    ">
-                                        ${{sideIcon}} ${{sideLabel}}
-                                    </span>
-                                </td>
-                                <td style="padding: 12px 10px; text-align: right; color: #374151;">
-                                    ${{(pos.filled_quantity || pos.quantity || 0).toLocaleString()}}
-                                </td>
-                                <td style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 500;">
-                                    $${{entryPrice.toFixed(5)}}
-                                </td>
-                                <td style="padding: 12px 10px; text-align: right; color: #374151;" id="price-${{posId}}">
-                                    <span style="color: #9ca3af;">Loading...</span>
-                                </td>
-                                <td style="padding: 12px 10px; text-align: right; font-weight: 600;" id="pnl-${{posId}}">
-                                    <span style="color: #9ca3af;">--</span>
-                                </td>
-                                <td style="padding: 12px 10px; text-align: right;">
-                                    ${{pos.target_tp ? `<span style="color: #10b981; font-weight: 500;">$${{pos.target_tp.toFixed(5)}}</span>` : '<span style="color: #9ca3af;">-</span>'}}
-                                </td>
-                                <td style="padding: 12px 10px; text-align: right;">
-                                    ${{pos.target_sl ? `<span style="color: #ef4444; font-weight: 500;">$${{pos.target_sl.toFixed(5)}}</span>` : '<span style="color: #9ca3af;">-</span>'}}
-                                </td>
-                                <td style="padding: 12px 10px; color: #6b7280; font-size: 13px;">
-                                    ${{openedDate}}
-                                </td>
-                            </tr>
-                        `;
-                    }}
-                    
-                    html += `
-                            </tbody>
-                        </table>
-                    `;
-                    
-                    listDiv.innerHTML = html;
-                    
-                    // Start fetching live prices
-                    updateLivePrices();
-                }} else {{
-                    window.openPositions = [];
-                    countSpan.textContent = '0 positions';
-                    listDiv.innerHTML = `
-                        <div style="text-align: center; padding: 40px; color: #9ca3af;">
-                            <div style="font-size: 48px; margin-bottom: 15px;">✨</div>
-                            <div style="font-size: 16px; font-weight: 500; margin-bottom: 8px;">No Open Positions</div>
-                            <div style="font-size: 14px;">Your active trades will appear here</div>
-                        </div>
-                    `;
-                }}
-            }} catch (error) {{
-                console.error('Error loading positions:', error);
-                document.getElementById('open-positions-list').innerHTML = `
-                    <div style="text-align: center; padding: 40px; color: #ef4444;">
-                        Error loading positions. Please try again.
-                    </div>
-                `;
-            }}
-        }}
-        
-        // Live price updates for open positions (refreshes every 10 seconds)
-        let priceUpdateInterval = null;
-        
-        async function updateLivePrices() {{
-            // Get all position rows with kraken symbols
-            const rows = document.querySelectorAll('tr[data-kraken-symbol]');
-            if (rows.length === 0) return;
-            
-            // Collect unique symbols
-            const symbols = [...new Set([...rows].map(r => r.dataset.krakenSymbol).filter(s => s))];
-            if (symbols.length === 0) return;
-            
-            try {{
-                // Fetch prices from cached endpoint
-                const response = await fetch(`/api/prices?symbols=${{symbols.join(',')}}`);
-                const data = await response.json();
-                
-                if (data.prices) {{
-                    // Update each position row
-                    rows.forEach(row => {{
-                        const symbol = row.dataset.krakenSymbol;
-                        const entryPrice = parseFloat(row.dataset.entry);
-                        const size = parseFloat(row.dataset.size);
-                        const side = row.dataset.side?.toLowerCase();
-                        const posId = row.dataset.positionId;
-                        
-                        const currentPrice = data.prices[symbol];
-                        
-                        if (currentPrice && entryPrice && size) {{
-                            // Update current price display
-                            const priceCell = document.getElementById(`price-${{posId}}`);
-                            if (priceCell) {{
-                                priceCell.innerHTML = `$${{currentPrice.toFixed(5)}}`;
-                            }}
-                            
-                            // Calculate P&L based on side
-                            let pnl;
-                            if (side === 'long' || side === 'buy') {{
-                                pnl = (currentPrice - entryPrice) * size;
-                            }} else {{
-                                pnl = (entryPrice - currentPrice) * size;
-                            }}
-                            
-                            // Update P&L display
-                            const pnlCell = document.getElementById(`pnl-${{posId}}`);
-                            if (pnlCell) {{
-                                const pnlColor = pnl >= 0 ? '#10b981' : '#ef4444';
-                                const pnlSign = pnl >= 0 ? '+' : '';
-                                pnlCell.innerHTML = `<span style="color: ${{pnlColor}};">${{pnlSign}}$${{pnl.toFixed(2)}}</span>`;
-                            }}
-                        }}
-                    }});
-                }}
-            }} catch (error) {{
-                console.error('Error fetching live prices:', error);
-            }}
-            
-            // Schedule next update (10 seconds)
-            if (priceUpdateInterval) clearTimeout(priceUpdateInterval);
-            priceUpdateInterval = setTimeout(updateLivePrices, 10000);
-        }}
-        
-        // Refresh entire dashboard
-        async function refreshDashboard() {{
-            const refreshBtn = document.querySelector('.refresh-btn');
-            const originalText = refreshBtn.innerHTML;
-            
-            try {{
-                // Show loading state
-                refreshBtn.innerHTML = '⏳ Refreshing...';
-                refreshBtn.disabled = true;
-                
-                // Refresh all dashboard data
-                await loadBalanceSummary();
-                await loadPositions();
-                await loadTransactionHistory(true);
-                await loadEquityCurve();
-                await changePeriod();
-                await checkAgentStatus();
-                
-                // Success feedback
-                refreshBtn.innerHTML = '✅ Refreshed!';
-                setTimeout(() => {{
-                    refreshBtn.innerHTML = originalText;
-                    refreshBtn.disabled = false;
-                }}, 1500);
-            }} catch (error) {{
-                console.error('Error refreshing dashboard:', error);
-                refreshBtn.innerHTML = '❌ Error';
-                setTimeout(() => {{
-                    refreshBtn.innerHTML = originalText;
-                    refreshBtn.disabled = false;
-                }}, 2000);
-            }}
-        }}
-        
-        async function changePeriod() {{
-            currentPeriod = document.getElementById('period-selector').value;
-            
-            try {{
-                const response = await fetch(`/api/portfolio/stats?period=${{currentPeriod}}`, {{
-                    headers: {{'X-API-Key': currentApiKey}}
-                }});
-                
-                const stats = await response.json();
-                
-                if (stats.status !== 'no_data') {{
-                    updateDashboard(stats);
-                }}
-            }} catch (error) {{
-                console.error('Error loading stats:', error);
-            }}
-        }}
-        
-        // ==================== SOCIAL SHARING FUNCTIONS (NEW!) ====================
-        
-        let selectedBackground = 'charles'; // Default background
-        let selectorMode = 'download'; // 'download' or 'twitter'
-        
-        function shareToTwitter() {{
-            // Get profit from the MASSIVE ROCKET PERFORMANCE section (period-specific)
-            const profitElement = document.getElementById('total-profit');
-            const roiElement = document.getElementById('roi-initial');
-            
-            if (!profitElement || !roiElement) {{
-                alert('Portfolio data not loaded yet. Please wait a moment and try again.');
-                return;
-            }}
-            
-            const profit = profitElement.textContent;
-            const roi = roiElement.textContent;
-            
-            // Get the ACTUAL selected period from dropdown
-            const periodSelector = document.getElementById('period-selector');
-            const period = periodSelector ? periodSelector.value : '30d';
-            
-            const periodLabels = {{
-                '7d': '7 days',
-                '30d': '30 days',
-                '90d': '90 days',
-                '1y': '1 year',
-                'all': 'all-time'
-            }};
-            
-            // Prepare Twitter URL BEFORE generating image
-            const text = `$NIKEPIG's Massive Rocket ${{periodLabels[period] || period}} Performance Card
-
-Profit: ${{profit}}
-ROI: ${{roi}}`;
-            
-            const twitterUrl = `https://twitter.com/intent/tweet?text=${{encodeURIComponent(text)}}`;
-            
-            // Generate the performance card image
-            generateImageForShare(profit, roi, period, periodLabels[period], (imageBlob) => {{
-                // Download the image automatically
-                const url = URL.createObjectURL(imageBlob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = `nikepig-performance-${{period}}.png`;
-                a.click();
-                URL.revokeObjectURL(url);
-                
-                // Try to copy image to clipboard (modern browsers only)
-                if (navigator.clipboard && navigator.clipboard.write) {{
-                    const item = new ClipboardItem({{ 'image/png': imageBlob }});
-                    navigator.clipboard.write([item]).then(() => {{
-                        console.log('✅ Image copied to clipboard!');
-                    }}).catch(err => {{
-                        console.log('⚠️ Could not copy to clipboard:', err);
-                    }});
-                }}
-                
-                // IMMEDIATELY open Twitter (no setTimeout, no blocking alert!)
-                const twitterWindow = window.open(twitterUrl, '_blank');
-                
-                // Close the background selector modal
-                toggleBackgroundSelector();
-                
-                // Show non-blocking alert AFTER opening Twitter
-                setTimeout(() => {{
-                    alert('📸 Performance card downloaded!\\n\\n💡 Tip: The image may be in your clipboard - just paste it into your tweet!\\n\\nOr click "Add photos" to attach the downloaded image.');
-                }}, 100);
-            }});
-        }}
-        
-        function generateImageForShare(profit, roi, period, periodLabel, callback) {{
-            // Create canvas with same specs as downloadPerformanceCard
-            const canvas = document.createElement('canvas');
-            canvas.width = 1200;
-            canvas.height = 630;
-            const ctx = canvas.getContext('2d');
-            
-            const backgroundUrls = {{
-                'charles': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-charles.png',
-                'casino': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-casino.png',
-                'gaming': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-gaming.png',
-                'money': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-money.png'
-            }};
-            
-            const logoUrl = 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/nikepig-logo.png';
-            
-            // Load background image
-            const bgImage = new Image();
-            bgImage.crossOrigin = 'anonymous';
-            bgImage.onload = function() {{
-                // Draw background
-                ctx.drawImage(bgImage, 0, 0, canvas.width, canvas.height);
-                
-                // Add overlay
-                ctx.fillStyle = 'rgba(0,0,0,0.35)';
-                ctx.fillRect(0, 0, canvas.width, canvas.height);
-                
-                // Load logo
-                const logo = new Image();
-                logo.crossOrigin = 'anonymous';
-                logo.onload = function() {{
-                    // Draw logo
-                    const logoHeight = 100;
-                    const logoWidth = (logo.width / logo.height) * logoHeight;
-                    ctx.drawImage(logo, 50, 50, logoWidth, logoHeight);
-                    
-                    // PROFIT label
-                    ctx.fillStyle = 'white';
-                    ctx.font = '40px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.textAlign = 'left';
-                    ctx.shadowColor = 'rgba(0,0,0,0.8)';
-                    ctx.shadowBlur = 8;
-                    ctx.shadowOffsetX = 2;
-                    ctx.shadowOffsetY = 2;
-                    ctx.fillText('PROFIT', 50, 230);
-                    
-                    // Profit number
-                    ctx.fillStyle = '#00FF88';
-                    ctx.font = 'bold 140px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.shadowBlur = 15;
-                    ctx.shadowOffsetX = 3;
-                    ctx.shadowOffsetY = 3;
-                    ctx.fillText(profit, 50, 360);
-                    
-                    // ROI label
-                    ctx.fillStyle = 'white';
-                    ctx.font = '40px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.shadowBlur = 8;
-                    ctx.shadowOffsetX = 2;
-                    ctx.shadowOffsetY = 2;
-                    ctx.fillText('ROI', 50, 450);
-                    
-                    // ROI number
-                    const roiColor = roi.includes('+') || !roi.includes('-') ? '#00FF88' : '#FF4444';
-                    ctx.fillStyle = roiColor;
-                    ctx.font = 'bold 100px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.shadowBlur = 12;
-                    ctx.shadowOffsetX = 3;
-                    ctx.shadowOffsetY = 3;
-                    ctx.fillText(roi, 50, 540);
-                    
-                    // "over X days"
-                    ctx.fillStyle = 'white';
-                    ctx.font = '32px Arial, sans-serif';
-                    ctx.shadowBlur = 8;
-                    ctx.fillText(`over ${{periodLabel}}`, 50, 580);
-                    
-                    // Convert to blob and callback
-                    canvas.toBlob(callback);
-                }};
-                logo.src = logoUrl;
-            }};
-            bgImage.src = backgroundUrls[selectedBackground];
-        }}
-        
-        
-        function toggleBackgroundSelector() {{
-            const selector = document.getElementById('background-selector');
-            selector.style.display = selector.style.display === 'none' ? 'block' : 'none';
-        }}
-        
-        function showBackgroundSelectorForDownload() {{
-            selectorMode = 'download';
-            const btn = document.getElementById('selector-action-btn');
-            btn.textContent = '✅ Download Image';
-            btn.style.background = '#10b981';
-            toggleBackgroundSelector();
-        }}
-        
-        function showBackgroundSelectorForTwitter() {{
-            selectorMode = 'twitter';
-            const btn = document.getElementById('selector-action-btn');
-            btn.textContent = '𝕏 Share to Twitter';
-            btn.style.background = '#1da1f2';
-            toggleBackgroundSelector();
-        }}
-        
-        function handleSelectorAction() {{
-            if (selectorMode === 'twitter') {{
-                shareToTwitter();
-            }} else {{
-                downloadPerformanceCard();
-            }}
-        }}
-        
-        function selectBackground(bgType) {{
-            selectedBackground = bgType;
-            
-            // Update visual selection - highlight selected background
-            document.querySelectorAll('.bg-option').forEach(el => {{
-                el.style.border = '3px solid transparent';
-                el.style.transform = 'scale(1)';
-                el.style.boxShadow = 'none';
-            }});
-            
-            const selected = document.querySelector(`[data-bg="${{bgType}}"]`);
-            selected.style.border = '3px solid #667eea';
-            selected.style.transform = 'scale(1.05)';
-            selected.style.boxShadow = '0 4px 12px rgba(102, 126, 234, 0.5)';
-        }}
-        
-        function downloadPerformanceCard() {{
-            // Get profit from the MASSIVE ROCKET PERFORMANCE section (period-specific)
-            const profitElement = document.getElementById('total-profit');
-            const roiElement = document.getElementById('roi-initial');
-            
-            if (!profitElement || !roiElement) {{
-                alert('Portfolio data not loaded yet. Please wait a moment and try again.');
-                toggleBackgroundSelector();
-                return;
-            }}
-            
-            const profit = profitElement.textContent;
-            const roi = roiElement.textContent;
-            const period = currentPeriod; // Use selected time period
-            
-            const periodLabels = {{
-                '7d': '7 days',
-                '30d': '30 days',
-                '90d': '90 days',
-                '1y': '1 year',
-                'all': 'all-time'
-            }};
-            
-            // Create canvas
-            const canvas = document.createElement('canvas');
-            canvas.width = 1200;
-            canvas.height = 630;
-            const ctx = canvas.getContext('2d');
-            
-            // Background image URLs from GitHub
-            const backgroundUrls = {{
-                'charles': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-charles.png',
-                'casino': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-casino.png',
-                'gaming': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-gaming.png',
-                'money': 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/bg-money.png'
-            }};
-            
-            const logoUrl = 'https://raw.githubusercontent.com/DrCalebL/nike-rocket-api/main/static/nikepig-logo.png';
-            
-            // Load background image
-            const bgImage = new Image();
-            bgImage.crossOrigin = 'anonymous';
-            bgImage.onload = function() {{
-                // Draw background image (cover the entire canvas)
-                ctx.drawImage(bgImage, 0, 0, canvas.width, canvas.height);
-                
-                // Add dark overlay for text readability
-                ctx.fillStyle = 'rgba(0,0,0,0.35)';
-                ctx.fillRect(0, 0, canvas.width, canvas.height);
-                
-                // Load and draw NIKEPIG logo
-                const logo = new Image();
-                logo.crossOrigin = 'anonymous';
-                logo.onload = function() {{
-                    // Draw logo (top-left, scaled)
-                    const logoHeight = 100;
-                    const logoWidth = (logo.width / logo.height) * logoHeight;
-                    ctx.drawImage(logo, 50, 50, logoWidth, logoHeight);
-                    
-                    // PROFIT label (fully opaque + shadow)
-                    ctx.fillStyle = 'white';
-                    ctx.font = '40px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.textAlign = 'left';
-                    ctx.shadowColor = 'rgba(0,0,0,0.8)';
-                    ctx.shadowBlur = 8;
-                    ctx.shadowOffsetX = 2;
-                    ctx.shadowOffsetY = 2;
-                    ctx.fillText('PROFIT', 50, 230);
-                    
-                    // HUGE Profit number (bright green + shadow)
-                    ctx.fillStyle = '#00FF88';
-                    ctx.font = 'bold 140px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.shadowColor = 'rgba(0,0,0,0.8)';
-                    ctx.shadowBlur = 15;
-                    ctx.shadowOffsetX = 3;
-                    ctx.shadowOffsetY = 3;
-                    ctx.fillText(profit, 50, 360);
-                    
-                    // ROI label (fully opaque + shadow)
-                    ctx.fillStyle = 'white';
-                    ctx.font = '40px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.shadowColor = 'rgba(0,0,0,0.8)';
-                    ctx.shadowBlur = 8;
-                    ctx.shadowOffsetX = 2;
-                    ctx.shadowOffsetY = 2;
-                    ctx.fillText('ROI', 50, 450);
-                    
-                    // ROI percentage (bright green + shadow)
-                    const roiColor = roi.includes('+') || !roi.includes('-') ? '#00FF88' : '#FF4444';
-                    ctx.fillStyle = roiColor;
-                    ctx.font = 'bold 100px "Bebas Neue", Impact, Arial, sans-serif';
-                    ctx.shadowColor = 'rgba(0,0,0,0.8)';
-                    ctx.shadowBlur = 12;
-                    ctx.shadowOffsetX = 3;
-                    ctx.shadowOffsetY = 3;
-                    ctx.fillText(roi, 50, 540);
-                    
-                    // "over X days" text DIRECTLY BELOW ROI (fully opaque + shadow)
-                    ctx.fillStyle = 'white';
-                    ctx.font = '32px Arial, sans-serif';
-                    ctx.textAlign = 'left';
-                    ctx.shadowColor = 'rgba(0,0,0,0.8)';
-                    ctx.shadowBlur = 8;
-                    ctx.shadowOffsetX = 2;
-                    ctx.shadowOffsetY = 2;
-                    ctx.fillText(`over ${{periodLabels[period]}}`, 50, 580);
-                    
-                    // Download
-                    canvas.toBlob((blob) => {{
-                        const url = URL.createObjectURL(blob);
-                        const a = document.createElement('a');
-                        a.href = url;
-                        a.download = `nikepig-massive-rocket-${{period}}-performance.png`;
-                        a.click();
-                        URL.revokeObjectURL(url);
-                        
-                        // Hide selector after download
-                        document.getElementById('background-selector').style.display = 'none';
-                    }});
-                }};
-                logo.onerror = function() {{
-                    console.error('Failed to load NIKEPIG logo');
-                    // Continue without logo
-                    finishCard();
-                }};
-                logo.src = logoUrl;
-            }};
-            bgImage.onerror = function() {{
-                console.error('Failed to load background image');
-                alert('Failed to load background image. Please make sure images are uploaded to GitHub at: static/bg-' + selectedBackground + '.png');
-            }};
-            bgImage.src = backgroundUrls[selectedBackground];
-            
-            function finishCard() {{
-                // Fallback if logo fails - still download the card
-                canvas.toBlob((blob) => {{
-                    const url = URL.createObjectURL(blob);
-                    const a = document.createElement('a');
-                    a.href = url;
-                    a.download = `nikepig-massive-rocket-${{period}}-performance.png`;
-                    a.click();
-                    URL.revokeObjectURL(url);
-                    document.getElementById('background-selector').style.display = 'none';
-                }});
-            }}
-        }}
-        
-        // ==================== AGENT CONTROL FUNCTIONS (NEW!) ====================
-        
-        async function checkAgentStatus() {{
-            try {{
-                const response = await fetch('/api/agent-status', {{
-                    headers: {{'X-API-Key': currentApiKey}}
-                }});
-                
-                const data = await response.json();
-                
-                // ========== UPDATE TOP BANNER ==========
-                const topBanner = document.getElementById('agent-status-display');
-                
-                // API returns: agent_configured, agent_active, message
-                if (data.agent_active) {{
-                    // Agent is running
-                    if (topBanner) {{
-                        topBanner.innerHTML = '🟢 <strong>Agent Active</strong> - Following signals';
-                        topBanner.className = 'agent-status status-active';
-                    }}
-                    
-                    document.getElementById('agent-status-badge').innerHTML = '🟢 Running';
-                    document.getElementById('agent-status-badge').style.background = '#d1fae5';
-                    document.getElementById('agent-status-badge').style.color = '#065f46';
-                    
-                    document.getElementById('start-agent-btn').style.display = 'none';
-                    document.getElementById('stop-agent-btn').style.display = 'block';
-                    
-                    document.getElementById('agent-details').textContent = 'Agent is active and following signals';
-                    
-                }} else if (data.agent_configured) {{
-                    // Agent configured but not active
-                    if (topBanner) {{
-                        topBanner.innerHTML = '🟡 <strong>Ready</strong> - Agent configured but stopped';
-                        topBanner.className = 'agent-status status-ready';
-                    }}
-                    
-                    document.getElementById('agent-status-badge').innerHTML = '🟡 Ready';
-                    document.getElementById('agent-status-badge').style.background = '#fef3c7';
-                    document.getElementById('agent-status-badge').style.color = '#92400e';
-                    
-                    document.getElementById('start-agent-btn').style.display = 'block';
-                    document.getElementById('stop-agent-btn').style.display = 'none';
-                    
-                    document.getElementById('agent-details').textContent = 'Agent configured - click Start to begin trading';
-                    
-                }} else {{
-                    // Agent not configured
-                    if (topBanner) {{
-                        topBanner.innerHTML = '🔴 <strong>Not Configured</strong> - <a href="/setup?key=' + currentApiKey + '" style="color: #dc2626;">Complete setup</a>';
-                        topBanner.className = 'agent-status status-error';
-                    }}
-                    
-                    document.getElementById('agent-status-badge').innerHTML = '🔴 Not Configured';
-                    document.getElementById('agent-status-badge').style.background = '#fee2e2';
-                    document.getElementById('agent-status-badge').style.color = '#991b1b';
-                    
-                    document.getElementById('start-agent-btn').style.display = 'none';
-                    document.getElementById('stop-agent-btn').style.display = 'none';
-                    
-                    document.getElementById('agent-details').innerHTML = 
-                        '<a href="/setup?key=' + currentApiKey + '" style="color: #667eea;">Set up your agent first →</a>';
-                }}
-                
-            }} catch (error) {{
-                console.error('Error checking agent status:', error);
-                
-                const topBanner = document.getElementById('agent-status-display');
-                if (topBanner) {{
-                    topBanner.innerHTML = '❌ <strong>Error</strong> - Could not check status';
-                    topBanner.className = 'agent-status status-error';
-                }}
-                
-                document.getElementById('agent-status-badge').innerHTML = '❌ Error';
-                document.getElementById('agent-status-badge').style.background = '#fee2e2';
-                document.getElementById('agent-status-badge').style.color = '#991b1b';
-                document.getElementById('agent-details').textContent = 'Could not check agent status';
-            }}
-        }}
-        
-        async function startAgent() {{
-            const startBtn = document.getElementById('start-agent-btn');
-            const stopBtn = document.getElementById('stop-agent-btn');
-            startBtn.disabled = true;
-            startBtn.textContent = '⏳ Starting...';
-            
-            try {{
-                const response = await fetch('/api/start-agent', {{
-                    method: 'POST',
-                    headers: {{
-                        'X-API-Key': currentApiKey,
-                        'Content-Type': 'application/json'
-                    }}
-                }});
-                
-                const data = await response.json();
-                
-                const messageEl = document.getElementById('agent-message');
-                
-                if (data.status === 'success') {{
-                    messageEl.style.display = 'block';
-                    messageEl.style.background = '#d1fae5';
-                    messageEl.style.color = '#065f46';
-                    messageEl.textContent = '✅ Agent started successfully!';
-                    
-                    // Reset start button state BEFORE hiding it
-                    startBtn.disabled = false;
-                    startBtn.textContent = '▶️ Start Agent';
-                    
-                    // Ensure stop button is in correct state
-                    stopBtn.disabled = false;
-                    stopBtn.textContent = '⏸️ Stop Agent';
-                    
-                    // Refresh status after 2 seconds
-                    setTimeout(() => {{
-                        checkAgentStatus();
-                        messageEl.style.display = 'none';
-                    }}, 2000);
-                }} else if (data.redirect) {{
-                    // Not configured - redirect to setup
-                    messageEl.style.display = 'block';
-                    messageEl.style.background = '#fef3c7';
-                    messageEl.style.color = '#92400e';
-                    messageEl.textContent = '⚠️ ' + data.message;
-                    
-                    setTimeout(() => {{
-                        window.location.href = data.redirect;
-                    }}, 2000);
-                }} else {{
-                    messageEl.style.display = 'block';
-                    messageEl.style.background = '#fee2e2';
-                    messageEl.style.color = '#991b1b';
-                    messageEl.textContent = '❌ ' + (data.message || 'Failed to start agent');
-                    
-                    startBtn.disabled = false;
-                    startBtn.textContent = '▶️ Start Agent';
-                }}
-            }} catch (error) {{
-                console.error('Error starting agent:', error);
-                const messageEl = document.getElementById('agent-message');
-                messageEl.style.display = 'block';
-                messageEl.style.background = '#fee2e2';
-                messageEl.style.color = '#991b1b';
-                messageEl.textContent = '❌ Error starting agent: ' + error.message;
-                
-                startBtn.disabled = false;
-                startBtn.textContent = '▶️ Start Agent';
-            }}
-        }}
-        
-        async function stopAgent() {{
-            const stopBtn = document.getElementById('stop-agent-btn');
-            const startBtn = document.getElementById('start-agent-btn');
-            stopBtn.disabled = true;
-            stopBtn.textContent = '⏳ Stopping...';
-            
-            try {{
-                const response = await fetch('/api/stop-agent', {{
-                    method: 'POST',
-                    headers: {{
-                        'X-API-Key': currentApiKey,
-                        'Content-Type': 'application/json'
-                    }}
-                }});
-                
-                const data = await response.json();
-                
-                const messageEl = document.getElementById('agent-message');
-                
-                if (data.status === 'success') {{
-                    messageEl.style.display = 'block';
-                    messageEl.style.background = '#d1fae5';
-                    messageEl.style.color = '#065f46';
-                    messageEl.textContent = '✅ Agent stopped successfully!';
-                    
-                    // Reset stop button state BEFORE hiding it
-                    stopBtn.disabled = false;
-                    stopBtn.textContent = '⏸️ Stop Agent';
-                    
-                    // Ensure start button is in correct state
-                    startBtn.disabled = false;
-                    startBtn.textContent = '▶️ Start Agent';
-                    
-                    // Refresh status after 2 seconds
-                    setTimeout(() => {{
-                        checkAgentStatus();
-                        messageEl.style.display = 'none';
-                    }}, 2000);
-                }} else {{
-                    messageEl.style.display = 'block';
-                    messageEl.style.background = '#fee2e2';
-                    messageEl.style.color = '#991b1b';
-                    messageEl.textContent = '❌ ' + (data.message || 'Failed to stop agent');
-                    
-                    stopBtn.disabled = false;
-                    stopBtn.textContent = '⏸️ Stop Agent';
-                }}
-            }} catch (error) {{
-                console.error('Error stopping agent:', error);
-                const messageEl = document.getElementById('agent-message');
-                messageEl.style.display = 'block';
-                messageEl.style.background = '#fee2e2';
-                messageEl.style.color = '#991b1b';
-                messageEl.textContent = '❌ Error stopping agent: ' + error.message;
-                
-                stopBtn.disabled = false;
-                stopBtn.textContent = '⏸️ Stop Agent';
-            }}
-        }}
-        
-        // ═══════════════════════════════════════════════════════════════
-        // Trade Export Functions
-        // ═══════════════════════════════════════════════════════════════
-        
-        function initExportControls() {{
-            // Populate year dropdowns
-            const currentYear = new Date().getFullYear();
-            const currentMonth = new Date().getMonth() + 1;
-            
-            const monthYearSelect = document.getElementById('export-month-year');
-            const yearSelect = document.getElementById('export-year');
-            
-            // Add years (current and past 2 years)
-            for (let y = currentYear; y >= currentYear - 2; y--) {{
-                monthYearSelect.innerHTML += `<option value="${{y}}">${{y}}</option>`;
-                yearSelect.innerHTML += `<option value="${{y}}">${{y}}</option>`;
-            }}
-            
-            // Set current month
-            document.getElementById('export-month').value = String(currentMonth).padStart(2, '0');
-        }}
-        
-        function downloadMonthlyTrades() {{
-            const month = document.getElementById('export-month').value;
-            const year = document.getElementById('export-month-year').value;
-            
-            const url = `/api/portfolio/trades/monthly-csv?key=${{currentApiKey}}&year=${{year}}&month=${{month}}`;
-            window.location.href = url;
-        }}
-        
-        function downloadYearlyTrades() {{
-            const year = document.getElementById('export-year').value;
-            
-            const url = `/api/portfolio/trades/yearly-csv?key=${{currentApiKey}}&year=${{year}}`;
-            window.location.href = url;
-        }}
-        
-        function showError(elementId, message) {{
-            const el = document.getElementById(elementId);
-            el.className = 'error';
-            el.innerHTML = '❌ ' + message;  // Use innerHTML to render HTML tags
-            el.style.display = 'block';
-        }}
-        
-        function showSuccess(elementId, message) {{
-            const el = document.getElementById(elementId);
-            el.className = 'success';
-            el.textContent = '✅ ' + message;
-            el.style.display = 'block';
-        }}
-    </script>
-</body>
-</html>
+    The lock lives and dies with its connection, so the leader watches it:
+    if the connection is lost, Postgres has already released the lock and
+    another worker may take it - the jobs are stopped at once and this
+    process goes back to waiting for the lock.
     """
+    while True:
+        conn = await _acquire_background_jobs_lock()
+        jobs = []
+        try:
+            jobs = _start_background_jobs(db_pool)
+            await _watch_background_jobs_lock(conn)
+            logger.warning("⚠️ Lost the background jobs lock - stopping the jobs until it's regained")
+        finally:
+            for job in jobs:
+                job.cancel()
+            if jobs:
+                # All stopped before the lock can be ours (or anyone's) again
+                await asyncio.wait(jobs)
+            # Releases the lock if the connection is still up
+            try:
+                await asyncio.wait_for(conn.close(), timeout=5)
+            except Exception:
+                conn.terminate()
+
+async def _acquire_background_jobs_lock():
+    """Wait until this process holds BACKGROUND_JOBS_LOCK_ID; returns the connection holding it"""
+    while True:
+        try:
+            conn = await asyncpg.connect(DATABASE_URL)
+            try:
+                acquired = await conn.fetchval("SELECT pg_try_advisory_lock($1)", BACKGROUND_JOBS_LOCK_ID)
+            except BaseException:
+                conn.terminate()
+                raise
+            if acquired:
+                return conn
+            await conn.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Background jobs lock check failed: {e}")
+        await asyncio.sleep(BACKGROUND_JOBS_RETRY_SECONDS)
+
+async def _watch_background_jobs_lock(conn):
+    """Return as soon as the lock connection stops answering (the lock is gone with it)"""
+    while True:
+        await asyncio.sleep(BACKGROUND_JOBS_LOCK_CHECK_SECONDS)
+        try:
+            await asyncio.wait_for(conn.fetchval("SELECT 1"), BACKGROUND_JOBS_LOCK_CHECK_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Background jobs lock connection failed: {e}")
+            return
+
+def _start_background_jobs(db_pool) -> list:
+    """Start the background loops; returns their tasks"""
+    jobs = []
+    
+    # ═══════════════════════════════════════════════════════════
+    # CRITICAL FIX: Added startup_delay_seconds parameter!
+    # This prevents the "relation does not exist" error by waiting
+    # for database tables to be created before starting balance checker
+    # ═══════════════════════════════════════════════════════════
+    scheduler = BalanceCheckerScheduler(
+        db_pool, 
+        check_interval_minutes=60,
+        startup_delay_seconds=30  # ← CRITICAL FIX: Wait 30s!
+    )
     
-    return html
+    jobs.append(asyncio.create_task(scheduler.start()))
+    
+    # ═══════════════════════════════════════════════════════════
+    # HOSTED TRADING LOOP: Executes trades for all active users
+    # Polls signals and places orders on Kraken Futures
+    # ═══════════════════════════════════════════════════════════
+    jobs.append(asyncio.create_task(start_hosted_trading(db_pool)))
+    
+    # ═══════════════════════════════════════════════════════════
+    # POSITION MONITOR: Tracks open positions for TP/SL fills
+    # Records P&L when trades close. Profits accumulated for 30-day billing.
+    # ═══════════════════════════════════════════════════════════
+    jobs.append(asyncio.create_task(start_position_monitor(db_pool)))
+    
+    # ═══════════════════════════════════════════════════════════
+    # BILLING SCHEDULER v2: 30-Day Rolling Billing
+    # Checks for cycle endings every hour, generates Coinbase invoices
+    # ═══════════════════════════════════════════════════════════
+    jobs.append(asyncio.create_task(start_billing_scheduler_v2(db_pool)))
+    
+    logger.info(
+        "⏳ Background jobs scheduled: balance checker (30s), hosted trading (35s), "
+        "position monitor (40s), billing v2 (60s)"
+    )
+    return jobs
 
 # Startup event - CRITICAL FIX HERE!
-@app.on_event("startup")
 async def startup_event():
     global _db_pool
     
-    print("=" * 60)
-    print("🚀 NIKE ROCKET FOLLOWER API STARTED")
-    print("=" * 60)
-    print("✅ Database connected")
-    print("✅ Follower routes loaded")
-    print("✅ Portfolio routes loaded")
-    print("✅ Billing routes loaded (30-day rolling)")
-    print("✅ Signup page available at /signup")
-    print("✅ Setup page available at /setup")
-    print("✅ Dashboard available at /dashboard")
-    print("✅ Ready to receive signals")
+    logger.info(STARTUP_BANNER)
+    
+    # Tables and migrations first - still before any request is served, but in
+    # a worker thread so importing main.py no longer blocks on the database
+    if DATABASE_URL:
+        await asyncio.to_thread(init_database)
+    
+    # Pre-open the SQLAlchemy pool so the first requests after a deploy don't
+    # pay connect/auth latency (asyncpg.create_pool below opens min_size already)
+    if DATABASE_URL:
+        try:
+            warmed = await asyncio.to_thread(warm_engine_pool, engine)
+            logger.info(f"✅ Database pool warmed ({warmed} connections)")
+        except Exception as e:
+            logger.warning(f"⚠️ Database pool warm-up failed: {e}")
     
     # Start balance checker for automatic deposit/withdrawal detection
     # CRITICAL FIX: WITH STARTUP DELAY TO PREVENT RACE CONDITION!
     if DATABASE_URL:
         try:
-            db_pool = await asyncpg.create_pool(DATABASE_URL)
-            _db_pool = db_pool  # Set global for billing endpoints
-            
-            # ═══════════════════════════════════════════════════════════
-            # CRITICAL FIX: Added startup_delay_seconds parameter!
-            # This prevents the "relation does not exist" error by waiting
-            # for database tables to be created before starting balance checker
-            # ═══════════════════════════════════════════════════════════
-            scheduler = BalanceCheckerScheduler(
-                db_pool, 
-                check_interval_minutes=60,
-                startup_delay_seconds=30  # ← CRITICAL FIX: Wait 30s!
+            # Sized from the shared connection budget (see follower_models.py)
+            db_pool = await asyncpg.create_pool(
+                DATABASE_URL, min_size=ASYNCPG_POOL_MIN_SIZE, max_size=ASYNCPG_POOL_MAX_SIZE
             )
+            _db_pool = db_pool  # Set global for billing endpoints
             
-            asyncio.create_task(scheduler.start())
-            print("⏳ Balance checker scheduled (starts in 30 seconds)")
-            
-            # ═══════════════════════════════════════════════════════════
-            # HOSTED TRADING LOOP: Executes trades for all active users
-            # Polls signals and places orders on Kraken Futures
-            # ═══════════════════════════════════════════════════════════
-            asyncio.create_task(start_hosted_trading(db_pool))
-            print("🤖 Hosted trading loop scheduled (starts in 35 seconds)")
-            
-            # ═══════════════════════════════════════════════════════════
-            # POSITION MONITOR: Tracks open positions for TP/SL fills
-            # Records P&L when trades close. Profits accumulated for 30-day billing.
-            # ═══════════════════════════════════════════════════════════
-            asyncio.create_task(start_position_monitor(db_pool))
-            print("📊 Position monitor scheduled (starts in 40 seconds)")
-            
-            # ═══════════════════════════════════════════════════════════
-            # BILLING SCHEDULER v2: 30-Day Rolling Billing
-            # Checks for cycle endings every hour, generates Coinbase invoices
-            # ═══════════════════════════════════════════════════════════
-            asyncio.create_task(start_billing_scheduler_v2(db_pool))
-            print("💰 Billing scheduler v2 scheduled (30-day rolling, starts in 60 seconds)")
+            # Balance checker, trading loop, position monitor and billing
+            # scheduler - started in one worker only, see the function
+            _background_tasks.append(asyncio.create_task(_run_background_jobs_when_leader(db_pool)))
             
         except Exception as e:
-            print(f"⚠️ Background tasks failed to start: {e}")
+            logger.warning(f"⚠️ Background tasks failed to start: {e}")
+
+async def shutdown_event():
+    """Stop the background loops (which hands their lock on), then close the asyncpg pool"""
+    for task in _background_tasks:
+        task.cancel()
+    if _background_tasks:
+        await asyncio.wait(_background_tasks, timeout=10)
+        _background_tasks.clear()
     
-    print("=" * 60)
+    if _db_pool is not None:
+        try:
+            await asyncio.wait_for(_db_pool.close(), timeout=10)
+        except Exception as e:
+            logger.warning(f"⚠️ Database pool did not close cleanly: {e}")
+            _db_pool.terminate()
 
 # Run locally for testing
 if __name__ == "__main__":
     import uvicorn
+    from config import is_production
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+    # Same C event loop / HTTP parser as production (uvicorn[standard] ships both).
+    # Worker processes come from WEB_CONCURRENCY (default 1, same variable
+    # uvicorn's CLI reads); the background loops run in only one of them.
+    # Each worker's database pools come out of DB_MAX_CONNECTIONS (see
+    # follower_models.py), so adding workers doesn't overrun Postgres.
+    # The file watcher is for local development only (it implies one worker).
+    # X-Forwarded-For/-Proto are honoured only from the addresses in
+    # FORWARDED_ALLOW_IPS (set it to the platform proxy's CIDR range; uvicorn
+    # reads the same variable and defaults to 127.0.0.1). Never "*": any client
+    # could then pick the request.client.host we log.
+    uvicorn.run(
+        "main:app", host="0.0.0.0", port=port,
+        reload=not is_production(), workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="uvloop", http="httptools",
+        proxy_headers=True, forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS"),
+    )
@@ -5,18 +5,83 @@
 # CONSOLIDATED: Updates follower_users as primary source of truth
 # NO CIRCULAR IMPORTS
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Response, Header
+from fastapi.encoders import jsonable_encoder
 from datetime import datetime, timedelta
 from decimal import Decimal
 import asyncpg
+import asyncio
 import os
+import time
+import hashlib
 import statistics
 import json
+import orjson
 from cryptography.fernet import Fernet
 from typing import Optional, Dict
 
+from http_utils import etag_matches
+
 router = APIRouter()
 
+# Equity curve only changes when a trade closes - let the browser reuse it briefly
+EQUITY_CURVE_CACHE_CONTROL = "private, max-age=30"
+
+# Portfolio stats are re-requested on every dashboard load and period switch.
+# Cache the encoded response per (key hash, period) for a short TTL.
+# The cache lives in each worker process: invalidating it after a trade or
+# capital change only clears this worker's copy, so another worker can serve
+# the old numbers for up to the TTL. That's accepted: the dashboard's own
+# 15s fetch cache already allows about as much, and the body is only ever displayed.
+PORTFOLIO_STATS_CACHE_TTL = 20  # seconds
+PORTFOLIO_STATS_CACHE_MAX_USERS = 10_000
+PORTFOLIO_STATS_CACHED_PERIODS = ("7d", "30d", "90d", "1y", "all")  # what the dashboard asks for
+# The dashboard sends the key in X-API-Key, so the browser caches stats under
+# the URL alone - always revalidate (the ETag makes that a 304) so a new login
+# never gets the previous account's numbers
+PORTFOLIO_STATS_CACHE_CONTROL = "private, no-cache"
+_portfolio_stats_cache: Dict[bytes, Dict[str, tuple]] = {}  # key hash -> {period: (expires_at, body)}
+_portfolio_stats_inflight: Dict[tuple, asyncio.Future] = {}  # (key hash, period) -> running calculation
+
+
+def _stats_cache_key(api_key: str) -> bytes:
+    """Hash the API key so raw keys aren't held in the cache"""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+
+def get_cached_portfolio_stats(api_key: str, period: str) -> Optional[bytes]:
+    """Return the cached stats response body if it's still fresh"""
+    entry = _portfolio_stats_cache.get(_stats_cache_key(api_key), {}).get(period)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def set_cached_portfolio_stats(api_key: str, period: str, body: bytes):
+    """Cache a stats response body, evicting the oldest user when full"""
+    key = _stats_cache_key(api_key)
+    if key not in _portfolio_stats_cache and len(_portfolio_stats_cache) >= PORTFOLIO_STATS_CACHE_MAX_USERS:
+        _portfolio_stats_cache.pop(next(iter(_portfolio_stats_cache)))
+    _portfolio_stats_cache.setdefault(key, {})[period] = (time.monotonic() + PORTFOLIO_STATS_CACHE_TTL, body)
+
+
+def invalidate_portfolio_stats_cache(api_key: str):
+    """Drop every cached period for a user (call after their trades/capital change)
+    
+    Only this worker's cache is cleared; other workers catch up within
+    PORTFOLIO_STATS_CACHE_TTL.
+    """
+    _portfolio_stats_cache.pop(_stats_cache_key(api_key), None)
+
+
+def _portfolio_stats_response(request: Request, body: bytes) -> Response:
+    """Encoded stats with Cache-Control and a content ETag; 304 if the browser has it"""
+    etag = 'W/"st-%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+    headers = {"ETag": etag, "Cache-Control": PORTFOLIO_STATS_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # Setup encryption
 ENCRYPTION_KEY = os.getenv("CREDENTIALS_ENCRYPTION_KEY")
 if ENCRYPTION_KEY:
@@ -312,6 +377,7 @@ async def initialize_portfolio_autodetect(request: Request):
             f'Auto-detected from Kraken balance: ${initial_capital:,.2f}')
         
         await conn.close()
+        invalidate_portfolio_stats_cache(api_key)
         
         return {
             "status": "success",
@@ -337,9 +403,12 @@ async def initialize_portfolio_autodetect(request: Request):
 
 
 @router.get("/api/portfolio/balance-summary")
-async def get_balance_summary(request: Request):
+async def get_balance_summary(
+    key: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
+):
     """Get comprehensive balance summary including trading profit from trades table"""
-    api_key = request.headers.get("X-API-Key") or request.query_params.get("key")
+    api_key = x_api_key or key
     
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
@@ -421,13 +490,16 @@ async def get_balance_summary(request: Request):
 
 
 @router.get("/api/portfolio/transactions")
-async def get_transactions(request: Request):
+async def get_transactions(
+    key: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    start_date: Optional[str] = None,  # YYYY-MM-DD
+    end_date: Optional[str] = None,    # YYYY-MM-DD
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
+):
     """Get transaction history with pagination and date filtering"""
-    api_key = request.headers.get("X-API-Key") or request.query_params.get("key")
-    limit = int(request.query_params.get("limit", 50))
-    offset = int(request.query_params.get("offset", 0))
-    start_date = request.query_params.get("start_date")  # YYYY-MM-DD
-    end_date = request.query_params.get("end_date")      # YYYY-MM-DD
+    api_key = x_api_key or key
     
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
@@ -483,7 +555,12 @@ async def get_transactions(request: Request):
 
 
 @router.get("/api/portfolio/stats")
-async def get_portfolio_stats(request: Request, period: str = "30d"):
+async def get_portfolio_stats(
+    request: Request,
+    period: str = "30d",
+    key: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
+):
     """
     Get portfolio statistics for a specific time period
     
@@ -514,12 +591,62 @@ async def get_portfolio_stats(request: Request, period: str = "30d"):
     10. SHARPE RATIO: (avg_return / volatility) × sqrt(252)
     11. DAYS ACTIVE: (current_date - first_trade_date).days
     ═══════════════════════════════════════════════════════════════
+    
+    Responses are cached per (API key, period) for PORTFOLIO_STATS_CACHE_TTL seconds,
+    and concurrent misses for the same pair share a single calculation. They
+    carry Cache-Control (private, no-cache) and a weak ETag of the encoded body;
+    a matching If-None-Match returns 304 with no body.
     """
-    api_key = request.headers.get("X-API-Key") or request.query_params.get("key")
+    api_key = x_api_key or key
     
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
     
+    if period not in PORTFOLIO_STATS_CACHED_PERIODS:
+        return await _calculate_portfolio_stats(api_key, period)
+    
+    cached = get_cached_portfolio_stats(api_key, period)
+    if cached is not None:
+        return _portfolio_stats_response(request, cached)
+    
+    # Several tabs / quick refreshes: later arrivals wait for the running calculation.
+    # It runs as its own task and everyone (the first request too) waits through
+    # shield, so a client that disconnects cancels only its own wait.
+    inflight_key = (_stats_cache_key(api_key), period)
+    inflight = _portfolio_stats_inflight.get(inflight_key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_calculate_and_cache_portfolio_stats(api_key, period))
+        _portfolio_stats_inflight[inflight_key] = inflight
+        inflight.add_done_callback(lambda task: _portfolio_stats_calculation_done(inflight_key, task))
+    result = await asyncio.shield(inflight)
+    
+    if isinstance(result, bytes):
+        return _portfolio_stats_response(request, result)
+    return result
+
+
+def _portfolio_stats_calculation_done(inflight_key: tuple, task: asyncio.Future):
+    """Forget a finished calculation (later requests hit the cache or start anew)"""
+    if _portfolio_stats_inflight.get(inflight_key) is task:
+        del _portfolio_stats_inflight[inflight_key]
+    if not task.cancelled():
+        task.exception()  # Waiters re-raise it; don't log it as unretrieved if they all left
+
+
+async def _calculate_and_cache_portfolio_stats(api_key: str, period: str):
+    """Calculate stats; returns the encoded body if it was cached, else the dict"""
+    stats = await _calculate_portfolio_stats(api_key, period)
+    
+    # "no_data" means the portfolio isn't initialized yet - don't hold on to that
+    if stats.get("status") in ("success", "no_trades"):
+        body = orjson.dumps(jsonable_encoder(stats))
+        set_cached_portfolio_stats(api_key, period, body)
+        return body
+    return stats
+
+
+async def _calculate_portfolio_stats(api_key: str, period: str) -> dict:
+    """Run the stats queries for get_portfolio_stats (uncached)"""
     try:
         # Validate API key first
         await validate_api_key(api_key)
@@ -880,7 +1007,12 @@ async def get_portfolio_stats(request: Request, period: str = "30d"):
 
 
 @router.get("/api/portfolio/equity-curve")
-async def get_equity_curve(request: Request):
+async def get_equity_curve(
+    request: Request,
+    response: Response,
+    key: Optional[str] = None,
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
+):
     """
     Get trading-only equity curve for charting
     
@@ -900,24 +1032,27 @@ async def get_equity_curve(request: Request):
     - Recovery periods
     - Volatility of returns
     
-    Response format:
+    Response format (columnar - one array per field, index i = point i):
     {
         "status": "success",
-        "equity_curve": [
-            {"date": "2024-01-15", "equity": 1000, "pnl": 0},
-            {"date": "2024-01-16", "equity": 1050, "pnl": 50},
-            {"date": "2024-01-17", "equity": 980, "pnl": -70},
-            ...
-        ],
+        "dates":  ["2024-01-15", "2024-01-16", "2024-01-17", ...],
+        "equity": [1000, 1050, 980, ...],
+        "pnl":    [0, 50, -70, ...],
+        "cum":    [0, 50, -20, ...],
+        "trades": ["Starting Balance", "BUY ADA", "SELL ADA", ...],
         "initial_capital": 1000,
         "current_equity": 1200,
         "max_equity": 1300,
         "min_equity": 900,
         "max_drawdown": 15.4
     }
+    
+    Responses carry Cache-Control (private, 30s) and a weak ETag built
+    from (last_trade_id, trade_count, initial_capital); a matching
+    If-None-Match returns 304 with no body.
     ═══════════════════════════════════════════════════════════════
     """
-    api_key = request.headers.get("X-API-Key") or request.query_params.get("key")
+    api_key = x_api_key or key
     
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
@@ -947,6 +1082,7 @@ async def get_equity_curve(request: Request):
         
         trades = await conn.fetch("""
             SELECT 
+                t.id,
                 t.profit_usd as pnl_usd,
                 t.closed_at as exit_time,
                 t.symbol,
@@ -965,17 +1101,27 @@ async def get_equity_curve(request: Request):
         
         await conn.close()
         
+        # Conditional GET: the curve only changes when a trade closes
+        # or initial capital is re-detected
+        etag = 'W/"eq-%s-%d-%s"' % (
+            trades[-1]['id'] if trades else 0, len(trades), initial_capital
+        )
+        response.headers["Cache-Control"] = EQUITY_CURVE_CACHE_CONTROL
+        response.headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": EQUITY_CURVE_CACHE_CONTROL}
+            )
+        
         if not trades:
             return {
                 "status": "no_trades",
-                "equity_curve": [
-                    {
-                        "date": start_date.isoformat() if start_date else datetime.utcnow().isoformat(),
-                        "equity": initial_capital,
-                        "pnl": 0,
-                        "cumulative_pnl": 0
-                    }
-                ],
+                "dates": [start_date.isoformat() if start_date else datetime.utcnow().isoformat()],
+                "equity": [initial_capital],
+                "pnl": [0],
+                "cum": [0],
+                "trades": ["Starting Balance"],
                 "initial_capital": initial_capital,
                 "current_equity": initial_capital,
                 "max_equity": initial_capital,
@@ -985,23 +1131,18 @@ async def get_equity_curve(request: Request):
                 "total_pnl": 0
             }
         
-        # Build equity curve from trading PnL only
-        equity_curve = []
+        # Build equity curve from trading PnL only (columnar: one list per field)
+        dates = [start_date.isoformat() if start_date else trades[0]['exit_time'].isoformat()]
+        equity = [round(initial_capital, 2)]
+        pnls = [0]
+        cums = [0]
+        labels = ["Starting Balance"]
         cumulative_pnl = 0
         running_peak = initial_capital
         max_drawdown = 0
         max_equity = initial_capital
         min_equity = initial_capital
         
-        # Add starting point
-        equity_curve.append({
-            "date": start_date.isoformat() if start_date else trades[0]['exit_time'].isoformat(),
-            "equity": round(initial_capital, 2),
-            "pnl": 0,
-            "cumulative_pnl": 0,
-            "trade": "Starting Balance"
-        })
-        
         for trade in trades:
             pnl = float(trade['pnl_usd'] or 0)
             cumulative_pnl += pnl
@@ -1027,19 +1168,21 @@ async def get_equity_curve(request: Request):
             else:
                 clean_symbol = raw_symbol.upper()
             
-            equity_curve.append({
-                "date": trade['exit_time'].isoformat(),
-                "equity": round(current_equity, 2),
-                "pnl": round(pnl, 2),
-                "cumulative_pnl": round(cumulative_pnl, 2),
-                "trade": f"{trade['side']} {clean_symbol}"
-            })
+            dates.append(trade['exit_time'].isoformat())
+            equity.append(round(current_equity, 2))
+            pnls.append(round(pnl, 2))
+            cums.append(round(cumulative_pnl, 2))
+            labels.append(f"{trade['side']} {clean_symbol}")
         
         current_equity = initial_capital + cumulative_pnl
         
         return {
             "status": "success",
-            "equity_curve": equity_curve,
+            "dates": dates,
+            "equity": equity,
+            "pnl": pnls,
+            "cum": cums,
+            "trades": labels,
             "initial_capital": round(initial_capital, 2),
             "current_equity": round(current_equity, 2),
             "max_equity": round(max_equity, 2),
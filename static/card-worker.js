@@ -0,0 +1,169 @@
+// ==================== PERFORMANCE CARD WORKER ====================
+// Loads the card images, draws the shareable performance card on an
+// OffscreenCanvas and encodes it, so the dashboard's main thread stays
+// responsive from the first click to the finished blob.
+//
+// Message in:  { id, profit, roi, profitColor, roiColor, periodLabel, background, logo, type, quality }
+//              (background and logo are same-origin image URLs)
+//              or { warm: backgroundUrl, logo } to prepare a background ahead of time
+// Message out: { id, blob } or { id, error }
+
+const CARD_WIDTH = 1200;
+const CARD_HEIGHT = 630;
+const CARD_LOGO_HEIGHT = 100;
+const FONT_CSS_URL = 'https://fonts.googleapis.com/css2?family=Bebas+Neue&display=swap';
+
+// Workers can't see the page's web fonts - load Bebas Neue once ourselves.
+// On failure the card falls back to Impact/Arial, same as the page would.
+let fontReady = null;
+
+function loadCardFont() {
+    if (!fontReady) {
+        fontReady = (async () => {
+            try {
+                const css = await (await fetch(FONT_CSS_URL)).text();
+                const urls = [...css.matchAll(/url\(([^)]+)\)/g)].map(m => m[1]);
+                if (!urls.length) return;
+                // Google lists the latin subset last
+                const face = new FontFace('Bebas Neue', `url(${urls[urls.length - 1]})`);
+                self.fonts.add(await face.load());
+            } catch (error) {
+                console.warn('Card worker: Bebas Neue unavailable, using fallback font', error);
+            }
+        })();
+    }
+    return fontReady;
+}
+
+// Fetch + decode (and pre-scale) straight to an ImageBitmap
+async function loadBitmap(url, options) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error(`Image fetch failed: ${response.status}`);
+    return createImageBitmap(await response.blob(), options);
+}
+
+let logoReady = null;
+
+function loadLogo(url) {
+    if (!logoReady) {
+        logoReady = loadBitmap(url, { resizeHeight: CARD_LOGO_HEIGHT, resizeQuality: 'high' });
+        logoReady.catch(() => { logoReady = null; });  // Retry on the next card
+    }
+    return logoReady;
+}
+
+// The PROFIT / ROI labels never change, so they are part of the base card.
+// Their blurred shadows are the costliest text draws - this pays for them once.
+function drawCardLabels(ctx) {
+    ctx.textAlign = 'left';
+    ctx.shadowColor = 'rgba(0,0,0,0.8)';
+    ctx.shadowBlur = 8;
+    ctx.shadowOffsetX = 2;
+    ctx.shadowOffsetY = 2;
+    ctx.fillStyle = 'white';
+    ctx.font = '40px "Bebas Neue", Impact, Arial, sans-serif';
+    ctx.fillText('PROFIT', 50, 230);
+    ctx.fillText('ROI', 50, 450);
+}
+
+// Everything but the figures is identical for every share of a background:
+// compose it once (scaled background + dark overlay + logo + labels) and reuse it.
+// Same layout as composeBaseCard() on the dashboard page - keep them in sync.
+const baseCache = new Map();  // background url -> Promise<ImageBitmap>
+
+async function composeBase(backgroundUrl, logoUrl) {
+    const [background, logo] = await Promise.all([
+        loadBitmap(backgroundUrl, { resizeWidth: CARD_WIDTH, resizeHeight: CARD_HEIGHT, resizeQuality: 'high' }),
+        loadLogo(logoUrl).catch((error) => {
+            console.warn('Card worker: NIKEPIG logo unavailable', error);
+            return null;  // Card still works without logo
+        }),
+        loadCardFont()  // The labels need Bebas Neue
+    ]);
+    const ctx = new OffscreenCanvas(CARD_WIDTH, CARD_HEIGHT).getContext('2d', { alpha: false });
+    ctx.drawImage(background, 0, 0, CARD_WIDTH, CARD_HEIGHT);
+    background.close();
+    // Dark overlay for text readability
+    ctx.fillStyle = 'rgba(0,0,0,0.35)';
+    ctx.fillRect(0, 0, CARD_WIDTH, CARD_HEIGHT);
+    // NIKEPIG logo (top-left, scaled)
+    if (logo) {
+        ctx.drawImage(logo, 50, 50, (logo.width / logo.height) * CARD_LOGO_HEIGHT, CARD_LOGO_HEIGHT);
+    } else {
+        baseCache.delete(backgroundUrl);  // Use it this once, retry the logo next time
+    }
+    drawCardLabels(ctx);
+    return ctx.canvas.transferToImageBitmap();
+}
+
+function loadBase(backgroundUrl, logoUrl) {
+    if (!baseCache.has(backgroundUrl)) {
+        const pending = composeBase(backgroundUrl, logoUrl);
+        pending.catch(() => baseCache.delete(backgroundUrl));
+        baseCache.set(backgroundUrl, pending);
+    }
+    return baseCache.get(backgroundUrl);
+}
+
+// One OffscreenCanvas for every job; the card is always opaque
+let cardCtx = null;
+
+function getCardContext() {
+    if (!cardCtx) {
+        cardCtx = new OffscreenCanvas(CARD_WIDTH, CARD_HEIGHT).getContext('2d', { alpha: false });
+        // Shared by every text draw; set once, save/restore around each job keeps them
+        cardCtx.textAlign = 'left';
+        cardCtx.shadowColor = 'rgba(0,0,0,0.8)';
+    }
+    return cardCtx;
+}
+
+// Same layout as drawPerformanceCard() on the dashboard page - keep them in sync
+function drawCard(ctx, { profit, roi, profitColor, roiColor, periodLabel, base }) {
+    // Background, overlay, logo and labels, composed once by loadBase()
+    ctx.drawImage(base, 0, 0);
+
+    // Text grouped by style; textAlign and shadowColor are set when the context is created
+
+    // Period line (soft shadow, like the labels)
+    ctx.fillStyle = 'white';
+    ctx.shadowBlur = 8;
+    ctx.shadowOffsetX = 2;
+    ctx.shadowOffsetY = 2;
+    ctx.font = '32px Arial, sans-serif';
+    ctx.fillText(`over ${periodLabel}`, 50, 580);
+
+    // Big numbers (heavier shadow)
+    ctx.shadowOffsetX = 3;
+    ctx.shadowOffsetY = 3;
+    ctx.fillStyle = profitColor;
+    ctx.shadowBlur = 15;
+    ctx.font = 'bold 140px "Bebas Neue", Impact, Arial, sans-serif';
+    ctx.fillText(profit, 50, 360);
+    ctx.fillStyle = roiColor;
+    ctx.shadowBlur = 12;
+    ctx.font = 'bold 100px "Bebas Neue", Impact, Arial, sans-serif';
+    ctx.fillText(roi, 50, 540);
+}
+
+self.onmessage = async (event) => {
+    const { id, warm, background, logo, type, quality, ...card } = event.data;
+    if (warm) {
+        // Errors surface (and are retried) on the real render
+        loadCardFont();
+        loadBase(warm, logo).catch(() => {});
+        return;
+    }
+    try {
+        const [base] = await Promise.all([loadBase(background, logo), loadCardFont()]);
+        const ctx = getCardContext();
+        ctx.save();
+        drawCard(ctx, { ...card, base });
+        ctx.restore();
+        // convertToBlob snapshots the bitmap when called, so the next job can redraw
+        const blob = await ctx.canvas.convertToBlob({ type: type || 'image/jpeg', quality });
+        self.postMessage({ id, blob });
+    } catch (error) {
+        self.postMessage({ id, error: error.message });
+    }
+};
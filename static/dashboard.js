@@ -0,0 +1,1534 @@
+// ==================== DASHBOARD SCRIPT ====================
+// The dashboard page's JavaScript (the share card is in share-card.js).
+// Served from /static with a content-hash query string and cached as
+// immutable, so repeat dashboard loads don't re-download or re-parse it.
+//
+// Loaded at the end of <body>, after the markup. The sharing/agent/export
+// helpers come first; nothing in them touches the page globals below
+// ($, currentApiKey, currentPeriod, ...) until one of them is called.
+
+// ==================== SOCIAL SHARING (LOADED ON DEMAND) ====================
+// The performance card code lives in static/share-card.js. Nobody needs it
+// until they share, so it loads once the dashboard is idle or on the first
+// hover/click of a share button. Running it replaces the stubs below.
+
+let shareCardScript = null;
+
+function loadShareCardScript() {
+    if (!shareCardScript) {
+        shareCardScript = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = window.__SHARE_CARD_SRC__;
+            script.onload = resolve;
+            script.onerror = () => {
+                script.remove();
+                shareCardScript = null;  // Retry on the next click
+                reject(new Error('Failed to load share-card.js'));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return shareCardScript;
+}
+
+// Load the script, then call the real function it defined under the same name
+function callShareCard(name) {
+    const stub = window[name];
+    return loadShareCardScript().then(() => {
+        if (window[name] === stub) throw new Error(`share-card.js did not define ${name}`);
+        return window[name]();
+    });
+}
+
+function prefetchCardImages() {
+    callShareCard('prefetchCardImages').catch(() => {});  // Real errors surface on click
+}
+
+function showBackgroundSelectorForTwitter() {
+    callShareCard('showBackgroundSelectorForTwitter').catch(reportShareCardError);
+}
+
+function showBackgroundSelectorForDownload() {
+    callShareCard('showBackgroundSelectorForDownload').catch(reportShareCardError);
+}
+
+function reportShareCardError(error) {
+    console.error('Share card unavailable:', error);
+    alert('Could not load the performance card. Please check your connection and try again.');
+}
+
+// Once the dashboard is up and the page is idle, load the card script and decode
+// the card images so the first share is instant too - unless the user is saving data
+function prefetchCardImagesWhenIdle() {
+    const connection = navigator.connection;
+    if (connection && (connection.saveData || /2g/.test(connection.effectiveType || ''))) return;
+    const schedule = window.requestIdleCallback || ((fn) => setTimeout(fn, 2000));
+    schedule(() => prefetchCardImages());
+}
+
+// ==================== AGENT CONTROL FUNCTIONS (NEW!) ====================
+
+// Renders an /api/agent-status payload (also pushed by /api/agent-status/stream)
+function renderAgentStatus(data) {
+    // Cached references, bound up front so the writes below never interleave with reads
+    const topBanner = $['agent-status-display'];
+    const badge = $['agent-status-badge'];
+    const startBtn = $['start-agent-btn'];
+    const stopBtn = $['stop-agent-btn'];
+    const details = $['agent-details'];
+
+    // API returns: agent_configured, agent_active, message
+    if (data.agent_active) {
+        // Agent is running
+        if (topBanner) {
+            topBanner.innerHTML = '🟢 <strong>Agent Active</strong> - Following signals';
+            topBanner.className = 'agent-status status-active';
+        }
+
+        badge.className = 'agent-badge badge-running';
+        badge.textContent = '🟢 Running';
+        startBtn.hidden = true;
+        stopBtn.hidden = false;
+        details.textContent = 'Agent is active and following signals';
+
+    } else if (data.agent_configured) {
+        // Agent configured but not active
+        if (topBanner) {
+            topBanner.innerHTML = '🟡 <strong>Ready</strong> - Agent configured but stopped';
+            topBanner.className = 'agent-status status-ready';
+        }
+
+        badge.className = 'agent-badge badge-ready';
+        badge.textContent = '🟡 Ready';
+        startBtn.hidden = false;
+        stopBtn.hidden = true;
+        details.textContent = 'Agent configured - click Start to begin trading';
+
+    } else {
+        // Agent not configured
+        if (topBanner) {
+            topBanner.innerHTML = '🔴 <strong>Not Configured</strong> - <a href="/setup?key=' + currentApiKey + '" style="color: #dc2626;">Complete setup</a>';
+            topBanner.className = 'agent-status status-error';
+        }
+
+        badge.className = 'agent-badge badge-error';
+        badge.textContent = '🔴 Not Configured';
+        startBtn.hidden = true;
+        stopBtn.hidden = true;
+        details.innerHTML = 
+            '<a href="/setup?key=' + currentApiKey + '" style="color: #667eea;">Set up your agent first →</a>';
+    }
+}
+
+async function checkAgentStatus() {
+    try {
+        const response = await fetch('/api/agent-status', {
+            headers: {'X-API-Key': currentApiKey}
+        });
+
+        renderAgentStatus(await response.json());
+
+    } catch (error) {
+        console.error('Error checking agent status:', error);
+
+        const topBanner = $['agent-status-display'];
+        if (topBanner) {
+            topBanner.innerHTML = '❌ <strong>Error</strong> - Could not check status';
+            topBanner.className = 'agent-status status-error';
+        }
+
+        $['agent-status-badge'].className = 'agent-badge badge-error';
+        $['agent-status-badge'].textContent = '❌ Error';
+        $['agent-details'].textContent = 'Could not check agent status';
+    }
+}
+
+async function startAgent() {
+    const startBtn = $['start-agent-btn'];
+    const stopBtn = $['stop-agent-btn'];
+    startBtn.disabled = true;
+    startBtn.textContent = '⏳ Starting...';
+
+    try {
+        const response = await fetch('/api/start-agent', {
+            method: 'POST',
+            headers: {
+                'X-API-Key': currentApiKey,
+                'Content-Type': 'application/json'
+            }
+        });
+
+        const data = await response.json();
+
+        const messageEl = $['agent-message'];
+
+        if (data.status === 'success') {
+            messageEl.style.display = 'block';
+            messageEl.style.background = '#d1fae5';
+            messageEl.style.color = '#065f46';
+            messageEl.textContent = '✅ Agent started successfully!';
+
+            // Reset start button state BEFORE hiding it
+            startBtn.disabled = false;
+            startBtn.textContent = '▶️ Start Agent';
+
+            // Ensure stop button is in correct state
+            stopBtn.disabled = false;
+            stopBtn.textContent = '⏸️ Stop Agent';
+
+            // Refresh status after 2 seconds
+            setTimeout(() => {
+                checkAgentStatus();
+                messageEl.style.display = 'none';
+            }, 2000);
+        } else if (data.redirect) {
+            // Not configured - redirect to setup
+            messageEl.style.display = 'block';
+            messageEl.style.background = '#fef3c7';
+            messageEl.style.color = '#92400e';
+            messageEl.textContent = '⚠️ ' + data.message;
+
+            setTimeout(() => {
+                window.location.href = data.redirect;
+            }, 2000);
+        } else {
+            messageEl.style.display = 'block';
+            messageEl.style.background = '#fee2e2';
+            messageEl.style.color = '#991b1b';
+            messageEl.textContent = '❌ ' + (data.message || 'Failed to start agent');
+
+            startBtn.disabled = false;
+            startBtn.textContent = '▶️ Start Agent';
+        }
+    } catch (error) {
+        console.error('Error starting agent:', error);
+        const messageEl = $['agent-message'];
+        messageEl.style.display = 'block';
+        messageEl.style.background = '#fee2e2';
+        messageEl.style.color = '#991b1b';
+        messageEl.textContent = '❌ Error starting agent: ' + error.message;
+
+        startBtn.disabled = false;
+        startBtn.textContent = '▶️ Start Agent';
+    }
+}
+
+async function stopAgent() {
+    const stopBtn = $['stop-agent-btn'];
+    const startBtn = $['start-agent-btn'];
+    stopBtn.disabled = true;
+    stopBtn.textContent = '⏳ Stopping...';
+
+    try {
+        const response = await fetch('/api/stop-agent', {
+            method: 'POST',
+            headers: {
+                'X-API-Key': currentApiKey,
+                'Content-Type': 'application/json'
+            }
+        });
+
+        const data = await response.json();
+
+        const messageEl = $['agent-message'];
+
+        if (data.status === 'success') {
+            messageEl.style.display = 'block';
+            messageEl.style.background = '#d1fae5';
+            messageEl.style.color = '#065f46';
+            messageEl.textContent = '✅ Agent stopped successfully!';
+
+            // Reset stop button state BEFORE hiding it
+            stopBtn.disabled = false;
+            stopBtn.textContent = '⏸️ Stop Agent';
+
+            // Ensure start button is in correct state
+            startBtn.disabled = false;
+            startBtn.textContent = '▶️ Start Agent';
+
+            // Refresh status after 2 seconds
+            setTimeout(() => {
+                checkAgentStatus();
+                messageEl.style.display = 'none';
+            }, 2000);
+        } else {
+            messageEl.style.display = 'block';
+            messageEl.style.background = '#fee2e2';
+            messageEl.style.color = '#991b1b';
+            messageEl.textContent = '❌ ' + (data.message || 'Failed to stop agent');
+
+            stopBtn.disabled = false;
+            stopBtn.textContent = '⏸️ Stop Agent';
+        }
+    } catch (error) {
+        console.error('Error stopping agent:', error);
+        const messageEl = $['agent-message'];
+        messageEl.style.display = 'block';
+        messageEl.style.background = '#fee2e2';
+        messageEl.style.color = '#991b1b';
+        messageEl.textContent = '❌ Error stopping agent: ' + error.message;
+
+        stopBtn.disabled = false;
+        stopBtn.textContent = '⏸️ Stop Agent';
+    }
+}
+
+// ═══════════════════════════════════════════════════════════════
+// Trade Export Functions
+// ═══════════════════════════════════════════════════════════════
+
+function initExportControls() {
+    // Populate year dropdowns
+    const currentYear = new Date().getFullYear();
+    const currentMonth = new Date().getMonth() + 1;
+
+    const monthYearSelect = $['export-month-year'];
+    const yearSelect = $['export-year'];
+
+    // Add years (current and past 2 years) - build off-DOM, append once per select
+    const monthYearOptions = document.createDocumentFragment();
+    const yearOptions = document.createDocumentFragment();
+    for (let y = currentYear; y >= currentYear - 2; y--) {
+        const option = new Option(y, y);
+        monthYearOptions.appendChild(option);
+        yearOptions.appendChild(option.cloneNode(true));
+    }
+    monthYearSelect.appendChild(monthYearOptions);
+    yearSelect.appendChild(yearOptions);
+
+    // Set current month
+    $['export-month'].value = String(currentMonth).padStart(2, '0');
+}
+
+function downloadMonthlyTrades() {
+    const month = $['export-month'].value;
+    const year = $['export-month-year'].value;
+
+    const url = `/api/portfolio/trades/monthly-csv?key=${currentApiKey}&year=${year}&month=${month}`;
+    window.location.href = url;
+}
+
+function downloadYearlyTrades() {
+    const year = $['export-year'].value;
+
+    const url = `/api/portfolio/trades/yearly-csv?key=${currentApiKey}&year=${year}`;
+    window.location.href = url;
+}
+
+function showError(elementId, message) {
+    const el = document.getElementById(elementId);
+    el.className = 'error';
+    el.innerHTML = '❌ ' + message;  // Use innerHTML to render HTML tags
+    el.style.display = 'block';
+}
+
+function showSuccess(elementId, message) {
+    const el = document.getElementById(elementId);
+    el.className = 'success';
+    el.textContent = '✅ ' + message;
+    el.style.display = 'block';
+}
+
+
+// ==================== DASHBOARD PAGE: LOGIN, STATS, CHARTS, TRANSACTIONS ====================
+
+// Every static element with an id, looked up once (script runs after the markup).
+// Elements created later (equity-chart canvas, price-/pnl- cells) still use getElementById.
+const $ = Object.fromEntries([...document.querySelectorAll('[id]')].map(el => [el.id, el]));
+
+let currentApiKey = window.__DASHBOARD_KEY__;
+let currentPeriod = '30d';
+
+// Safety section toggle
+function toggleSafetySection() {
+    const header = document.querySelector('.safety-header');
+    const grid = document.getElementById('safetyGrid');
+    header.classList.toggle('collapsed');
+    grid.classList.toggle('hidden');
+}
+
+function toggleBacktestSection() {
+    const grid = document.getElementById('backtestGrid');
+    const toggle = document.getElementById('backtestToggle');
+    const disclaimer = grid.nextElementSibling;
+    if (grid.style.display === 'none') {
+        grid.style.display = 'grid';
+        disclaimer.style.display = 'block';
+        toggle.textContent = '▼';
+    } else {
+        grid.style.display = 'none';
+        disclaimer.style.display = 'none';
+        toggle.textContent = '▶';
+    }
+}
+
+// On page load
+if (currentApiKey) {
+    document.getElementById('api-key-input').value = currentApiKey;
+    login();
+}
+
+// ═══════════════════════════════════════════════════════════════
+// Agent Status Monitoring Functions
+// ═══════════════════════════════════════════════════════════════
+
+// Status changes are pushed over SSE; EventSource reconnects on its own and
+// each (re)connect delivers the current status first
+let agentStatusStream = null;
+let agentStatusInterval = null;
+
+function startAgentStatusMonitoring() {
+    stopAgentStatusMonitoring();
+
+    if (typeof EventSource === 'undefined') {
+        // Old browsers: fall back to polling every 30 seconds
+        checkAgentStatus();
+        agentStatusInterval = setInterval(checkAgentStatus, 30000);
+        return;
+    }
+
+    agentStatusStream = new EventSource(`/api/agent-status/stream?key=${encodeURIComponent(currentApiKey)}`);
+    agentStatusStream.onmessage = (event) => renderAgentStatus(JSON.parse(event.data));
+    // While the stream is down, show a one-shot status instead of a stale one
+    agentStatusStream.onerror = () => checkAgentStatus();
+}
+
+function stopAgentStatusMonitoring() {
+    if (agentStatusStream) {
+        agentStatusStream.close();
+        agentStatusStream = null;
+    }
+    if (agentStatusInterval) {
+        clearInterval(agentStatusInterval);
+        agentStatusInterval = null;
+    }
+}
+
+// ═══════════════════════════════════════════════════════════════
+
+function login() {
+    const apiKey = document.getElementById('api-key-input').value.trim();
+
+    if (!apiKey) {
+        showError('login-error', 'Please enter your API key');
+        return;
+    }
+
+    if (!apiKey.startsWith('nk_')) {
+        showError('login-error', 'Invalid API key format. Keys should start with "nk_"');
+        return;
+    }
+
+    currentApiKey = apiKey;
+    localStorage.setItem('apiKey', apiKey);
+
+    // Try to load stats
+    checkPortfolioStatus();
+}
+
+function logout() {
+    stopAgentStatusMonitoring();
+    localStorage.removeItem('apiKey');
+    currentApiKey = '';
+    apiCache.clear();
+    idbClear();  // Cached transaction history - don't leave it on a shared machine
+    document.getElementById('login-screen').style.display = 'block';
+    document.getElementById('setup-wizard').style.display = 'none';
+    document.getElementById('dashboard').style.display = 'none';
+}
+
+async function checkPortfolioStatus() {
+    try {
+        const response = await fetch(`/api/portfolio/balance-summary?key=${currentApiKey}`, {
+            headers: {'X-API-Key': currentApiKey}
+        });
+
+        if (response.status === 401) {
+            showError('login-error', 'Invalid API key. Please check and try again.');
+            return;
+        }
+
+        if (!response.ok) {
+            // Handle other errors (500, 404, etc.)
+            console.error('Portfolio stats error:', response.status);
+            // Still try to show setup wizard for new users
+            showSetupWizard();
+            return;
+        }
+
+        const data = await response.json();
+
+        if (data.status === 'success' || data.total_profit !== undefined) {
+            // Portfolio initialized - show dashboard with data
+            showDashboard(data);
+            // Initialize export controls
+            initExportControls();
+            // Load balance summary and transactions
+            await loadBalanceSummary();
+            await loadPositions();
+            await loadTransactionHistory();
+            // Load equity curve chart once its panel scrolls into view
+            loadEquityCurveWhenVisible();
+            // Load performance stats for default 30d period (fixes hero section showing $0)
+            await changePeriod();
+            // Check agent status
+            await checkAgentStatus();
+        } else if (data.status === 'not_initialized') {
+            // Portfolio not yet initialized - show setup wizard
+            showSetupWizard();
+        } else {
+            // Unknown status - show setup wizard
+            showSetupWizard();
+        }
+
+    } catch (error) {
+        console.error('Error:', error);
+        // If error, assume needs setup
+        showSetupWizard();
+    }
+}
+
+function showSetupWizard() {
+    document.getElementById('login-screen').style.display = 'none';
+    document.getElementById('setup-wizard').style.display = 'block';
+    document.getElementById('dashboard').style.display = 'none';
+}
+
+async function initializePortfolio() {
+    // No need to get initial capital - it will be auto-detected!
+
+    try {
+        // Show loading message
+        showSuccess('setup-message', '🔍 Detecting your Kraken balance...');
+
+        const response = await fetch('/api/portfolio/initialize', {
+            method: 'POST',
+            headers: {
+                'X-API-Key': currentApiKey,
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({})  // Empty - auto-detect!
+        });
+
+        const data = await response.json();
+
+        if (data.status === 'success') {
+            showSuccess('setup-message', 
+                `✅ Portfolio initialized with $${data.initial_capital.toLocaleString()} detected from your Kraken account!`);
+            setTimeout(() => checkPortfolioStatus(), 2000);
+        } else if (data.status === 'already_initialized') {
+            showSuccess('setup-message', 'Portfolio already initialized! Loading dashboard...');
+            setTimeout(() => checkPortfolioStatus(), 1000);
+        } else if (data.status === 'error') {
+            // Show error with setup link if needed
+            if (data.message.includes('set up your trading agent')) {
+                showError('setup-message', 
+                    data.message + '<br><br>' +
+                    '<a href="/setup?key=' + currentApiKey + '" ' +
+                    'style="color: #ffffff; text-decoration: underline; font-weight: bold;">' +
+                    '→ Go to Agent Setup</a>');
+            } else {
+                showError('setup-message', data.message);
+            }
+        } else {
+            showError('setup-message', data.message || 'Failed to initialize portfolio');
+        }
+
+    } catch (error) {
+        showError('setup-message', 'Error initializing portfolio: ' + error.message);
+    }
+}
+
+function showDashboard(stats) {
+    document.getElementById('login-screen').style.display = 'none';
+    document.getElementById('setup-wizard').style.display = 'none';
+    document.getElementById('dashboard').style.display = 'block';
+
+    // Start agent status monitoring
+    startAgentStatusMonitoring();
+    prefetchCardImagesWhenIdle();
+
+    // Don't call updateDashboard - portfolio data loaded separately
+    // The loadBalanceSummary() function handles all portfolio updates
+}
+
+// Period labels for the stats cards (the share card uses PERIOD_LABELS)
+const PROFIT_PERIOD_LABELS = Object.freeze({
+    '7d': '7d',
+    '30d': '30d',
+    '90d': '90d',
+    '1y': '1y',
+    'all': 'All-Time'
+});
+const PERIOD_TAG_LABELS = Object.freeze({
+    '7d': '7D',
+    '30d': '30D',
+    '90d': '90D',
+    '1y': '1Y',
+    'all': 'All Time'
+});
+
+function updateDashboard(stats) {
+    // Update profit label with readable period
+    $['profit-label'].textContent = `${PROFIT_PERIOD_LABELS[stats.period] || stats.period} Profit`;
+
+    // Handle negative total profit
+    const totalProfit = stats.total_profit || 0;
+    $['total-profit'].textContent = 
+        totalProfit >= 0 
+            ? `+$${totalProfit.toLocaleString()}` 
+            : `-$${Math.abs(totalProfit).toLocaleString()}`;
+    $['total-profit'].style.color = totalProfit >= 0 ? '#10b981' : '#ef4444';
+    $['total-profit'].dataset.value = totalProfit;  // Numeric profit for the share card
+
+    // ═══════════════════════════════════════════════════════════════
+    // PERIOD-SPECIFIC LABELS
+    // ═══════════════════════════════════════════════════════════════
+    const periodTag = `<span style="opacity: 0.6; font-size: 11px;">(${PERIOD_TAG_LABELS[currentPeriod] || '30D'})</span>`;
+
+    // Update period-specific labels
+    $['label-roi-initial'].innerHTML = `ROI on Initial Capital ${periodTag}`;
+    $['label-roi-total'].innerHTML = `ROI on Total Capital ${periodTag}`;
+    $['label-best-trade'].innerHTML = `Best Trade ${periodTag}`;
+    $['label-avg-trade'].innerHTML = `Avg Trade ${periodTag}`;
+    $['label-total-trades'].innerHTML = `Total Trades ${periodTag}`;
+    $['label-max-dd'].innerHTML = `Max Drawdown ${periodTag}`;
+
+    // ═══════════════════════════════════════════════════════════════
+    // PERIOD-SPECIFIC VALUES
+    // ═══════════════════════════════════════════════════════════════
+    // Handle negative ROI values (period-specific)
+    const roiInitial = stats.roi_on_initial || 0;
+    const roiTotal = stats.roi_on_total || roiInitial;
+    $['roi-initial'].textContent = 
+        roiInitial >= 0 ? `+${roiInitial.toFixed(1)}%` : `${roiInitial.toFixed(1)}%`;
+    $['roi-initial'].style.color = roiInitial >= 0 ? '#10b981' : '#ef4444';
+    $['roi-initial'].dataset.value = roiInitial;  // Numeric ROI for the share card
+    $['roi-total'].textContent = 
+        roiTotal >= 0 ? `+${roiTotal.toFixed(1)}%` : `${roiTotal.toFixed(1)}%`;
+    $['roi-total'].style.color = roiTotal >= 0 ? '#10b981' : '#ef4444';
+
+    // Handle negative best trade (period-specific)
+    const bestTrade = stats.best_trade || 0;
+    $['best-trade'].textContent = 
+        bestTrade >= 0 ? `+$${bestTrade.toLocaleString()}` : `-$${Math.abs(bestTrade).toLocaleString()}`;
+    $['best-trade'].style.color = bestTrade >= 0 ? '#10b981' : '#ef4444';
+
+    // Handle negative avg trade (period-specific)
+    const avgTrade = stats.avg_trade || 0;
+    $['avg-trade'].textContent = 
+        avgTrade >= 0 ? `+$${avgTrade.toLocaleString()}` : `-$${Math.abs(avgTrade).toLocaleString()}`;
+    $['avg-trade'].style.color = avgTrade >= 0 ? '#10b981' : '#ef4444';
+
+    // Total trades (period-specific)
+    $['total-trades'].textContent = stats.total_trades;
+
+    // Max drawdown (period-specific, no minus for 0%)
+    const maxDD = stats.max_drawdown || 0;
+    $['max-dd'].textContent = maxDD > 0 ? `-${maxDD}%` : `0%`;
+
+    // ═══════════════════════════════════════════════════════════════
+    // ALL-TIME VALUES (Profit Factor, Sharpe Ratio, Days Active)
+    // ═══════════════════════════════════════════════════════════════
+    // Profit Factor (all-time)
+    if (stats.all_time_profit_factor === null) {
+        $['profit-factor'].textContent = '∞';
+        $['profit-factor'].style.color = '#10b981';
+    } else {
+        const pf = stats.all_time_profit_factor || 0;
+        $['profit-factor'].textContent = `${pf}x`;
+        $['profit-factor'].style.color = pf >= 1 ? '#10b981' : '#ef4444';
+    }
+
+    // Sharpe ratio (all-time)
+    if (stats.all_time_sharpe === null) {
+        $['sharpe'].textContent = 'N/A';
+        $['sharpe'].style.color = '#9ca3af';
+    } else {
+        const sharpe = stats.all_time_sharpe || 0;
+        $['sharpe'].textContent = sharpe.toFixed(1);
+        $['sharpe'].style.color = sharpe >= 1 ? '#10b981' : (sharpe >= 0 ? '#fbbf24' : '#ef4444');
+    }
+
+    // Days active (all-time)
+    $['days-active'].textContent = stats.all_time_days_active || '< 1';
+
+    if (stats.started_tracking) {
+        const startDate = new Date(stats.started_tracking);
+        $['time-tracking'].textContent = 
+            `Trading since ${startDate.toLocaleDateString()} • ${stats.period}`;
+    }
+}
+
+// NEW: Load balance summary
+async function loadBalanceSummary() {
+    try {
+        const response = await fetch(`/api/portfolio/balance-summary?key=${currentApiKey}`);
+
+        if (response.status === 401) {
+            // Invalid API key - redirect to login
+            alert('Invalid API key. Please log in again.');
+            logout();
+            return;
+        }
+
+        const data = await response.json();
+
+        if (data.status === 'success') {
+            // Update portfolio overview
+            $['current-value'].textContent = 
+                `$${data.current_value.toLocaleString()}`;
+            $['initial-capital-display'].textContent = 
+                `$${data.initial_capital.toLocaleString()}`;
+            $['net-deposits'].textContent = 
+                data.net_deposits >= 0 
+                    ? `+$${data.net_deposits.toLocaleString()}`
+                    : `-$${Math.abs(data.net_deposits).toLocaleString()}`;
+
+            // Handle negative total profit with color
+            const totalProfit = data.total_profit || 0;
+            const profitEl = $['total-profit-overview'];
+            profitEl.textContent = totalProfit >= 0 
+                ? `+$${totalProfit.toLocaleString()}` 
+                : `-$${Math.abs(totalProfit).toLocaleString()}`;
+            profitEl.style.color = totalProfit >= 0 ? '#10b981' : '#ef4444';
+
+            $['total-deposits'].textContent = 
+                `+$${data.total_deposits.toLocaleString()}`;
+            $['total-withdrawals'].textContent = 
+                data.total_withdrawals > 0 
+                    ? `-$${data.total_withdrawals.toLocaleString()}`
+                    : `$0`;
+            $['total-capital'].textContent = 
+                `$${data.total_capital.toLocaleString()}`;
+
+            // Handle negative ROI with colors
+            const roiInitial = data.roi_on_initial || 0;
+            const roiTotal = data.roi_on_total || 0;
+
+            const roiInitialEl = $['roi-initial'];
+            roiInitialEl.textContent = roiInitial >= 0 
+                ? `+${roiInitial.toFixed(1)}%` 
+                : `${roiInitial.toFixed(1)}%`;
+            roiInitialEl.style.color = roiInitial >= 0 ? '#10b981' : '#ef4444';
+            roiInitialEl.dataset.value = roiInitial;  // Numeric ROI for the share card
+
+            const roiTotalEl = $['roi-total'];
+            roiTotalEl.textContent = roiTotal >= 0 
+                ? `+${roiTotal.toFixed(1)}%` 
+                : `${roiTotal.toFixed(1)}%`;
+            roiTotalEl.style.color = roiTotal >= 0 ? '#10b981' : '#ef4444';
+
+            // Update last check time
+            if (data.last_balance_check) {
+                const checkTime = new Date(data.last_balance_check);
+                $['last-check'].textContent = 
+                    checkTime.toLocaleString();
+            }
+        }
+    } catch (error) {
+        console.error('Error loading balance summary:', error);
+    }
+}
+
+// ==================== INDEXEDDB PAGE CACHE ====================
+// Tiny key-value wrapper; every failure degrades to "no cache"
+const IDB_NAME = 'nikepig-dashboard';
+const IDB_STORE = 'kv';
+const IDB_MAX_AGE_MS = 24 * 60 * 60 * 1000;
+let idbPromise = null;
+
+function idbOpen() {
+    if (!idbPromise) {
+        idbPromise = new Promise((resolve, reject) => {
+            if (!window.indexedDB) return reject(new Error('IndexedDB unavailable'));
+            const request = indexedDB.open(IDB_NAME, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore(IDB_STORE);
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+        idbPromise.catch(() => {});
+    }
+    return idbPromise;
+}
+
+function idbRequest(mode, fn) {
+    return idbOpen().then((db) => new Promise((resolve, reject) => {
+        const request = fn(db.transaction(IDB_STORE, mode).objectStore(IDB_STORE));
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    }));
+}
+
+function idbGet(key) {
+    return idbRequest('readonly', store => store.get(key)).catch(() => undefined);
+}
+
+function idbPut(key, value) {
+    return idbRequest('readwrite', store => store.put(value, key)).catch(() => undefined);
+}
+
+function idbClear() {
+    return idbRequest('readwrite', store => store.clear()).catch(() => undefined);
+}
+
+// Drop entries older than 24h (runs once per page load)
+function idbEvictStale() {
+    const cutoff = Date.now() - IDB_MAX_AGE_MS;
+    return idbOpen().then((db) => {
+        const request = db.transaction(IDB_STORE, 'readwrite').objectStore(IDB_STORE).openCursor();
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) return;
+            if (!cursor.value || cursor.value.t < cutoff) cursor.delete();
+            cursor.continue();
+        };
+    }).catch(() => undefined);
+}
+idbEvictStale();
+
+// NEW: Transaction pagination state
+let loadedTransactions = [];
+let transactionOffset = 0;
+const TRANSACTIONS_PER_PAGE = 20;
+let hasMoreTransactions = true;
+let txStartDate = null;
+let txEndDate = null;
+
+// Apply date filter
+function applyDateFilter() {
+    txStartDate = document.getElementById('tx-start-date').value || null;
+    txEndDate = document.getElementById('tx-end-date').value || null;
+
+    // Update status display
+    const statusEl = document.getElementById('date-filter-status');
+    if (txStartDate || txEndDate) {
+        let filterText = 'Filtering: ';
+        if (txStartDate && txEndDate) {
+            filterText += `${txStartDate} to ${txEndDate}`;
+        } else if (txStartDate) {
+            filterText += `from ${txStartDate}`;
+        } else {
+            filterText += `until ${txEndDate}`;
+        }
+        statusEl.textContent = filterText;
+        statusEl.style.color = '#667eea';
+    } else {
+        statusEl.textContent = '';
+    }
+
+    // Reload with filter
+    loadTransactionHistory(true);
+}
+
+// Clear date filter
+function clearDateFilter() {
+    document.getElementById('tx-start-date').value = '';
+    document.getElementById('tx-end-date').value = '';
+    txStartDate = null;
+    txEndDate = null;
+    document.getElementById('date-filter-status').textContent = '';
+    loadTransactionHistory(true);
+}
+
+// Display metadata per transaction type (unknown types fall back to TX_DEFAULT)
+const TX_META = {
+    deposit: { icon: '💰', tone: 'pos', sign: '+', label: 'Funding/Deposit', dailyOnly: false },
+    fees_funding_withdrawal: { icon: '💸', tone: 'neg', sign: '-', label: 'Fees / Funding / Withdrawal', dailyOnly: true },
+    // Legacy withdrawal entries
+    withdrawal: { icon: '💸', tone: 'neg', sign: '-', label: 'Withdrawal', dailyOnly: false }
+};
+const TX_DEFAULT = { icon: '🎯', tone: 'neu', sign: '', label: null, dailyOnly: false };
+
+// Render transactions to the list
+function renderTransactions() {
+    const listElement = $['transaction-list'];
+
+    if (loadedTransactions.length > 0) {
+        let html = '';
+        for (const tx of loadedTransactions) {
+            const created = new Date(tx.created_at);
+            const date = created.toLocaleDateString();
+
+            // Icon, color class, sign, and label come from the type lookup table
+            const meta = TX_META[tx.transaction_type] || TX_DEFAULT;
+            const { icon, tone, sign } = meta;
+            const label = meta.label || tx.transaction_type;
+            const subtitle = meta.dailyOnly
+                ? `${date} (daily total)`
+                : `${date} at ${created.toLocaleTimeString()}`;
+
+            html += `<div class="tx-row">
+                <div class="tx-left">
+                    <div class="tx-icon">${icon}</div>
+                    <div>
+                        <div class="tx-label">${label}</div>
+                        <div class="tx-sub">${subtitle}</div>
+                    </div>
+                </div>
+                <div class="tx-right">
+                    <div class="tx-amount ${tone}">${sign}$${tx.amount.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2})}</div>
+                    <div class="tx-method">${tx.detection_method}</div>
+                </div>
+            </div>`;
+        }
+
+        // Add info note at the bottom
+        html += `
+            <div style="padding: 15px; background: #f9fafb; border-top: 1px solid #e5e7eb;">
+                <div style="font-size: 12px; color: #6b7280; text-align: center;">
+                    ℹ️ <strong>Note:</strong> Kraken API cannot distinguish between trading fees, 
+                    funding payments, and spot↔futures transfers. These are grouped as 
+                    "Fees / Funding / Withdrawal" (aggregated daily).
+                </div>
+            </div>
+        `;
+
+        listElement.innerHTML = html;
+
+        // Show/hide Load More button
+        const loadMoreDiv = $['transaction-load-more'];
+        const countDiv = $['transaction-count'];
+        if (hasMoreTransactions) {
+            loadMoreDiv.style.display = 'block';
+            countDiv.textContent = `Showing ${loadedTransactions.length} transactions`;
+        } else {
+            loadMoreDiv.style.display = 'block';
+            countDiv.textContent = `All ${loadedTransactions.length} transactions loaded`;
+            loadMoreDiv.querySelector('button').style.display = 'none';
+        }
+    } else {
+        listElement.innerHTML = `
+            <div style="text-align: center; padding: 40px; color: #9ca3af;">
+                No transactions yet. System will automatically detect deposits and withdrawals.
+            </div>
+        `;
+        $['transaction-load-more'].style.display = 'none';
+    }
+}
+
+// Load transaction history (reset = true to start fresh)
+async function loadTransactionHistory(reset = false) {
+    let shownFromCache = false;
+    try {
+        if (reset) {
+            loadedTransactions = [];
+            transactionOffset = 0;
+            hasMoreTransactions = true;
+        }
+
+        const firstPage = transactionOffset === 0;
+
+        // First page: paint the last-seen copy from IndexedDB while the network refreshes
+        const cacheKey = `tx:${currentApiKey}:${txStartDate}:${txEndDate}`;
+        let networkDone = false;
+        if (firstPage) {
+            idbGet(cacheKey).then((cached) => {
+                if (!cached || networkDone || cacheKey !== `tx:${currentApiKey}:${txStartDate}:${txEndDate}`) return;
+                loadedTransactions = cached.transactions;
+                hasMoreTransactions = cached.transactions.length >= TRANSACTIONS_PER_PAGE;
+                shownFromCache = true;
+                renderTransactions();
+            });
+        }
+
+        // Build URL with optional date filters
+        let url = `/api/portfolio/transactions?key=${currentApiKey}&limit=${TRANSACTIONS_PER_PAGE}&offset=${transactionOffset}`;
+        if (txStartDate) {
+            url += `&start_date=${txStartDate}`;
+        }
+        if (txEndDate) {
+            url += `&end_date=${txEndDate}`;
+        }
+
+        // The <head> script may already have this request in flight (first use only)
+        const prefetched = window.__TX_PREFETCH__;
+        window.__TX_PREFETCH__ = null;
+        const response = await (prefetched && prefetched.url === url ? prefetched.response : fetch(url));
+        const data = await response.json();
+        networkDone = true;
+
+        if (data.status === 'success') {
+            // First page replaces whatever the cache painted
+            if (firstPage) {
+                loadedTransactions = [];
+                transactionOffset = 0;
+                hasMoreTransactions = true;
+                // Not if the user logged out while this was in flight
+                if (cacheKey.startsWith(`tx:${currentApiKey}:`)) {
+                    idbPut(cacheKey, { t: Date.now(), transactions: data.transactions });
+                }
+            }
+
+            if (data.transactions.length > 0) {
+                loadedTransactions = loadedTransactions.concat(data.transactions);
+                transactionOffset += data.transactions.length;
+
+                // Check if there are more to load
+                if (data.transactions.length < TRANSACTIONS_PER_PAGE) {
+                    hasMoreTransactions = false;
+                }
+            } else {
+                hasMoreTransactions = false;
+            }
+
+            renderTransactions();
+        }
+    } catch (error) {
+        console.error('Error loading transactions:', error);
+        if (shownFromCache) return;  // Keep showing the cached page
+        document.getElementById('transaction-list').innerHTML = `
+            <div style="text-align: center; padding: 40px; color: #ef4444;">
+                Error loading transactions
+            </div>
+        `;
+    }
+}
+
+// Load more transactions (append to existing)
+async function loadMoreTransactions() {
+    await loadTransactionHistory(false);
+}
+
+// ==================== EQUITY CURVE CHART ====================
+let equityChart = null;
+let equityCurveData = null;
+
+// Chart.js (+ date adapter) is only fetched when the chart is first drawn
+const CHART_JS_URLS = [
+    'https://cdn.jsdelivr.net/npm/chart.js',
+    'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns'
+];
+let chartJsReady = null;
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = () => reject(new Error(`Failed to load ${src}`));
+        document.head.appendChild(script);
+    });
+}
+
+function loadChartJs() {
+    if (window.Chart) return Promise.resolve();
+    if (!chartJsReady) {
+        // Adapter registers itself on window.Chart, so load in order
+        chartJsReady = loadScript(CHART_JS_URLS[0])
+            .then(() => loadScript(CHART_JS_URLS[1]))
+            .catch((error) => {
+                chartJsReady = null;  // Allow a retry on next refresh
+                throw error;
+            });
+    }
+    return chartJsReady;
+}
+
+// Defer the equity curve (fetch + Chart.js) until its panel is on screen
+let equityCurveVisible = false;
+let equityCurveObserver = null;
+
+function loadEquityCurveWhenVisible() {
+    if (equityCurveVisible || !('IntersectionObserver' in window)) {
+        return loadEquityCurve();
+    }
+    if (!equityCurveObserver) {
+        equityCurveObserver = new IntersectionObserver((entries) => {
+            if (!entries.some(entry => entry.isIntersecting)) return;
+            equityCurveObserver.disconnect();
+            equityCurveObserver = null;
+            equityCurveVisible = true;
+            loadEquityCurve();
+        });
+        equityCurveObserver.observe(document.getElementById('equity-chart-container'));
+    }
+}
+
+async function loadEquityCurve() {
+    try {
+        const response = await fetch(`/api/portfolio/equity-curve?key=${currentApiKey}`);
+        const data = await response.json();
+
+        // Update summary stats (these should always be available)
+        const initialCap = data.initial_capital || 0;
+        const currentEq = data.current_equity || initialCap;
+        const maxEq = data.max_equity || initialCap;
+        const minEq = data.min_equity || initialCap;
+        const maxDD = data.max_drawdown || 0;
+        const totalTrades = data.total_trades || 0;
+        const totalPnl = data.total_pnl || 0;
+
+        $['eq-initial'].textContent = `$${initialCap.toLocaleString()}`;
+        $['eq-current'].textContent = `$${currentEq.toLocaleString()}`;
+        $['eq-peak'].textContent = `$${maxEq.toLocaleString()}`;
+        $['eq-trough'].textContent = `$${minEq.toLocaleString()}`;
+        $['eq-maxdd'].textContent = `${maxDD.toFixed(1)}%`;
+
+        // Color current equity based on profit/loss
+        const currentEl = $['eq-current'];
+        currentEl.style.color = currentEq >= initialCap ? '#10b981' : '#ef4444';
+
+        // Update stats text
+        $['equity-stats'].textContent = 
+            `${totalTrades} trades | Total PnL: $${totalPnl >= 0 ? '+' : ''}${totalPnl.toLocaleString()}`;
+
+        // Check if we have actual trading data to chart
+        if (data.status === 'success' && data.dates && data.dates.length > 1) {
+            // We have trades - render chart with time-proportional X axis
+            // Busy periods show as clustered dots
+            // Payload is columnar: dates[i], equity[i], pnl[i], cum[i], trades[i]
+            const n = data.dates.length;
+            const equityData = data.equity;
+
+            // Flat reference line only needs its two endpoints
+            const startingCapitalData = [
+                { x: data.dates[0], y: data.initial_capital },
+                { x: data.dates[n - 1], y: data.initial_capital }
+            ];
+
+            await loadChartJs();
+
+            // Tooltip callbacks read from here, so in-place updates stay in sync
+            equityCurveData = data;
+
+            // A previous "no trades" message replaces the canvas - put it back
+            let canvas = document.getElementById('equity-chart');
+            if (!canvas) {
+                if (equityChart) {
+                    equityChart.destroy();
+                    equityChart = null;
+                }
+                $['equity-chart-container'].innerHTML = '<canvas id="equity-chart"></canvas>';
+                canvas = document.getElementById('equity-chart');
+            }
+
+            // Color based on profit/loss
+            const inProfit = data.current_equity >= data.initial_capital;
+            const lineColor = inProfit ? '#10b981' : '#ef4444';
+            const ctx = canvas.getContext('2d');
+            const gradient = ctx.createLinearGradient(0, 0, 0, 350);
+            if (inProfit) {
+                gradient.addColorStop(0, 'rgba(16, 185, 129, 0.3)');
+                gradient.addColorStop(1, 'rgba(16, 185, 129, 0.0)');
+            } else {
+                gradient.addColorStop(0, 'rgba(239, 68, 68, 0.3)');
+                gradient.addColorStop(1, 'rgba(239, 68, 68, 0.0)');
+            }
+
+            // Chart already built - swap the data in place (no re-init, no animation)
+            if (equityChart) {
+                const [equitySet, capitalSet] = equityChart.data.datasets;
+                equityChart.data.labels = data.dates;
+                equitySet.data = equityData;
+                equitySet.borderColor = lineColor;
+                equitySet.backgroundColor = gradient;
+                equitySet.pointBackgroundColor = lineColor;
+                equitySet.pointRadius = n > 100 ? 2 : 3;
+                capitalSet.data = startingCapitalData;
+                equityChart.update('none');
+                return;
+            }
+
+            // First load - create chart with time scale (clustered dots = busy periods)
+            equityChart = new Chart(ctx, {
+                type: 'line',
+                data: {
+                    labels: data.dates,
+                    datasets: [{
+                        label: 'Trading Equity',
+                        data: equityData,
+                        borderColor: lineColor,
+                        backgroundColor: gradient,
+                        borderWidth: 2,
+                        fill: true,
+                        tension: 0.3,
+                        pointRadius: n > 100 ? 2 : 3,
+                        pointHoverRadius: 6,
+                        pointBackgroundColor: lineColor,
+                        pointBorderColor: '#fff',
+                        pointBorderWidth: 2
+                    },
+                    {
+                        label: 'Starting Capital',
+                        data: startingCapitalData,
+                        borderColor: '#9ca3af',
+                        borderWidth: 1,
+                        borderDash: [5, 5],
+                        fill: false,
+                        pointRadius: 0,
+                        tension: 0
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: {
+                        intersect: false,
+                        mode: 'index'
+                    },
+                    plugins: {
+                        legend: {
+                            display: true,
+                            position: 'top',
+                            labels: {
+                                usePointStyle: true,
+                                padding: 20
+                            }
+                        },
+                        tooltip: {
+                            backgroundColor: 'rgba(0, 0, 0, 0.8)',
+                            titleColor: '#fff',
+                            bodyColor: '#fff',
+                            padding: 12,
+                            displayColors: false,
+                            callbacks: {
+                                title: function(context) {
+                                    return equityCurveData.trades[context[0].dataIndex] || 'Balance';
+                                },
+                                label: function(context) {
+                                    if (context.datasetIndex !== 0) return null;
+                                    const idx = context.dataIndex;
+                                    const pnl = equityCurveData.pnl[idx];
+                                    const cum = equityCurveData.cum[idx];
+                                    const lines = [`Equity: $${equityCurveData.equity[idx].toLocaleString()}`];
+                                    if (pnl !== 0) {
+                                        const pnlStr = pnl >= 0 ? `+$${pnl}` : `-$${Math.abs(pnl)}`;
+                                        lines.push(`Trade PnL: ${pnlStr}`);
+                                    }
+                                    lines.push(`Cumulative: $${cum >= 0 ? '+' : ''}${cum}`);
+                                    return lines;
+                                }
+                            }
+                        }
+                    },
+                    scales: {
+                        x: {
+                            type: 'time',
+                            time: {
+                                unit: 'day',
+                                displayFormats: {
+                                    day: 'MMM d'
+                                },
+                                tooltipFormat: 'MMM d, yyyy h:mm a'
+                            },
+                            grid: {
+                                display: false
+                            },
+                            ticks: {
+                                maxTicksLimit: 8,
+                                color: '#6b7280'
+                            }
+                        },
+                        y: {
+                            grid: {
+                                color: 'rgba(0, 0, 0, 0.05)'
+                            },
+                            ticks: {
+                                callback: function(value) {
+                                    return '$ ' + value.toLocaleString();
+                                },
+                                color: '#6b7280'
+                            }
+                        }
+                    }
+                }
+            });
+        } else if (data.status === 'no_trades' || data.dates?.length <= 1) {
+            // No trades yet - show friendly message with flat line hint
+            $['equity-chart-container'].innerHTML = `
+                <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%; color: #6b7280; text-align: center; padding: 20px;">
+                    <div style="font-size: 48px; margin-bottom: 15px;">📊</div>
+                    <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px;">No Trades Yet</div>
+                    <div style="font-size: 14px; color: #9ca3af;">Your equity curve will appear here once trades are executed</div>
+                </div>
+            `;
+        } else {
+            // Unknown status - show waiting message
+            $['equity-chart-container'].innerHTML = `
+                <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%; color: #6b7280; text-align: center; padding: 20px;">
+                    <div style="font-size: 48px; margin-bottom: 15px;">⏳</div>
+                    <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px;">Waiting for Data</div>
+                    <div style="font-size: 14px; color: #9ca3af;">Chart will load once trading begins</div>
+                </div>
+            `;
+        }
+    } catch (error) {
+        console.error('Error loading equity curve:', error);
+        // Show friendly message instead of scary red error
+        $['equity-chart-container'].innerHTML = `
+            <div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%; color: #6b7280; text-align: center; padding: 20px;">
+                <div style="font-size: 48px; margin-bottom: 15px;">📊</div>
+                <div style="font-size: 18px; font-weight: 600; margin-bottom: 8px;">No Trading Data</div>
+                <div style="font-size: 14px; color: #9ca3af;">Start trading to see your equity curve</div>
+            </div>
+        `;
+    }
+}
+
+// ==================== OPEN POSITIONS FUNCTIONS ====================
+async function loadPositions() {
+    try {
+        const response = await fetch(`/api/portfolio/open-positions?key=${currentApiKey}`);
+        const data = await response.json();
+
+        const listDiv = document.getElementById('open-positions-list');
+        const countSpan = document.getElementById('open-positions-count');
+
+        if (data.status === 'success' && data.positions && data.positions.length > 0) {
+            // Store positions globally for price updates
+            window.openPositions = data.positions;
+
+            countSpan.textContent = `${data.count} open position${data.count > 1 ? 's' : ''}`;
+
+            let html = `
+                <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
+                    <thead>
+                        <tr style="background: #f9fafb; border-bottom: 2px solid #e5e7eb;">
+                            <th style="padding: 12px 10px; text-align: left; color: #374151; font-weight: 600;">Symbol</th>
+                            <th style="padding: 12px 10px; text-align: left; color: #374151; font-weight: 600;">Side</th>
+                            <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Size</th>
+                            <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Entry Price</th>
+                            <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Current Price</th>
+                            <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Live P&L</th>
+                            <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Take Profit</th>
+                            <th style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 600;">Stop Loss</th>
+                            <th style="padding: 12px 10px; text-align: left; color: #374151; font-weight: 600;">Opened</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+            `;
+
+            for (const pos of data.positions) {
+                const sideLower = (pos.side || '').toLowerCase();
+                const isLong = sideLower === 'long' || sideLower === 'buy';
+                const sideColor = isLong ? '#10b981' : '#ef4444';
+                const sideIcon = isLong ? '📈' : '📉';
+                const sideLabel = isLong ? 'LONG' : 'SHORT';
+
+                const openedDate = pos.opened_at ? new Date(pos.opened_at).toLocaleString() : '-';
+                const entryPrice = pos.avg_entry_price || pos.entry_fill_price || 0;
+                const posId = pos.id || pos.symbol.replace('/', '-');
+
+                html += `
+                    <tr style="border-bottom: 1px solid #e5e7eb;" data-position-id="${posId}" data-kraken-symbol="${pos.kraken_symbol}" data-entry="${entryPrice}" data-size="${pos.filled_quantity || pos.quantity || 0}" data-side="${sideLower}">
+                        <td style="padding: 12px 10px; font-weight: 600; color: #374151;">
+                            ${pos.symbol || pos.kraken_symbol || '-'}
+                        </td>
+                        <td style="padding: 12px 10px;">
+                            <span style="
+                                display: inline-flex;
+                                align-items: center;
+                                gap: 4px;
+                                padding: 4px 10px;
+                                border-radius: 12px;
+                                font-size: 12px;
+                                font-weight: 600;
+                                background: ${sideColor}20;
+                                color: ${sideColor};
+                            ">
+                                ${sideIcon} ${sideLabel}
+                            </span>
+                        </td>
+                        <td style="padding: 12px 10px; text-align: right; color: #374151;">
+                            ${(pos.filled_quantity || pos.quantity || 0).toLocaleString()}
+                        </td>
+                        <td style="padding: 12px 10px; text-align: right; color: #374151; font-weight: 500;">
+                            $${entryPrice.toFixed(5)}
+                        </td>
+                        <td style="padding: 12px 10px; text-align: right; color: #374151;" id="price-${posId}">
+                            <span style="color: #9ca3af;">Loading...</span>
+                        </td>
+                        <td style="padding: 12px 10px; text-align: right; font-weight: 600;" id="pnl-${posId}">
+                            <span style="color: #9ca3af;">--</span>
+                        </td>
+                        <td style="padding: 12px 10px; text-align: right;">
+                            ${pos.target_tp ? `<span style="color: #10b981; font-weight: 500;">$${pos.target_tp.toFixed(5)}</span>` : '<span style="color: #9ca3af;">-</span>'}
+                        </td>
+                        <td style="padding: 12px 10px; text-align: right;">
+                            ${pos.target_sl ? `<span style="color: #ef4444; font-weight: 500;">$${pos.target_sl.toFixed(5)}</span>` : '<span style="color: #9ca3af;">-</span>'}
+                        </td>
+                        <td style="padding: 12px 10px; color: #6b7280; font-size: 13px;">
+                            ${openedDate}
+                        </td>
+                    </tr>
+                `;
+            }
+
+            html += `
+                    </tbody>
+                </table>
+            `;
+
+            listDiv.innerHTML = html;
+
+            // Start fetching live prices
+            updateLivePrices();
+        } else {
+            window.openPositions = [];
+            countSpan.textContent = '0 positions';
+            listDiv.innerHTML = `
+                <div style="text-align: center; padding: 40px; color: #9ca3af;">
+                    <div style="font-size: 48px; margin-bottom: 15px;">✨</div>
+                    <div style="font-size: 16px; font-weight: 500; margin-bottom: 8px;">No Open Positions</div>
+                    <div style="font-size: 14px;">Your active trades will appear here</div>
+                </div>
+            `;
+        }
+    } catch (error) {
+        console.error('Error loading positions:', error);
+        document.getElementById('open-positions-list').innerHTML = `
+            <div style="text-align: center; padding: 40px; color: #ef4444;">
+                Error loading positions. Please try again.
+            </div>
+        `;
+    }
+}
+
+// Live price updates for open positions (refreshes every 10 seconds)
+let priceUpdateInterval = null;
+
+async function updateLivePrices() {
+    // Get all position rows with kraken symbols
+    const rows = document.querySelectorAll('tr[data-kraken-symbol]');
+    if (rows.length === 0) return;
+
+    // Collect unique symbols
+    const symbols = [...new Set([...rows].map(r => r.dataset.krakenSymbol).filter(s => s))];
+    if (symbols.length === 0) return;
+
+    try {
+        // Fetch prices from cached endpoint
+        const response = await fetch(`/api/prices?symbols=${symbols.join(',')}`);
+        const data = await response.json();
+
+        if (data.prices) {
+            // Update each position row
+            rows.forEach(row => {
+                const symbol = row.dataset.krakenSymbol;
+                const entryPrice = parseFloat(row.dataset.entry);
+                const size = parseFloat(row.dataset.size);
+                const side = row.dataset.side?.toLowerCase();
+                const posId = row.dataset.positionId;
+
+                const currentPrice = data.prices[symbol];
+
+                if (currentPrice && entryPrice && size) {
+                    // Update current price display
+                    const priceCell = document.getElementById(`price-${posId}`);
+                    if (priceCell) {
+                        priceCell.innerHTML = `$${currentPrice.toFixed(5)}`;
+                    }
+
+                    // Calculate P&L based on side
+                    let pnl;
+                    if (side === 'long' || side === 'buy') {
+                        pnl = (currentPrice - entryPrice) * size;
+                    } else {
+                        pnl = (entryPrice - currentPrice) * size;
+                    }
+
+                    // Update P&L display
+                    const pnlCell = document.getElementById(`pnl-${posId}`);
+                    if (pnlCell) {
+                        const pnlColor = pnl >= 0 ? '#10b981' : '#ef4444';
+                        const pnlSign = pnl >= 0 ? '+' : '';
+                        pnlCell.innerHTML = `<span style="color: ${pnlColor};">${pnlSign}$${pnl.toFixed(2)}</span>`;
+                    }
+                }
+            });
+        }
+    } catch (error) {
+        console.error('Error fetching live prices:', error);
+    }
+
+    // Schedule next update (10 seconds)
+    if (priceUpdateInterval) clearTimeout(priceUpdateInterval);
+    priceUpdateInterval = setTimeout(updateLivePrices, 10000);
+}
+
+// Refresh entire dashboard
+async function refreshDashboard() {
+    const refreshBtn = document.querySelector('.refresh-btn');
+    const originalText = refreshBtn.innerHTML;
+
+    try {
+        // Show loading state
+        refreshBtn.innerHTML = '⏳ Refreshing...';
+        refreshBtn.disabled = true;
+
+        // Refresh all dashboard data
+        apiCache.clear();
+        await loadBalanceSummary();
+        await loadPositions();
+        await loadTransactionHistory(true);
+        await loadEquityCurveWhenVisible();
+        await changePeriod();
+        await checkAgentStatus();
+
+        // Success feedback
+        refreshBtn.innerHTML = '✅ Refreshed!';
+        setTimeout(() => {
+            refreshBtn.innerHTML = originalText;
+            refreshBtn.disabled = false;
+        }, 1500);
+    } catch (error) {
+        console.error('Error refreshing dashboard:', error);
+        refreshBtn.innerHTML = '❌ Error';
+        setTimeout(() => {
+            refreshBtn.innerHTML = originalText;
+            refreshBtn.disabled = false;
+        }, 2000);
+    }
+}
+
+// Recently fetched API JSON is served from memory, and identical requests made
+// while one is still in flight share it. Only successful responses are kept;
+// the least recently used entry goes once the cache is full.
+const API_CACHE_MAX = 20;
+const apiCache = new Map();  // url -> { t, p: Promise<{ ok, status, data }> }
+
+function cachedFetchJson(url, options = {}, ttlMs = 15000) {
+    const hit = apiCache.get(url);
+    if (hit && Date.now() - hit.t < ttlMs) {
+        apiCache.delete(url);  // Re-insert: Map order doubles as LRU order
+        apiCache.set(url, hit);
+        return hit.p;
+    }
+
+    const entry = { t: Date.now(), p: null };
+    const forget = () => { if (apiCache.get(url) === entry) apiCache.delete(url); };
+    entry.p = fetch(url, options).then(async (response) => {
+        const result = { ok: response.ok, status: response.status, data: await response.json() };
+        if (!result.ok) forget();  // Let the next call retry
+        return result;
+    });
+    entry.p.catch(forget);
+
+    apiCache.set(url, entry);
+    if (apiCache.size > API_CACHE_MAX) apiCache.delete(apiCache.keys().next().value);
+    return entry.p;
+}
+
+// Flipping back to a recently viewed period is instant
+const STATS_TTL_MS = 30000;
+
+async function changePeriod() {
+    currentPeriod = document.getElementById('period-selector').value;
+    const period = currentPeriod;
+
+    try {
+        const { data: stats } = await cachedFetchJson(`/api/portfolio/stats?period=${period}`, {
+            headers: {'X-API-Key': currentApiKey}
+        }, STATS_TTL_MS);
+
+        // The user may have picked another period while this one loaded
+        if (period !== currentPeriod) return;
+
+        if (stats.status !== 'no_data') {
+            updateDashboard(stats);
+        }
+    } catch (error) {
+        console.error('Error loading stats:', error);
+    }
+}
@@ -0,0 +1,33 @@
+// ==================== LOGIN PAGE SCRIPT ====================
+// Served from /static with a content-hash query string and cached as
+// immutable, like dashboard.js - returning users only re-fetch the HTML.
+
+function accessDashboard(event) {
+    event.preventDefault();
+
+    const apiKey = document.getElementById('apiKey').value.trim();
+    const messageDiv = document.getElementById('message');
+    const submitBtn = document.getElementById('submitBtn');
+
+    // Basic validation
+    if (!apiKey.startsWith('nk_')) {
+        messageDiv.className = 'error';
+        messageDiv.textContent = '❌ Invalid API key format. API keys start with "nk_"';
+        messageDiv.style.display = 'block';
+        return;
+    }
+
+    // Disable button
+    submitBtn.disabled = true;
+    submitBtn.textContent = '⏳ Verifying...';
+
+    // Redirect to dashboard with API key
+    window.location.href = `/dashboard?key=${encodeURIComponent(apiKey)}`;
+}
+
+// Auto-fill from URL parameter if present
+const urlParams = new URLSearchParams(window.location.search);
+const keyFromUrl = urlParams.get('key');
+if (keyFromUrl) {
+    document.getElementById('apiKey').value = keyFromUrl;
+}
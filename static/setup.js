@@ -0,0 +1,93 @@
+// ==================== SETUP PAGE SCRIPT ====================
+// Served from /static with a content-hash query string and cached as
+// immutable, like dashboard.js.
+
+function toggleCollapsible(id) {
+    const element = document.getElementById(id);
+    element.classList.toggle('open');
+}
+
+function showAlert(message, type) {
+    const alert = document.getElementById('alert');
+    alert.innerHTML = message;
+    alert.className = `alert ${type}`;
+    alert.style.display = 'block';
+
+    // Scroll to top to show alert
+    window.scrollTo({ top: 0, behavior: 'smooth' });
+
+    if (type === 'success') {
+        setTimeout(() => {
+            window.location.href = `/dashboard?key=${document.getElementById('api-key').value}`;
+        }, 5000);
+    }
+}
+
+async function setupAgent() {
+    const apiKey = document.getElementById('api-key').value.trim();
+    const krakenKey = document.getElementById('kraken-key').value.trim();
+    const krakenSecret = document.getElementById('kraken-secret').value.trim();
+
+    // Validation
+    if (!apiKey) {
+        showAlert('Please enter your Nike Rocket API key', 'error');
+        return;
+    }
+
+    if (!apiKey.startsWith('nk_')) {
+        showAlert('Invalid API key format. Should start with "nk_"', 'error');
+        return;
+    }
+
+    if (!krakenKey || !krakenSecret) {
+        showAlert('Please enter both Kraken API key and secret', 'error');
+        return;
+    }
+
+    // Disable button
+    const btn = document.querySelector('.btn');
+    btn.disabled = true;
+    btn.textContent = '⏳ Setting up your agent...';
+
+    try {
+        const response = await fetch('/api/setup-agent', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-API-Key': apiKey
+            },
+            body: JSON.stringify({
+                kraken_api_key: krakenKey,
+                kraken_api_secret: krakenSecret
+            })
+        });
+
+        const data = await response.json();
+
+        if (response.ok && data.status === 'success') {
+            showAlert(
+                '✅ <strong>Agent configured successfully!</strong><br><br>' +
+                '⏳ Your trading agent will be ready in <strong>5 minutes</strong>.<br><br>' +
+                '<small>You can check your dashboard now, but portfolio tracking will be ' +
+                'available once the agent finishes configuration.</small><br><br>' +
+                '<small style="color: #6b7280;">Redirecting to dashboard in 5 seconds...</small>', 
+                'success'
+            );
+        } else {
+            showAlert(`Error: ${data.message || data.detail || 'Failed to setup agent'}`, 'error');
+            btn.disabled = false;
+            btn.textContent = '🚀 Start My Trading Agent';
+        }
+    } catch (error) {
+        showAlert(`Error: ${error.message}`, 'error');
+        btn.disabled = false;
+        btn.textContent = '🚀 Start My Trading Agent';
+    }
+}
+
+// Auto-fill API key from URL parameter
+const urlParams = new URLSearchParams(window.location.search);
+const apiKeyParam = urlParams.get('key');
+if (apiKeyParam) {
+    document.getElementById('api-key').value = apiKeyParam;
+}
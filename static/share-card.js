@@ -0,0 +1,525 @@
+// ==================== SHARE CARD SCRIPT ====================
+// The performance card: background picker, rendering (in card-worker.js where
+// supported), download and Twitter sharing. Loaded on demand by
+// loadShareCardScript() in dashboard.js, which shares its globals
+// ($, currentPeriod, showSuccess, ...); the functions below replace the
+// loader stubs of the same name there.
+
+// ==================== SOCIAL SHARING FUNCTIONS (NEW!) ====================
+
+let selectedBackground = 'charles'; // Default background
+let selectorMode = 'download'; // 'download' or 'twitter'
+
+// Period wording used on the card and in the tweet text
+const PERIOD_LABELS = Object.freeze({
+    '7d': '7 days',
+    '30d': '30 days',
+    '90d': '90 days',
+    '1y': '1 year',
+    'all': 'all-time'
+});
+
+// One detached anchor serves every download; click() works without inserting it
+let downloadAnchor = null;
+
+// Revoke on a delay - revoking right after click() can cancel the download
+// in some browsers, and never revoking pins every card's blob in memory
+function downloadBlob(blob, filename) {
+    if (!downloadAnchor) downloadAnchor = document.createElement('a');
+    const url = URL.createObjectURL(blob);
+    downloadAnchor.href = url;
+    downloadAnchor.download = filename;
+    downloadAnchor.click();
+    setTimeout(() => URL.revokeObjectURL(url), 1000);
+}
+
+// Numeric value behind a stat: data-value is set when the stats render,
+// the text is only parsed if it's missing
+function readStatValue(el) {
+    return el.dataset.value !== undefined
+        ? Number(el.dataset.value)
+        : parseFloat(el.textContent.replace(/[^\d.\-]/g, ''));
+}
+
+// Card figures from the MASSIVE ROCKET PERFORMANCE section (period-specific),
+// or null (after telling the user, unless quiet) if the stats haven't loaded yet
+function readPerformanceCardData(quiet = false) {
+    const profitElement = document.getElementById('total-profit');
+    const roiElement = document.getElementById('roi-initial');
+
+    if (!profitElement || !roiElement) {
+        if (!quiet) alert('Portfolio data not loaded yet. Please wait a moment and try again.');
+        return null;
+    }
+
+    return {
+        profit: profitElement.textContent,
+        roi: roiElement.textContent,
+        profitValue: readStatValue(profitElement),
+        roiValue: readStatValue(roiElement),
+        period: currentPeriod  // Kept in sync with the period dropdown
+    };
+}
+
+// Hand the card straight to the OS share sheet (Web Share API Level 2) so it is
+// attached to the post. Returns false, without waiting, when file sharing isn't
+// available - navigator.share() must be called inside the click's user activation.
+function shareCardFile(blob, filename, text) {
+    const file = new File([blob], filename, { type: blob.type });
+    if (!navigator.canShare || !navigator.canShare({ files: [file] })) return false;
+    navigator.share({ files: [file], text }).catch((error) => {
+        if (error.name !== 'AbortError') {  // AbortError: the user closed the sheet
+            console.warn('Share sheet unavailable, downloading instead:', error);
+            downloadBlob(blob, filename);
+            showShareNote(false);
+        }
+    });
+    return true;
+}
+
+// Resolves true if the card made it onto the clipboard (most browsers accept PNG only).
+// Takes the card as a Promise<Blob> so the write starts inside the click's user
+// activation even while the card is still rendering.
+async function copyCardToClipboard(pendingBlob, type) {
+    const canCopy = navigator.clipboard && navigator.clipboard.write
+        && typeof ClipboardItem !== 'undefined'
+        && (!ClipboardItem.supports || ClipboardItem.supports(type));
+    if (!canCopy) return false;
+    try {
+        await navigator.clipboard.write([new ClipboardItem({ [type]: pendingBlob })]);
+        return true;
+    } catch (err) {
+        console.log('⚠️ Could not copy to clipboard:', err);
+        return false;
+    }
+}
+
+// Inline note instead of a blocking alert()
+function showShareNote(copied) {
+    showSuccess('share-status', copied
+        ? 'Performance card copied and downloaded - paste it into your tweet, or click "Add photos" to attach it.'
+        : 'Performance card downloaded - click "Add photos" in your tweet to attach it.');
+    setTimeout(() => { document.getElementById('share-status').style.display = 'none'; }, 10000);
+}
+
+// Not async on purpose: the share sheet, clipboard write and tweet tab all need
+// the click's user activation, which is gone by the time a render is awaited
+// (Safari then refuses them). Everything that needs it happens before any await.
+function shareToTwitter() {
+    const card = readPerformanceCardData();
+    if (!card) return;
+    const { profit, roi, period } = card;
+
+    const text = `$NIKEPIG's Massive Rocket ${PERIOD_LABELS[period] || period} Performance Card
+
+Profit: ${profit}
+ROI: ${roi}`;
+
+    const twitterUrl = `https://twitter.com/intent/tweet?text=${encodeURIComponent(text)}`;
+    const filename = `nikepig-performance-${period}.${CARD_IMAGE_EXTENSION}`;
+    const pending = renderPerformanceCard(card, PERIOD_LABELS[period]);
+
+    // Close the background selector modal
+    toggleBackgroundSelector();
+
+    // Share sheet first - the image goes with the post, no manual attach. It needs
+    // the finished file now, so only when the card was rendered ahead
+    // (prerenderShareCard) - which it usually is by the time the user clicks
+    const rendered = renderedCardBlobs.get(pending);
+    if (rendered && shareCardFile(rendered, filename, text)) return;
+
+    // Otherwise: clipboard (given the pending card) and tweet tab right away,
+    // then the download once the card is ready
+    const copying = copyCardToClipboard(pending, CARD_IMAGE_TYPE);
+    window.open(twitterUrl, '_blank', 'noopener');
+    pending.then(async (blob) => {
+        downloadBlob(blob, filename);
+        showShareNote(await copying);
+    }).catch((error) => {
+        console.error('Failed to load card images:', error);
+    });
+}
+
+// Start rendering the Twitter card while the user is still picking a background,
+// so shareToTwitter() can hand the finished file to the share sheet
+function prerenderShareCard() {
+    const card = readPerformanceCardData(true);
+    if (card) renderPerformanceCard(card, PERIOD_LABELS[card.period]).catch(() => {});
+}
+
+// ---- Card images: loaded and decoded once, reused on every render ----
+// Same-origin and versioned: served with a year-long immutable Cache-Control
+// (only while ?v= is the file's own content hash, so each file gets its own)
+const CARD_ASSET_VERSIONS = window.__CARD_ASSET_VERSIONS__ || {};
+const cardAssetUrl = (name) => `/static/${name}?v=${CARD_ASSET_VERSIONS[name] || 'dev'}`;
+const CARD_BACKGROUND_URLS = {
+    'charles': cardAssetUrl('bg-charles.jpg'),
+    'casino': cardAssetUrl('bg-casino.jpg'),
+    'gaming': cardAssetUrl('bg-gaming.jpg'),
+    'money': cardAssetUrl('bg-money.jpg')
+};
+const CARD_LOGO_URL = cardAssetUrl('nikepig-logo.png');
+const CARD_LOGO_HEIGHT = 100;
+// Photo backgrounds: JPEG encodes far faster than PNG and is much smaller
+const CARD_IMAGE_TYPE = 'image/jpeg';
+const CARD_IMAGE_QUALITY = 0.9;
+const CARD_IMAGE_EXTENSION = 'jpg';  // Keep in step with CARD_IMAGE_TYPE
+const imageCache = new Map();  // url -> Promise<decoded HTMLImageElement>
+
+function loadCached(url) {
+    if (!imageCache.has(url)) {
+        const pending = new Promise((resolve, reject) => {
+            const img = new Image();
+            img.onload = () => resolve(img);
+            img.onerror = (error) => {
+                // Drop any partial decode; clear the handler first so this can't re-fire
+                img.onerror = null;
+                img.removeAttribute('src');
+                reject(error);
+            };
+            img.src = url;
+        }).then((img) => (
+            // Resolve only once decoded, so the first drawImage doesn't stall on it
+            img.decode ? img.decode().then(() => img) : img
+        ));
+        // Don't remember failures - the next click should retry
+        pending.catch(() => imageCache.delete(url));
+        imageCache.set(url, pending);
+    }
+    return imageCache.get(url);
+}
+
+// Decode (and pre-scale) straight to ImageBitmaps where supported: the
+// browser decodes off the main thread and drawImage needs no resize.
+// The bg-*.jpg assets are already 1200x630, so the resize is only a safeguard.
+const CARD_BACKGROUND_BITMAP = { resizeWidth: 1200, resizeHeight: 630, resizeQuality: 'high' };
+const CARD_LOGO_BITMAP = { resizeHeight: CARD_LOGO_HEIGHT, resizeQuality: 'high' };
+const bitmapCache = new Map();  // url -> Promise<ImageBitmap>
+
+function loadBitmap(url, options) {
+    if (typeof createImageBitmap === 'undefined') return loadCached(url);
+    if (!bitmapCache.has(url)) {
+        const pending = fetch(url)
+            .then((response) => {
+                if (!response.ok) throw new Error(`Image fetch failed: ${response.status}`);
+                return response.blob();
+            })
+            .then((blob) => createImageBitmap(blob, options))
+            .catch((error) => {
+                // e.g. resize options unsupported - the <img> path still works
+                console.warn('ImageBitmap load failed, falling back to <img>:', error);
+                return loadCached(url);
+            });
+        pending.catch(() => bitmapCache.delete(url));
+        bitmapCache.set(url, pending);
+    }
+    return bitmapCache.get(url);
+}
+
+// The logo never changes, so its drawn width is worked out once
+let cardLogo = null;  // { img, width }
+
+async function loadCardLogo() {
+    if (!cardLogo) {
+        const img = await loadBitmap(CARD_LOGO_URL, CARD_LOGO_BITMAP);
+        cardLogo = { img, width: (img.width / img.height) * CARD_LOGO_HEIGHT };
+    }
+    return cardLogo;
+}
+
+// OffscreenCanvas where available: no DOM node, and convertToBlob returns a
+// Promise instead of nesting the rest of the render in a toBlob callback
+function createCardCanvas() {
+    if (typeof OffscreenCanvas !== 'undefined') return new OffscreenCanvas(1200, 630);
+    const canvas = document.createElement('canvas');
+    canvas.width = 1200;
+    canvas.height = 630;
+    return canvas;
+}
+
+// Both encoders snapshot the bitmap when called, so the canvas is free for the next render
+function encodeCardCanvas(canvas) {
+    if (canvas.convertToBlob) {
+        return canvas.convertToBlob({ type: CARD_IMAGE_TYPE, quality: CARD_IMAGE_QUALITY });
+    }
+    return new Promise((resolve) => canvas.toBlob(resolve, CARD_IMAGE_TYPE, CARD_IMAGE_QUALITY));
+}
+
+// The PROFIT / ROI labels never change, so they are part of the base card.
+// Their blurred shadows are the costliest text draws - this pays for them once.
+function drawCardLabels(ctx) {
+    ctx.textAlign = 'left';
+    ctx.shadowColor = 'rgba(0,0,0,0.8)';
+    ctx.shadowBlur = 8;
+    ctx.shadowOffsetX = 2;
+    ctx.shadowOffsetY = 2;
+    ctx.fillStyle = 'white';
+    ctx.font = '40px "Bebas Neue", Impact, Arial, sans-serif';
+    ctx.fillText('PROFIT', 50, 230);
+    ctx.fillText('ROI', 50, 450);
+}
+
+// Everything but the figures is identical for every share of a background:
+// compose it once (scaled background + dark overlay + logo + labels) and reuse it
+const baseCardCache = new Map();  // bgType -> Promise<canvas | OffscreenCanvas>
+
+async function composeBaseCard(bgType) {
+    const [bgImage, logo] = await Promise.all([
+        loadBitmap(CARD_BACKGROUND_URLS[bgType], CARD_BACKGROUND_BITMAP),
+        loadCardLogo().catch(() => {
+            console.error('Failed to load NIKEPIG logo');
+            return null;  // Card still works without logo
+        }),
+        // The labels need Bebas Neue; on failure they fall back like the figures do
+        document.fonts ? document.fonts.load('40px "Bebas Neue"').catch(() => {}) : null
+    ]);
+    const canvas = createCardCanvas();
+    const ctx = canvas.getContext('2d', { alpha: false });
+    ctx.drawImage(bgImage, 0, 0, canvas.width, canvas.height);
+    // Dark overlay for text readability
+    ctx.fillStyle = 'rgba(0,0,0,0.35)';
+    ctx.fillRect(0, 0, canvas.width, canvas.height);
+    // NIKEPIG logo (top-left, scaled)
+    if (logo) {
+        ctx.drawImage(logo.img, 50, 50, logo.width, CARD_LOGO_HEIGHT);
+    } else {
+        baseCardCache.delete(bgType);  // Use it this once, retry the logo next time
+    }
+    drawCardLabels(ctx);
+    return canvas;
+}
+
+function loadBaseCard(bgType) {
+    if (!baseCardCache.has(bgType)) {
+        const pending = composeBaseCard(bgType);
+        pending.catch(() => baseCardCache.delete(bgType));
+        baseCardCache.set(bgType, pending);
+    }
+    return baseCardCache.get(bgType);
+}
+
+// Warm the cache while the user is still choosing; real errors surface on render.
+// With the worker, the images are fetched and composed over there instead.
+function prefetchCardImages() {
+    if (CARD_WORKER_SUPPORTED) {
+        Object.keys(CARD_BACKGROUND_URLS).forEach(warmCardWorker);
+        return;
+    }
+    Object.values(CARD_BACKGROUND_URLS).forEach((url) => {
+        loadBitmap(url, CARD_BACKGROUND_BITMAP).catch(() => {});
+    });
+    loadCardLogo().catch(() => {});
+}
+
+function decodeCardBackground(bgType) {
+    if (CARD_WORKER_SUPPORTED) {
+        warmCardWorker(bgType);
+        return;
+    }
+    loadBaseCard(bgType).catch(() => {});
+}
+
+// ---- Off-main-thread card rendering (OffscreenCanvas in a Worker) ----
+const CARD_WORKER_SUPPORTED = typeof Worker !== 'undefined'
+    && typeof OffscreenCanvas !== 'undefined'
+    && typeof createImageBitmap !== 'undefined';
+let cardWorker = null;
+let cardJobId = 0;
+const cardJobs = new Map();
+
+function getCardWorker() {
+    if (!cardWorker) {
+        cardWorker = new Worker('/static/card-worker.js');
+        cardWorker.onmessage = (event) => {
+            const { id, blob, error } = event.data;
+            const job = cardJobs.get(id);
+            if (!job) return;
+            cardJobs.delete(id);
+            error ? job.reject(new Error(error)) : job.resolve(blob);
+        };
+    }
+    return cardWorker;
+}
+
+// The worker loads and caches the images itself; only the text and URLs cross over
+function warmCardWorker(bgType) {
+    getCardWorker().postMessage({ warm: CARD_BACKGROUND_URLS[bgType], logo: CARD_LOGO_URL });
+}
+
+function renderCardInWorker(bgType, card) {
+    const id = ++cardJobId;
+    return new Promise((resolve, reject) => {
+        cardJobs.set(id, { resolve, reject });
+        getCardWorker().postMessage({
+            id,
+            profit: card.profit,
+            roi: card.roi,
+            profitColor: card.profitColor,
+            roiColor: card.roiColor,
+            periodLabel: card.periodLabel,
+            type: CARD_IMAGE_TYPE,
+            quality: CARD_IMAGE_QUALITY,
+            background: CARD_BACKGROUND_URLS[bgType],
+            logo: CARD_LOGO_URL
+        });
+    });
+}
+
+// One backing store for every main-thread render; the card is always opaque
+let sharedCardCanvas = null;
+let sharedCardCtx = null;
+
+function renderCardOnMainThread(card) {
+    if (!sharedCardCanvas) {
+        sharedCardCanvas = createCardCanvas();
+        sharedCardCtx = sharedCardCanvas.getContext('2d', { alpha: false });
+        // Shared by every text draw; set once, save/restore below keeps them
+        sharedCardCtx.textAlign = 'left';
+        sharedCardCtx.shadowColor = 'rgba(0,0,0,0.8)';
+    }
+    // The background covers every pixel; save/restore just drops the last render's shadow state
+    sharedCardCtx.save();
+    drawPerformanceCard(sharedCardCtx, card);
+    sharedCardCtx.restore();
+    return encodeCardCanvas(sharedCardCanvas);
+}
+
+// Sharing the same figures on the same background again reuses the last encode
+const RENDERED_CARD_CACHE_MAX = 4;
+const renderedCardCache = new Map();  // card key -> Promise<Blob>
+const renderedCardBlobs = new WeakMap();  // those promises -> Blob, once resolved
+
+// Resolves to the encoded card; rejects only if the background can't be loaded
+function renderPerformanceCard({ profit, roi, profitValue, roiValue }, periodLabel) {
+    const bgType = selectedBackground;
+    const profitColor = profitValue >= 0 ? '#00FF88' : '#FF4444';
+    const roiColor = roiValue >= 0 ? '#00FF88' : '#FF4444';
+    const card = { profit, roi, profitColor, roiColor, periodLabel };
+
+    const key = [bgType, profit, roi, profitColor, roiColor, periodLabel].join('|');
+    if (!renderedCardCache.has(key)) {
+        const pending = encodePerformanceCard(bgType, card);
+        pending.then((blob) => renderedCardBlobs.set(pending, blob), () => renderedCardCache.delete(key));
+        renderedCardCache.set(key, pending);
+        if (renderedCardCache.size > RENDERED_CARD_CACHE_MAX) {
+            renderedCardCache.delete(renderedCardCache.keys().next().value);
+        }
+    }
+    return renderedCardCache.get(key);
+}
+
+async function encodePerformanceCard(bgType, card) {
+    if (CARD_WORKER_SUPPORTED) {
+        try {
+            return await renderCardInWorker(bgType, card);
+        } catch (error) {
+            console.warn('Card worker failed, drawing on main thread:', error);
+        }
+    }
+    const base = await loadBaseCard(bgType);
+    return renderCardOnMainThread({ ...card, base });
+}
+
+// Card layout for the main-thread fallback (static/card-worker.js mirrors it)
+function drawPerformanceCard(ctx, { base, profit, roi, profitColor, roiColor, periodLabel }) {
+    // Background, overlay, logo and labels, composed once by loadBaseCard()
+    ctx.drawImage(base, 0, 0);
+
+    // Text grouped by style; textAlign and shadowColor are set when the context is created
+
+    // Period line (soft shadow, like the labels)
+    ctx.fillStyle = 'white';
+    ctx.shadowBlur = 8;
+    ctx.shadowOffsetX = 2;
+    ctx.shadowOffsetY = 2;
+    ctx.font = '32px Arial, sans-serif';
+    ctx.fillText(`over ${periodLabel}`, 50, 580);
+
+    // Big numbers (heavier shadow)
+    ctx.shadowOffsetX = 3;
+    ctx.shadowOffsetY = 3;
+    ctx.fillStyle = profitColor;
+    ctx.shadowBlur = 15;
+    ctx.font = 'bold 140px "Bebas Neue", Impact, Arial, sans-serif';
+    ctx.fillText(profit, 50, 360);
+    ctx.fillStyle = roiColor;
+    ctx.shadowBlur = 12;
+    ctx.font = 'bold 100px "Bebas Neue", Impact, Arial, sans-serif';
+    ctx.fillText(roi, 50, 540);
+}
+
+
+// The selector markup lives in a <template>; stamp it into the page on first use
+function getBackgroundSelector() {
+    const template = document.getElementById('bg-selector-template');
+    if (template) {
+        template.replaceWith(template.content.cloneNode(true));
+        selectedBgEl = document.querySelector('.bg-option.selected');
+    }
+    return document.getElementById('background-selector');
+}
+
+function toggleBackgroundSelector() {
+    const selector = getBackgroundSelector();
+    selector.style.display = selector.style.display === 'none' ? 'block' : 'none';
+}
+
+function showBackgroundSelectorForDownload() {
+    prefetchCardImages();
+    selectorMode = 'download';
+    getBackgroundSelector();
+    const btn = document.getElementById('selector-action-btn');
+    btn.textContent = '✅ Download Image';
+    btn.style.background = '#10b981';
+    toggleBackgroundSelector();
+}
+
+function showBackgroundSelectorForTwitter() {
+    prefetchCardImages();
+    selectorMode = 'twitter';
+    getBackgroundSelector();
+    const btn = document.getElementById('selector-action-btn');
+    btn.textContent = '𝕏 Share to Twitter';
+    btn.style.background = '#1da1f2';
+    toggleBackgroundSelector();
+    prerenderShareCard();
+}
+
+function handleSelectorAction() {
+    if (selectorMode === 'twitter') {
+        shareToTwitter();
+    } else {
+        downloadPerformanceCard();
+    }
+}
+
+let selectedBgEl = null;  // Set when the selector is first stamped out
+
+function selectBackground(bgType) {
+    selectedBackground = bgType;
+
+    // Update visual selection - move the highlight class to the chosen background
+    if (selectedBgEl) selectedBgEl.classList.remove('selected');
+    selectedBgEl = document.querySelector(`[data-bg="${bgType}"]`);
+    selectedBgEl.classList.add('selected');
+    if (selectorMode === 'twitter') prerenderShareCard();
+}
+
+function downloadPerformanceCard() {
+    const card = readPerformanceCardData();
+    if (!card) {
+        toggleBackgroundSelector();
+        return;
+    }
+    const { period } = card;
+
+    renderPerformanceCard(card, PERIOD_LABELS[period]).then((blob) => {
+        downloadBlob(blob, `nikepig-massive-rocket-${period}-performance.${CARD_IMAGE_EXTENSION}`);
+
+        // Hide selector after download
+        getBackgroundSelector().style.display = 'none';
+    }).catch(() => {
+        console.error('Failed to load background image');
+        alert('Failed to load background image. Please try again in a moment.');
+    });
+}
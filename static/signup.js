@@ -0,0 +1,126 @@
+// ==================== SIGNUP PAGE SCRIPT ====================
+// Served from /static with a content-hash query string and cached as
+// immutable, like dashboard.js.
+
+function toggleSafetySection() {
+    const header = document.querySelector('.safety-header');
+    const grid = document.getElementById('safetyGrid');
+    header.classList.toggle('collapsed');
+    grid.classList.toggle('hidden');
+}
+
+function toggleBacktestSection() {
+    const grid = document.getElementById('backtestGrid');
+    const toggle = document.getElementById('backtestToggle');
+    const disclaimer = grid.nextElementSibling;
+    if (grid.style.display === 'none') {
+        grid.style.display = 'grid';
+        disclaimer.style.display = 'block';
+        toggle.textContent = '▼';
+    } else {
+        grid.style.display = 'none';
+        disclaimer.style.display = 'none';
+        toggle.textContent = '▶';
+    }
+}
+
+async function signup() {
+    const email = document.getElementById('email').value;
+    const btn = document.querySelector('.btn');
+    const btnText = document.getElementById('btn-text');
+    const btnLoading = document.getElementById('btn-loading');
+    const errorMessage = document.getElementById('error-message');
+    const resultSection = document.getElementById('result-section');
+
+    // Validate email
+    if (!email || !email.includes('@')) {
+        errorMessage.textContent = 'Please enter a valid email address';
+        errorMessage.classList.add('show');
+        return;
+    }
+
+    // Hide error, show loading
+    errorMessage.classList.remove('show');
+    btn.disabled = true;
+    btnText.style.display = 'none';
+    btnLoading.style.display = 'inline-block';
+
+    try {
+        // Call API
+        const response = await fetch('/api/users/register', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ email: email })
+        });
+
+        const data = await response.json();
+
+        if (response.ok && data.status === 'success') {
+            // NEW USER - API key sent via email (SECURE!)
+            resultSection.innerHTML = `
+                <h3>✅ Check Your Email!</h3>
+                <p style="color: #666; margin: 15px 0;">
+                    We've sent your API key and setup instructions to:
+                </p>
+                <div class="email-highlight">${email}</div>
+
+                <div class="info-box">
+                    <p>
+                        📧 <strong>Check your inbox</strong> for an email from Nike Rocket with your API key and a link to set up your trading agent.
+                    </p>
+                </div>
+
+                <p style="font-size: 14px; color: #666; text-align: center; margin-top: 20px;">
+                    Don't see the email? Check your spam folder or wait a minute and try again.
+                </p>
+            `;
+            resultSection.classList.add('show');
+            document.querySelector('.form-section').style.display = 'none';
+
+        } else if (response.status === 400 && data.detail === 'Email already registered') {
+            // EXISTING USER - API key resent via email (SECURE!)
+            resultSection.innerHTML = `
+                <h3>✅ API Key Sent to Your Email!</h3>
+                <p style="color: #666; margin: 15px 0;">
+                    Your account already exists! We've sent your API key to:
+                </p>
+                <div class="email-highlight">${email}</div>
+
+                <div class="info-box">
+                    <p>
+                        📧 <strong>Check your inbox</strong> for an email with your API key and setup instructions.
+                    </p>
+                </div>
+
+                <p style="font-size: 14px; color: #666; text-align: center; margin-top: 20px;">
+                    Don't see the email? Check your spam folder or contact support.
+                </p>
+            `;
+            resultSection.classList.add('show');
+            document.querySelector('.form-section').style.display = 'none';
+
+        } else {
+            // Show error
+            errorMessage.textContent = data.detail || data.message || 'Signup failed. Please try again.';
+            errorMessage.classList.add('show');
+        }
+    } catch (error) {
+        console.error('Signup error:', error);
+        errorMessage.textContent = 'Network error. Please check your connection and try again.';
+        errorMessage.classList.add('show');
+    } finally {
+        // Reset button
+        btn.disabled = false;
+        btnText.style.display = 'inline';
+        btnLoading.style.display = 'none';
+    }
+}
+
+// Allow Enter key to submit
+document.getElementById('email').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        signup();
+    }
+});
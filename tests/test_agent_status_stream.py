@@ -0,0 +1,129 @@
+"""
+Agent Status Stream Tests
+=========================
+
+Tests for the dashboard's Server-Sent Events feed (/api/agent-status/stream).
+The database read is patched out, so no database is needed.
+
+Run with: pytest tests/test_agent_status_stream.py -v
+"""
+
+import os
+import sys
+import threading
+import pytest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import follower_endpoints
+
+
+CONFIGURED_IDLE = {"agent_configured": True, "agent_active": False, "email": "test@nikerocket.test"}
+CONFIGURED_ACTIVE = {"agent_configured": True, "agent_active": True, "email": "test@nikerocket.test"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_status_events():
+    """Each test runs on its own event loop - don't reuse another loop's Events"""
+    follower_endpoints._agent_status_events.clear()
+    follower_endpoints._agent_status_streams.clear()
+    yield
+    follower_endpoints._agent_status_events.clear()
+    follower_endpoints._agent_status_streams.clear()
+
+
+class FakeRequest:
+    """Just enough of a Request for the stream: never disconnects"""
+
+    async def is_disconnected(self):
+        return False
+
+
+class TestAgentStatusStream:
+    """The stream authenticates, then re-reads the status off the event loop"""
+
+    async def test_unknown_key_is_rejected(self):
+        with patch.object(follower_endpoints, "_load_agent_status", return_value=None):
+            with pytest.raises(HTTPException) as exc_info:
+                await follower_endpoints.stream_agent_status(FakeRequest(), key="nk_unknown")
+        assert exc_info.value.status_code == 401
+
+    async def test_sends_status_then_keep_alive_then_changes(self):
+        statuses = iter([CONFIGURED_IDLE, CONFIGURED_IDLE, CONFIGURED_ACTIVE])
+        load_threads = []
+
+        def load(api_key):
+            load_threads.append(threading.current_thread())
+            return next(statuses)
+
+        with patch.object(follower_endpoints, "_load_agent_status", side_effect=load), \
+             patch.object(follower_endpoints, "AGENT_STATUS_STREAM_RECHECK_SECONDS", 0.01):
+            response = await follower_endpoints.stream_agent_status(FakeRequest(), key="nk_test")
+            stream = response.body_iterator
+            try:
+                first = await stream.__anext__()
+                second = await stream.__anext__()
+                third = await stream.__anext__()
+            finally:
+                await stream.aclose()
+
+        assert first.startswith(b"data: ") and b'"agent_active":false' in first
+        assert second == b": keep-alive\n\n"
+        assert third.startswith(b"data: ") and b'"agent_active":true' in third
+        # Every read ran in a worker thread, never on the event loop
+        assert load_threads and threading.main_thread() not in load_threads
+
+    async def test_stream_ends_when_user_disappears(self):
+        statuses = iter([CONFIGURED_IDLE, None])
+
+        with patch.object(follower_endpoints, "_load_agent_status", side_effect=lambda key: next(statuses)), \
+             patch.object(follower_endpoints, "AGENT_STATUS_STREAM_RECHECK_SECONDS", 0.01):
+            response = await follower_endpoints.stream_agent_status(FakeRequest(), key="nk_test")
+            chunks = [chunk async for chunk in response.body_iterator]
+
+        assert len(chunks) == 1 and chunks[0].startswith(b"data: ")
+
+    async def test_response_is_not_marked_as_encoded(self):
+        with patch.object(follower_endpoints, "_load_agent_status", return_value=CONFIGURED_IDLE):
+            response = await follower_endpoints.stream_agent_status(FakeRequest(), key="nk_test")
+
+        assert "content-encoding" not in response.headers
+        assert response.media_type == "text/event-stream"
+
+
+class TestAgentStatusStreamCleanup:
+    """A key's Event is dropped once its last stream closes"""
+
+    async def open_stream(self, key):
+        response = await follower_endpoints.stream_agent_status(FakeRequest(), key=key)
+        stream = response.body_iterator
+        await stream.__anext__()
+        return stream
+
+    async def test_closed_stream_leaves_nothing_behind(self):
+        with patch.object(follower_endpoints, "_load_agent_status", return_value=CONFIGURED_IDLE):
+            stream = await self.open_stream("nk_test")
+            assert "nk_test" in follower_endpoints._agent_status_events
+            await stream.aclose()
+
+        assert not follower_endpoints._agent_status_events
+        assert not follower_endpoints._agent_status_streams
+
+    async def test_other_stream_for_the_key_keeps_its_event(self):
+        with patch.object(follower_endpoints, "_load_agent_status", return_value=CONFIGURED_IDLE):
+            first = await self.open_stream("nk_test")
+            second = await self.open_stream("nk_test")
+            await first.aclose()
+
+            # The remaining stream is still woken by a change
+            event = follower_endpoints._agent_status_events["nk_test"]
+            follower_endpoints.notify_agent_status_changed("nk_test")
+            assert event.is_set()
+
+            await second.aclose()
+
+        assert not follower_endpoints._agent_status_events
+        assert not follower_endpoints._agent_status_streams
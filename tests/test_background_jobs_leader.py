@@ -0,0 +1,115 @@
+"""
+Background Jobs Leader Tests
+============================
+
+The trading loop, position monitor and schedulers must run in exactly one
+worker: the one holding a Postgres advisory lock. These tests drive the
+leader logic in main.py with fake connections, so no database is needed.
+
+Run with: pytest tests/test_background_jobs_leader.py -v
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+class FakeLockConnection:
+    """asyncpg connection stand-in: grants (or refuses) the lock, then answers N pings"""
+
+    def __init__(self, grants_lock=True, pings_before_failure=None):
+        self.grants_lock = grants_lock
+        self.pings_left = pings_before_failure
+        self.closed = False
+
+    async def fetchval(self, query, *args):
+        if "pg_try_advisory_lock" in query:
+            return self.grants_lock
+        if self.pings_left is not None:
+            if self.pings_left == 0:
+                raise ConnectionResetError("connection lost")
+            self.pings_left -= 1
+        return 1
+
+    async def close(self):
+        self.closed = True
+
+    def terminate(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fast_timings():
+    with patch.object(main, "BACKGROUND_JOBS_RETRY_SECONDS", 0.01), \
+         patch.object(main, "BACKGROUND_JOBS_LOCK_CHECK_SECONDS", 0.01), \
+         patch.object(main, "BACKGROUND_JOBS_LOCK_CHECK_TIMEOUT", 0.5):
+        yield
+
+
+def fake_jobs(started):
+    """_start_background_jobs stand-in: one long-running task per call, recorded in `started`"""
+    def start(db_pool):
+        job = asyncio.ensure_future(asyncio.sleep(3600))
+        started.append(job)
+        return [job]
+    return start
+
+
+async def wait_until(condition, timeout=2):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+class TestBackgroundJobsLeader:
+    """Jobs run only while the lock connection is alive"""
+
+    async def test_jobs_wait_for_the_lock(self, fast_timings):
+        connections = [FakeLockConnection(grants_lock=False), FakeLockConnection(grants_lock=False), FakeLockConnection()]
+        started = []
+
+        async def connect(url):
+            return connections.pop(0)
+
+        with patch.object(main.asyncpg, "connect", side_effect=connect), \
+             patch.object(main, "_start_background_jobs", side_effect=fake_jobs(started)):
+            leader = asyncio.create_task(main._run_background_jobs_when_leader(None))
+            await wait_until(lambda: started)
+            assert not connections  # Refused twice, got it on the third try
+            leader.cancel()
+            await asyncio.wait([leader])
+
+        assert started[0].cancelled()
+
+    async def test_lost_lock_connection_stops_jobs_and_reacquires(self, fast_timings):
+        first = FakeLockConnection(pings_before_failure=2)
+        second = FakeLockConnection()
+        connections = [first, second]
+        started = []
+
+        async def connect(url):
+            return connections.pop(0)
+
+        with patch.object(main.asyncpg, "connect", side_effect=connect), \
+             patch.object(main, "_start_background_jobs", side_effect=fake_jobs(started)):
+            leader = asyncio.create_task(main._run_background_jobs_when_leader(None))
+            await wait_until(lambda: len(started) == 2)
+
+            # The first jobs were stopped before the second set started
+            assert started[0].cancelled()
+            assert first.closed
+            assert not started[1].done()
+
+            leader.cancel()
+            await asyncio.wait([leader])
+
+        # Shutdown stops the jobs and gives the lock back
+        assert started[1].cancelled()
+        assert second.closed
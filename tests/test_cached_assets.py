@@ -0,0 +1,175 @@
+"""
+Cached Asset Tests
+==================
+
+Tests for picking the precompressed variant of a cached page or /static file
+from the request's Accept-Encoding header, for keeping per-request gzip off
+those assets, and for the year-long caching of versioned /static URLs.
+
+Run with: pytest tests/test_cached_assets.py -v
+"""
+
+import os
+import sys
+
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import ApiGZipMiddleware, _cached_asset, _cached_asset_response, _negotiate_encoding
+
+
+BR_AND_GZIP = ("br", "gzip")
+
+
+class TestNegotiateEncoding:
+    """First available encoding the client accepts, br preferred over gzip"""
+
+    def test_browser_header_prefers_brotli(self):
+        assert _negotiate_encoding("gzip, deflate, br, zstd", BR_AND_GZIP) == "br"
+
+    def test_falls_back_to_gzip(self):
+        assert _negotiate_encoding("gzip, deflate", BR_AND_GZIP) == "gzip"
+
+    def test_no_header_means_plain(self):
+        assert _negotiate_encoding("", BR_AND_GZIP) is None
+        assert _negotiate_encoding("identity", BR_AND_GZIP) is None
+
+    def test_nothing_precompressed_means_plain(self):
+        assert _negotiate_encoding("gzip, br", ()) is None
+
+    def test_coding_names_are_case_insensitive(self):
+        assert _negotiate_encoding("GZIP", BR_AND_GZIP) == "gzip"
+
+    def test_q_zero_refuses_a_coding(self):
+        assert _negotiate_encoding("br;q=0, gzip", BR_AND_GZIP) == "gzip"
+        assert _negotiate_encoding("br;q=0.0, gzip;q=0", BR_AND_GZIP) is None
+        assert _negotiate_encoding("br ; q = 0, gzip", BR_AND_GZIP) == "gzip"
+
+    def test_nonzero_q_still_accepts(self):
+        assert _negotiate_encoding("br;q=0.1, gzip;q=1.0", BR_AND_GZIP) == "br"
+
+    def test_wildcard_accepts_anything_not_refused(self):
+        assert _negotiate_encoding("*", BR_AND_GZIP) == "br"
+        assert _negotiate_encoding("br;q=0, *", BR_AND_GZIP) == "gzip"
+
+    def test_refused_wildcard_leaves_only_named_codings(self):
+        assert _negotiate_encoding("*;q=0", BR_AND_GZIP) is None
+        assert _negotiate_encoding("gzip, *;q=0", BR_AND_GZIP) == "gzip"
+
+    def test_unparseable_q_is_treated_as_refused(self):
+        assert _negotiate_encoding("br;q=high, gzip", BR_AND_GZIP) == "gzip"
+        assert _negotiate_encoding("gzip;q=", BR_AND_GZIP) is None
+
+
+LARGE_JSON = b'{"values": [' + b"1, " * 1000 + b'1]}'
+IMAGE = _cached_asset(b"\x89PNG" + bytes(range(256)) * 8, media_type="image/png", compress=False)
+TEXT = _cached_asset(b"body { color: red; }\n" * 200, media_type="text/css")
+
+
+def make_client():
+    async def api(request):
+        return Response(LARGE_JSON, media_type="application/json")
+
+    async def image(request):
+        return _cached_asset_response(request, IMAGE)
+
+    async def text(request):
+        return _cached_asset_response(request, TEXT)
+
+    async def stream(request):
+        async def events():
+            yield b"data: {}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app = Starlette(routes=[
+        Route("/api/data", api),
+        Route("/api/stream", stream),
+        Route("/static/logo.png", image),
+        Route("/static/style.css", text),
+    ])
+    app.add_middleware(ApiGZipMiddleware, minimum_size=1024, compresslevel=6)
+    return TestClient(app)
+
+
+class TestCachedAssetEncoding:
+    """Assets go out as stored: pre-compressed variants, or plain bytes with no Content-Encoding"""
+
+    def test_image_is_sent_as_is(self):
+        response = make_client().get("/static/logo.png", headers={"Accept-Encoding": "gzip, br"})
+
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+        assert response.content == IMAGE.content
+        assert response.headers["etag"] == IMAGE.etag
+
+    def test_text_gets_its_precompressed_variant(self):
+        response = make_client().get("/static/style.css", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == TEXT.compressed_etags["gzip"]
+        assert response.content == TEXT.content
+
+    def test_plain_text_has_no_content_encoding(self):
+        response = make_client().get("/static/style.css", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == TEXT.etag
+
+
+class TestApiGZipMiddleware:
+    """Per-request gzip is for /api/ responses only"""
+
+    def test_api_json_is_gzipped(self):
+        response = make_client().get("/api/data", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == LARGE_JSON
+
+    def test_event_stream_is_not_gzipped(self):
+        response = make_client().get(
+            "/api/stream",
+            headers={"Accept-Encoding": "gzip", "Accept": "text/event-stream"},
+        )
+
+        assert "content-encoding" not in response.headers
+        assert response.content == b"data: {}\n\n"
+
+
+class FakeRequest:
+    """Just enough of a Request for the /static handler"""
+
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+class TestVersionedStaticFiles:
+    """Only ?v=<the file's own content hash> is cached as immutable"""
+
+    async def static_cache_control(self, filename, v):
+        response = await main.get_static_file(FakeRequest(), filename, v=v)
+        return response.headers["cache-control"]
+
+    async def test_current_hash_is_immutable(self):
+        version = main._static_file_version("dashboard.js")
+
+        assert await self.static_cache_control("dashboard.js", version) == main.STATIC_IMMUTABLE_CACHE_CONTROL
+
+    async def test_stale_or_made_up_version_revalidates(self):
+        other_file_version = main._static_file_version("dashboard.css")
+
+        for v in ("deadbeef0000", other_file_version, "dev", ""):
+            assert await self.static_cache_control("dashboard.js", v) == main.STATIC_REVALIDATE_CACHE_CONTROL
+
+    async def test_unversioned_url_revalidates(self):
+        assert await self.static_cache_control("dashboard.js", None) == main.STATIC_REVALIDATE_CACHE_CONTROL
+
+    def test_pages_link_current_versions(self):
+        html = main.DASHBOARD_PAGE.content.decode()
+
+        for name in ("dashboard.js", "dashboard.css", "share-card.js", "bg-charles.jpg"):
+            assert f"/static/{name}?v={main._static_file_version(name)}" in html
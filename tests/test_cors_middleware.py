@@ -0,0 +1,134 @@
+"""
+CORS Middleware Tests
+=====================
+
+AllowAllCORSMiddleware replaced Starlette's CORSMiddleware configured with
+allow_origins=["*"], allow_credentials=True, allow_methods=["*"] and
+allow_headers=["*"]. These tests send the same requests through both and
+check that /api/ responses carry the same CORS headers.
+
+Run with: pytest tests/test_cors_middleware.py -v
+"""
+
+import os
+import sys
+import pytest
+
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import AllowAllCORSMiddleware
+
+
+ORIGIN = "https://dashboard.example.com"
+
+
+async def ping(request):
+    return PlainTextResponse("pong")
+
+
+def make_client(middleware, **options):
+    app = Starlette(routes=[Route("/api/ping", ping), Route("/page", ping)])
+    app.add_middleware(middleware, **options)
+    return TestClient(app)
+
+
+@pytest.fixture
+def ours():
+    return make_client(AllowAllCORSMiddleware)
+
+
+@pytest.fixture
+def starlette():
+    return make_client(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+def cors_headers(response):
+    """The headers a browser's CORS check looks at, by lower-cased name"""
+    return {
+        name: value
+        for name, value in response.headers.items()
+        if name.startswith("access-control-") or name == "vary"
+    }
+
+
+class TestMatchesStarletteCORS:
+    """/api/ responses carry the same CORS headers as the old configuration"""
+
+    def test_preflight(self, ours, starlette):
+        headers = {
+            "Origin": ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "X-API-Key, Content-Type",
+        }
+        expected = starlette.options("/api/ping", headers=headers)
+        response = ours.options("/api/ping", headers=headers)
+
+        assert response.status_code == expected.status_code == 200
+        assert response.text == expected.text == "OK"
+        assert cors_headers(response) == cors_headers(expected)
+        assert response.headers["access-control-allow-origin"] == ORIGIN
+        assert response.headers["access-control-allow-headers"] == "X-API-Key, Content-Type"
+
+    def test_preflight_without_requested_headers(self, ours, starlette):
+        headers = {"Origin": ORIGIN, "Access-Control-Request-Method": "GET"}
+        expected = starlette.options("/api/ping", headers=headers)
+        response = ours.options("/api/ping", headers=headers)
+
+        assert response.status_code == expected.status_code == 200
+        assert cors_headers(response) == cors_headers(expected)
+        assert "access-control-allow-headers" not in response.headers
+
+    def test_simple_request(self, ours, starlette):
+        expected = starlette.get("/api/ping", headers={"Origin": ORIGIN})
+        response = ours.get("/api/ping", headers={"Origin": ORIGIN})
+
+        assert response.text == expected.text == "pong"
+        assert cors_headers(response) == cors_headers(expected)
+        assert response.headers["access-control-allow-origin"] == "*"
+
+    def test_request_with_cookies_gets_explicit_origin(self, ours, starlette):
+        headers = {"Origin": ORIGIN, "Cookie": "session=abc"}
+        expected = starlette.get("/api/ping", headers=headers)
+        response = ours.get("/api/ping", headers=headers)
+
+        assert cors_headers(response) == cors_headers(expected)
+        assert response.headers["access-control-allow-origin"] == ORIGIN
+        assert response.headers["vary"] == "Origin"
+
+    def test_same_origin_request_is_untouched(self, ours, starlette):
+        expected = starlette.get("/api/ping")
+        response = ours.get("/api/ping")
+
+        assert cors_headers(response) == cors_headers(expected) == {}
+
+
+class TestCORSScope:
+    """Only /api/ is called cross-origin - everything else skips CORS"""
+
+    def test_non_api_path_gets_no_cors_headers(self, ours):
+        response = ours.get("/page", headers={"Origin": ORIGIN})
+
+        assert response.text == "pong"
+        assert cors_headers(response) == {}
+
+    def test_non_api_preflight_reaches_the_app(self, ours):
+        response = ours.options(
+            "/page",
+            headers={"Origin": ORIGIN, "Access-Control-Request-Method": "POST"},
+        )
+
+        # No route handles OPTIONS here, so no CORS approval either
+        assert response.status_code == 405
+        assert cors_headers(response) == {}
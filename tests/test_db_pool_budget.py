@@ -0,0 +1,67 @@
+"""
+Database Connection Budget Tests
+================================
+
+Every worker process opens its own SQLAlchemy and asyncpg pools plus an
+advisory-lock connection. These tests check that the sizes derived from
+DB_MAX_CONNECTIONS and WEB_CONCURRENCY stay within the budget.
+
+Run with: pytest tests/test_db_pool_budget.py -v
+"""
+
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import follower_models
+from follower_models import _db_connection_budget
+
+
+def connections_per_worker(max_connections, workers):
+    asyncpg_max, pool_size, max_overflow = _db_connection_budget(max_connections, workers)
+    return asyncpg_max + pool_size + max_overflow + 1  # + advisory-lock connection
+
+
+class TestConnectionBudget:
+    """All workers' pools together fit in DB_MAX_CONNECTIONS"""
+
+    @pytest.mark.parametrize("workers", [1, 2, 3, 4, 6, 8])
+    def test_all_workers_fit_the_default_budget(self, workers):
+        assert connections_per_worker(80, workers) * workers <= 80
+
+    def test_three_workers_stay_under_postgres_default(self):
+        # The old fixed sizes (20 + 10 + 10 + 1 per worker) passed 100 at three workers
+        assert connections_per_worker(80, 3) * 3 < 100
+
+    def test_single_worker_keeps_the_full_sizes(self):
+        assert _db_connection_budget(80, 1) == (10, 20, 10)
+
+    def test_every_pool_gets_at_least_one_connection(self):
+        asyncpg_max, pool_size, max_overflow = _db_connection_budget(10, 50)
+
+        assert asyncpg_max >= 1 and pool_size >= 1 and max_overflow >= 0
+
+
+class TestWarmEnginePool:
+    """Startup opens only a few connections, not the whole pool"""
+
+    def test_opens_at_most_the_warm_count(self):
+        engine = MagicMock()
+        engine.pool.size.return_value = 20
+
+        with patch.object(follower_models, "DB_POOL_WARM_CONNECTIONS", 3):
+            warmed = follower_models.warm_engine_pool(engine)
+
+        assert warmed == 3
+        assert engine.connect.call_count == 3
+        assert engine.connect.return_value.close.call_count == 3  # Back to the pool
+
+    def test_small_pool_is_not_overfilled(self):
+        engine = MagicMock()
+        engine.pool.size.return_value = 2
+
+        with patch.object(follower_models, "DB_POOL_WARM_CONNECTIONS", 3):
+            assert follower_models.warm_engine_pool(engine) == 2
@@ -0,0 +1,53 @@
+"""
+HTTP Utilities Tests
+====================
+
+Tests for If-None-Match matching (weak comparison, per RFC 9110), used by
+the cached pages and the portfolio endpoints.
+
+Run with: pytest tests/test_http_utils.py -v
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_utils import etag_matches
+
+
+STRONG = '"abc123"'
+WEAK = 'W/"abc123"'
+
+
+class TestEtagMatches:
+    """A 304 is sent whenever If-None-Match names the current ETag"""
+
+    def test_missing_header_never_matches(self):
+        assert not etag_matches(None, STRONG)
+        assert not etag_matches("", STRONG)
+
+    def test_exact_echo_matches(self):
+        assert etag_matches(STRONG, STRONG)
+        assert etag_matches(WEAK, WEAK)
+
+    def test_weak_and_strong_forms_match_each_other(self):
+        # A CDN that re-compresses the body hands out W/ versions of our ETag
+        assert etag_matches(WEAK, STRONG)
+        assert etag_matches(STRONG, WEAK)
+
+    def test_different_etag_does_not_match(self):
+        assert not etag_matches('"other"', STRONG)
+        assert not etag_matches('W/"other"', WEAK)
+
+    def test_list_matches_if_any_entry_does(self):
+        assert etag_matches('"old", W/"abc123"', STRONG)
+        assert etag_matches('"old",' + STRONG, STRONG)
+        assert not etag_matches('"old", "older"', STRONG)
+
+    def test_wildcard_matches_anything(self):
+        assert etag_matches("*", STRONG)
+        assert etag_matches('"old", *', WEAK)
+
+    def test_quotes_are_part_of_the_tag(self):
+        assert not etag_matches("abc123", STRONG)
@@ -0,0 +1,196 @@
+"""
+Portfolio Stats Cache Tests
+===========================
+
+Tests for /api/portfolio/stats response caching and the shared in-flight
+calculation. The calculation itself is patched out, so no database is needed.
+
+Run with: pytest tests/test_portfolio_stats_cache.py -v
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import portfolio_api
+
+
+SUCCESS_STATS = {"status": "success", "total_profit": 123.45}
+NO_DATA_STATS = {"status": "no_data", "message": "Portfolio not initialized"}
+
+
+class FakeRequest:
+    """Just enough of a Request for the stats endpoint"""
+
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+def stats_request(period, api_key="nk_test", headers=None):
+    """Call the endpoint directly, as FastAPI would for ?key=<api_key>&period=<period>"""
+    return portfolio_api.get_portfolio_stats(FakeRequest(headers), period=period, key=api_key, x_api_key=None)
+
+
+@pytest.fixture(autouse=True)
+def empty_stats_cache():
+    portfolio_api._portfolio_stats_cache.clear()
+    portfolio_api._portfolio_stats_inflight.clear()
+    yield
+    portfolio_api._portfolio_stats_cache.clear()
+    portfolio_api._portfolio_stats_inflight.clear()
+
+
+class TestStatsCache:
+    """Per-worker cache of encoded stats bodies"""
+
+    def test_hit_until_ttl_expires(self):
+        with patch.object(portfolio_api.time, "monotonic", return_value=1000.0):
+            portfolio_api.set_cached_portfolio_stats("nk_test", "30d", b"body")
+            assert portfolio_api.get_cached_portfolio_stats("nk_test", "30d") == b"body"
+
+        expiry = 1000.0 + portfolio_api.PORTFOLIO_STATS_CACHE_TTL
+        with patch.object(portfolio_api.time, "monotonic", return_value=expiry - 0.1):
+            assert portfolio_api.get_cached_portfolio_stats("nk_test", "30d") == b"body"
+        with patch.object(portfolio_api.time, "monotonic", return_value=expiry):
+            assert portfolio_api.get_cached_portfolio_stats("nk_test", "30d") is None
+
+    def test_miss_for_other_period_or_user(self):
+        portfolio_api.set_cached_portfolio_stats("nk_test", "30d", b"body")
+
+        assert portfolio_api.get_cached_portfolio_stats("nk_test", "7d") is None
+        assert portfolio_api.get_cached_portfolio_stats("nk_other", "30d") is None
+
+    def test_raw_api_keys_are_not_stored(self):
+        portfolio_api.set_cached_portfolio_stats("nk_test", "30d", b"body")
+
+        assert "nk_test" not in portfolio_api._portfolio_stats_cache
+        assert b"nk_test" not in portfolio_api._portfolio_stats_cache
+
+    def test_invalidate_drops_every_period_for_that_user_only(self):
+        for period in ("7d", "30d"):
+            portfolio_api.set_cached_portfolio_stats("nk_test", period, b"body")
+        portfolio_api.set_cached_portfolio_stats("nk_other", "30d", b"other")
+
+        portfolio_api.invalidate_portfolio_stats_cache("nk_test")
+
+        assert portfolio_api.get_cached_portfolio_stats("nk_test", "7d") is None
+        assert portfolio_api.get_cached_portfolio_stats("nk_test", "30d") is None
+        assert portfolio_api.get_cached_portfolio_stats("nk_other", "30d") == b"other"
+
+    def test_full_cache_evicts_the_oldest_user(self):
+        with patch.object(portfolio_api, "PORTFOLIO_STATS_CACHE_MAX_USERS", 3):
+            for user in ("nk_1", "nk_2", "nk_3"):
+                portfolio_api.set_cached_portfolio_stats(user, "30d", user.encode())
+            # Another period for a cached user doesn't count as a new user
+            portfolio_api.set_cached_portfolio_stats("nk_1", "7d", b"nk_1")
+            assert len(portfolio_api._portfolio_stats_cache) == 3
+
+            portfolio_api.set_cached_portfolio_stats("nk_4", "30d", b"nk_4")
+
+        assert len(portfolio_api._portfolio_stats_cache) == 3
+        assert portfolio_api.get_cached_portfolio_stats("nk_1", "30d") is None
+        assert portfolio_api.get_cached_portfolio_stats("nk_1", "7d") is None
+        for user in ("nk_2", "nk_3", "nk_4"):
+            assert portfolio_api.get_cached_portfolio_stats(user, "30d") == user.encode()
+
+
+class TestStatsEndpointCaching:
+    """The endpoint serves repeat requests from the cache"""
+
+    async def test_second_request_is_served_from_cache(self):
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", return_value=SUCCESS_STATS) as calculate:
+            first = await stats_request("30d")
+            second = await stats_request("30d")
+
+        assert calculate.call_count == 1
+        assert first.body == second.body
+        assert first.headers["etag"] == second.headers["etag"]
+
+    async def test_browser_must_revalidate(self):
+        # The key travels in X-API-Key, so the browser's cache can't tell accounts apart
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", return_value=SUCCESS_STATS):
+            response = await stats_request("30d")
+
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    async def test_matching_etag_gets_304(self):
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", return_value=SUCCESS_STATS):
+            first = await stats_request("30d")
+            etag = first.headers["etag"]
+            revalidated = await stats_request("30d", headers={"if-none-match": etag})
+            # A CDN may hand the browser a weak/strong variant or a list
+            listed = await stats_request("30d", headers={"if-none-match": '"old", ' + etag[2:]})
+
+        assert revalidated.status_code == 304 and revalidated.body == b""
+        assert listed.status_code == 304
+
+    async def test_invalidation_forces_a_recalculation(self):
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", return_value=SUCCESS_STATS) as calculate:
+            await stats_request("30d")
+            portfolio_api.invalidate_portfolio_stats_cache("nk_test")
+            await stats_request("30d")
+
+        assert calculate.call_count == 2
+
+    async def test_uninitialized_portfolio_is_not_cached(self):
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", return_value=NO_DATA_STATS) as calculate:
+            first = await stats_request("30d")
+            await stats_request("30d")
+
+        assert first == NO_DATA_STATS
+        assert calculate.call_count == 2
+        assert not portfolio_api._portfolio_stats_cache
+
+
+class TestInflightCalculation:
+    """Concurrent misses for one (key, period) share a single calculation"""
+
+    async def test_cancelled_first_request_does_not_fail_the_others(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def calculate(api_key, period):
+            calls.append((api_key, period))
+            await release.wait()
+            return SUCCESS_STATS
+
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", side_effect=calculate):
+            first = asyncio.create_task(stats_request("30d"))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(stats_request("30d"))
+            await asyncio.sleep(0)
+
+            # The client that started the calculation disconnects
+            first.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            response = await second
+
+        assert first.cancelled()
+        assert response.status_code == 200
+        assert b'"total_profit":123.45' in response.body
+        assert len(calls) == 1
+        assert not portfolio_api._portfolio_stats_inflight
+
+    async def test_calculation_error_reaches_every_waiter(self):
+        release = asyncio.Event()
+
+        async def calculate(api_key, period):
+            await release.wait()
+            raise RuntimeError("database down")
+
+        with patch.object(portfolio_api, "_calculate_portfolio_stats", side_effect=calculate):
+            requests = [
+                asyncio.create_task(stats_request("7d"))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*requests, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not portfolio_api._portfolio_stats_inflight